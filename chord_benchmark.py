@@ -0,0 +1,1396 @@
+"""
+@author Edwin Kaburu
+@date 11/19/2022
+@see "Seattle University, CPSC 5520, Fall 2022" - Distributed Systems
+@file chord_benchmark.py
+Lab4 Chord
+"""
+
+import io
+import re
+import os
+import csv
+import ast
+import sys
+import signal
+import json
+import queue
+import time
+import asyncio
+import pickle
+import random
+import argparse
+import platform
+import logging
+import timeit
+import threading
+import statistics
+import tempfile
+import contextlib
+import subprocess
+from bisect import bisect_left
+from socket import *
+from chord_identifier import SHA1_M_BIT_LENGTH, RING_SIZE, Identifier
+from chord_finger_table import FingerTable
+from chord_store import DiskStore
+from chord_hotkeys import RECORD_CACHE_SIZE
+from chord_metrics import RpcMetrics
+from chord_codec import ChordNode, node_encode_body, node_decode_body
+from chord_populate import ChordPopulate
+from chord_node import ChordProtocol
+from chord_simulator import SimulatedNetwork
+from chord_launcher import ChordLauncher
+from chord_query import query_row_key, query_batch, query_batch_stream
+from chord_network import POPULATE_BATCH_SIZE, LOCATION_CACHE_SIZE, FRAME_HEADER, MESSAGE_TYPES, AsyncConnectionPool, \
+    AsyncNodeConnection, ConnectionPool, LocationCache, LookupResult, node_send_network_message, \
+    TcpListener, node_iterative_find_successor, node_receive_frame
+
+
+def legacy_get_decimal_form(identifier):
+    # Convert Hex-Identifier To Digit
+    return int(identifier, 16)
+
+
+def legacy_get_immediate_indexes(identifier, i_i):
+    # Hex-String Finger Start, As Computed Before Integer Identifiers
+    deci_num = legacy_get_decimal_form(identifier)
+    return hex((deci_num + pow(2, (i_i - 1))) % pow(2, SHA1_M_BIT_LENGTH))
+
+
+def legacy_interval_condition(l_id, x_id, r_id, notation_str):
+    # Parameters Are In Hex-Decimal, Parsed On Every Call
+    l_digit = legacy_get_decimal_form(l_id)
+    x_digit = legacy_get_decimal_form(x_id)
+    r_digit = legacy_get_decimal_form(r_id)
+    if notation_str == '()':
+        return l_digit < x_digit < r_digit
+    if notation_str == '[)':
+        return l_digit <= x_digit < r_digit
+    if notation_str == '(]':
+        return l_digit < x_digit <= r_digit
+    if notation_str == '[]':
+        return l_digit <= x_digit <= r_digit
+
+
+def random_identifier(random_gen):
+    # Random SHA-1 Point On The Circle
+    return Identifier.from_key(str(random_gen.random()))
+
+
+def benchmark_routing_decision(rounds=2000, ring_size=64):
+    random_gen = random.Random(5520)
+    ring_identifiers = sorted(random_identifier(random_gen) for _ in range(ring_size))
+    targets = [random_identifier(random_gen) for _ in range(64)]
+
+    # A Node's Own Routing Step, As protocol_next_hop Runs It: Fingers Are The Ring Nodes Owning Each Start
+    chord_protocol = ChordProtocol(0, transport=SimulatedNetwork().node_transport(), run_forever=False)
+    chord_protocol.SingleNode.identifier = ring_identifiers[0]
+    chord_protocol.finger_table = FingerTable(ring_identifiers[0])
+    ring_nodes = []
+    for port_num, identifier in enumerate(ring_identifiers):
+        chord_node = ChordNode()
+        chord_node.identifier = identifier
+        chord_node.listen_address = ('localhost', port_num)
+        ring_nodes.append(chord_node)
+    for i, finger_start in enumerate(chord_protocol.finger_table.starts, 1):
+        chord_protocol.finger_table.set_finger(i, ring_nodes[bisect_left(ring_identifiers, finger_start) % ring_size])
+    chord_protocol.SingleNode.successor = chord_protocol.finger_table.get_finger(1)
+
+    # Same Fingers As Hex Strings, Keyed By Finger Start, As Before Integer Identifiers
+    legacy_node, legacy_successor = hex(ring_identifiers[0]), hex(chord_protocol.SingleNode.successor.identifier)
+    legacy_targets = [hex(target) for target in targets]
+    finger_table = chord_protocol.finger_table
+    legacy_fingers = {legacy_get_immediate_indexes(legacy_node, i): hex(finger_table.get_finger(i).identifier)
+                      for i in range(1, SHA1_M_BIT_LENGTH + 1)}
+
+    def legacy_decision(target):
+        # Interval Checks Made By Find-Predecessor, Then Closest-Proceeding-Finger Scan
+        legacy_interval_condition(legacy_node, target, legacy_successor, '[]')
+        legacy_interval_condition(target, legacy_node, legacy_successor, '(]')
+        legacy_interval_condition(legacy_node, legacy_successor, target, '[]')
+        closest = legacy_node
+        for key, value in legacy_fingers.items():
+            if legacy_interval_condition(legacy_node, key, target, '()'):
+                closest = value
+        return closest
+
+    results = {}
+    for label, decision, inputs in (('hex-string', legacy_decision, legacy_targets),
+                                    ('next-hop', chord_protocol.protocol_next_hop, targets)):
+        # Average Over Every Target, Per Round
+        elapsed = timeit.timeit(lambda: [decision(target) for target in inputs], number=rounds // len(inputs) + 1)
+        per_decision = elapsed / ((rounds // len(inputs) + 1) * len(inputs))
+        results[label] = per_decision
+        print(f'{label:>12}: {per_decision * 1e6:9.2f} us per routing decision')
+
+    print(f'{"speedup":>12}: {results["hex-string"] / results["next-hop"]:9.2f}x')
+    chord_protocol.connection_pool.close()
+    return results
+
+
+def benchmark_closest_finger(ring_sizes=(8, 64, 1024), rounds=20000):
+    random_gen = random.Random(5520)
+    results = {}
+    for ring_size in ring_sizes:
+        # Synthetic Ring, Sorted By Identifier
+        ring_nodes = []
+        for port_num in range(ring_size):
+            chord_node = ChordNode()
+            chord_node.identifier = random_identifier(random_gen)
+            chord_node.listen_address = ('localhost', port_num)
+            ring_nodes.append(chord_node)
+        ring_nodes.sort(key=lambda node: node.identifier)
+        owner_node = ring_nodes[0]
+
+        def successor_of(identifier):
+            # First Node At Or After Identifier, Wrapping Around
+            for chord_node in ring_nodes:
+                if chord_node.identifier >= identifier:
+                    return chord_node
+            return ring_nodes[0]
+
+        # Same Fingers, Dict Keyed By Start Versus Finger Table Array
+        finger_table = FingerTable(owner_node.identifier)
+        finger_dict = dict()
+        for i in range(1, SHA1_M_BIT_LENGTH + 1):
+            finger_node = successor_of(finger_table.finger_start(i))
+            finger_table.set_finger(i, finger_node)
+            finger_dict.update({finger_table.finger_start(i): finger_node})
+        targets = [random_identifier(random_gen) for _ in range(rounds)]
+
+        def dict_scan(identifier):
+            # Previous Lookup: Every Entry, In Insertion Order
+            closest_proceed_node = owner_node
+            for key, value in finger_dict.items():
+                if value.identifier.in_arc(owner_node.identifier, identifier, '()'):
+                    closest_proceed_node = value
+            return closest_proceed_node
+
+        start_time = time.perf_counter()
+        for target in targets[:rounds // 10]:
+            dict_scan(target)
+        scan_cost = (time.perf_counter() - start_time) / (rounds // 10)
+
+        start_time = time.perf_counter()
+        for target in targets:
+            finger_table.closest_preceding_node(target)
+        bisect_cost = (time.perf_counter() - start_time) / rounds
+
+        results[ring_size] = {'dict_scan': scan_cost, 'bisect': bisect_cost,
+                              'distinct_fingers': finger_table.distinct_finger_count()}
+        print(f'{ring_size:>6} nodes: dict scan {scan_cost * 1e6:8.2f} us, bisect {bisect_cost * 1e6:6.2f} us, '
+              f'{finger_table.distinct_finger_count()} distinct fingers')
+    return results
+
+
+def launch_benchmark_node(existing_port=0, *node_arguments):
+    # Start A Node Process, Unbuffered So Its Status Lines Arrive Immediately
+    node_process = subprocess.Popen([sys.executable, '-u', 'chord_node.py', str(existing_port), *node_arguments],
+                                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    # Status Lines Up To Ready, For Benchmarks That Read Join Statistics
+    node_process.startup_lines = []
+    for line in node_process.stdout:
+        node_process.startup_lines.append(line)
+        if 'Ready And Listening' in line:
+            # Keep Draining Output, So A Chatty Node Never Blocks On A Full Pipe
+            threading.Thread(target=lambda: [None for _ in node_process.stdout], daemon=True).start()
+            # Status Line Starts With The Listening Address
+            return node_process, int(re.search(r", (\d+)\)", line).group(1))
+    raise RuntimeError('Node Exited Before Listening')
+
+
+def legacy_unframed_server(listen_socket):
+    # Serve Like The Old Protocol: Read Until A 1 Second Receive Timeout, Then Reply
+    while True:
+        client_con_socket, _ = listen_socket.accept()
+        client_con_socket.settimeout(1)
+        server_host_response = b''
+        while True:
+            try:
+                pkt_data = client_con_socket.recv(4096)
+            except TimeoutError:
+                break
+            if pkt_data == b'':
+                break
+            server_host_response += pkt_data
+        client_con_socket.send(pickle.dumps(pickle.loads(server_host_response)))
+        client_con_socket.close()
+
+
+def legacy_send_network_message(message, port_num):
+    # Old Client: One Unframed Pickle, Read Reply Until Peer Closes
+    client_socket = create_connection(('localhost', port_num))
+    client_socket.send(pickle.dumps(message))
+    server_host_response = b''
+    while True:
+        pkt_data = client_socket.recv(4096)
+        if pkt_data == b'':
+            break
+        server_host_response += pkt_data
+    client_socket.close()
+    return pickle.loads(server_host_response)
+
+
+def benchmark_rpc_latency(framed_rounds=2000, legacy_rounds=3):
+    # Legacy Protocol, Emulated In-Process
+    listen_socket = create_server(('localhost', 0))
+    threading.Thread(target=legacy_unframed_server, args=(listen_socket,), daemon=True).start()
+    legacy_port = listen_socket.getsockname()[1]
+    message = ('FindSuccessor', (hex(Identifier.from_key('benchmark')), -1))
+
+    start_time = time.perf_counter()
+    for _ in range(legacy_rounds):
+        legacy_send_network_message(message, legacy_port)
+    legacy_per_hop = (time.perf_counter() - start_time) / legacy_rounds
+
+    # Framed Protocol, Against A Real Node
+    node_process, node_port = launch_benchmark_node()
+    try:
+        start_time = time.perf_counter()
+        for _ in range(framed_rounds):
+            node_send_network_message(message, node_port)
+        framed_per_hop = (time.perf_counter() - start_time) / framed_rounds
+
+        # Same Requests Over One Pooled Connection
+        connection_pool = ConnectionPool()
+        start_time = time.perf_counter()
+        for _ in range(framed_rounds):
+            connection_pool.node_send_network_message(message, node_port)
+        pooled_per_hop = (time.perf_counter() - start_time) / framed_rounds
+        connection_pool.close()
+    finally:
+        node_process.kill()
+
+    print(f'{"unframed":>12}: {legacy_per_hop * 1e3:9.3f} ms per hop ({legacy_rounds} rpcs)')
+    print(f'{"framed":>12}: {framed_per_hop * 1e3:9.3f} ms per hop ({framed_rounds} rpcs)')
+    print(f'{"pooled":>12}: {pooled_per_hop * 1e3:9.3f} ms per hop ({framed_rounds} rpcs)')
+    return {'unframed': legacy_per_hop, 'framed': framed_per_hop, 'pooled': pooled_per_hop}
+
+
+def launch_benchmark_ring(node_count, *node_arguments):
+    # Start A Ring One Node At A Time, Each Joining Through The First
+    node_processes, node_ports = [], []
+    for _ in range(node_count):
+        node_process, node_port = launch_benchmark_node(node_ports[0] if node_ports else 0, *node_arguments)
+        node_processes.append(node_process)
+        node_ports.append(node_port)
+    return node_processes, node_ports
+
+
+async def drive_concurrent_clients(node_ports, client_count, requests_per_client):
+    random_gen = random.Random(client_count)
+
+    async def client_loop(client_index):
+        # Every Client Holds Its Own Connection To One Node
+        connection = await AsyncNodeConnection.node_open(node_ports[client_index % len(node_ports)])
+        for _ in range(requests_per_client):
+            message = ('FindSuccessor', (hex(random_identifier(random_gen)), -1))
+            await connection.node_request(message)
+        connection.close()
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(client_loop(client_index) for client_index in range(client_count)))
+    return client_count * requests_per_client / (time.perf_counter() - start_time)
+
+
+def benchmark_concurrent_clients(node_count=4, requests_per_client=200):
+    node_processes, node_ports = launch_benchmark_ring(node_count)
+    results = {}
+    try:
+        for client_count in (1, 4, 16, 64):
+            # Lookups Per Second With This Many Clients In Flight
+            results[client_count] = asyncio.run(drive_concurrent_clients(node_ports, client_count,
+                                                                         requests_per_client))
+            print(f'{client_count:>4} clients: {results[client_count]:10.1f} lookups/s')
+    finally:
+        for node_process in node_processes:
+            node_process.kill()
+    return results
+
+
+async def drive_lookups(node_ports, lookup_mode, lookup_count, concurrency):
+    random_gen = random.Random(lookup_count)
+    # Single Client: One Pool, Bounded Lookups In Flight
+    connection_pool = AsyncConnectionPool()
+    in_flight = asyncio.Semaphore(concurrency)
+
+    async def one_lookup():
+        async with in_flight:
+            identifier = hex(random_identifier(random_gen))
+            start_port = random_gen.choice(node_ports)
+            if lookup_mode == 'iterative':
+                return await node_iterative_find_successor(connection_pool, identifier, start_port)
+            lookup_result = LookupResult(identifier)
+            start_time = time.perf_counter()
+            lookup_result.owner = await connection_pool.node_send_network_message(
+                ('FindSuccessor', (identifier, -1)), start_port)
+            lookup_result.elapsed = time.perf_counter() - start_time
+            return lookup_result
+
+    start_time = time.perf_counter()
+    lookup_results = await asyncio.gather(*(one_lookup() for _ in range(lookup_count)))
+    throughput = lookup_count / (time.perf_counter() - start_time)
+    connection_pool.close()
+    return throughput, lookup_results
+
+
+def benchmark_lookup_modes(node_count=8, lookup_count=2000, concurrency=32):
+    node_processes, node_ports = launch_benchmark_ring(node_count)
+    results = {}
+    try:
+        for lookup_mode in ('recursive', 'iterative'):
+            throughput, lookup_results = asyncio.run(drive_lookups(node_ports, lookup_mode, lookup_count,
+                                                                   concurrency))
+            elapsed_times = sorted(lookup_result.elapsed for lookup_result in lookup_results)
+            hop_times = [hop_time for lookup_result in lookup_results for hop_time in lookup_result.hop_times]
+            results[lookup_mode] = {
+                'lookups_per_second': throughput,
+                'p50_ms': elapsed_times[len(elapsed_times) // 2] * 1e3,
+                'mean_hops': len(hop_times) / lookup_count if hop_times else None,
+                'mean_hop_ms': sum(hop_times) / len(hop_times) * 1e3 if hop_times else None,
+            }
+            hop_summary = (f', {results[lookup_mode]["mean_hops"]:.2f} hops of '
+                           f'{results[lookup_mode]["mean_hop_ms"]:.3f} ms' if hop_times else '')
+            print(f'{lookup_mode:>10}: {throughput:9.1f} lookups/s, p50 {results[lookup_mode]["p50_ms"]:.3f} ms'
+                  f'{hop_summary}')
+    finally:
+        for node_process in node_processes:
+            node_process.kill()
+    return results
+
+
+def benchmark_partitioned_populate(ring_sizes=(2, 4, 8), record_count=5000):
+    random_gen = random.Random(record_count)
+    # Synthetic Dataset, SHA-1 Hex Keys Like chord_populate Builds
+    dataset = {Identifier(random_identifier(random_gen)).hex_form(): [['stats', str(index)]]
+               for index in range(record_count)}
+    results = {}
+    for node_count in ring_sizes:
+        node_processes, node_ports = launch_benchmark_ring(node_count)
+        try:
+            start_time = time.perf_counter()
+            populate_report = node_send_network_message(('Populate', (dataset, -1)), node_ports[0])
+            elapsed = time.perf_counter() - start_time
+        finally:
+            for node_process in node_processes:
+                node_process.kill()
+        received_total = sum(received_count for received_count, _ in populate_report.values())
+        stored_total = sum(stored_count for _, stored_count in populate_report.values())
+        results[node_count] = {
+            'ingest_seconds': elapsed,
+            'records_received': received_total,
+            'records_stored': stored_total,
+            # Old Flood Walked The Whole Dataset Through Every Node
+            'flood_records_received': record_count * node_count,
+        }
+        print(f'{node_count:>3} nodes: ingest {elapsed * 1e3:8.1f} ms, received {received_total} '
+              f'(flood {record_count * node_count}), stored {stored_total}')
+        for node_port, (received_count, stored_count) in sorted(populate_report.items()):
+            print(f'      node {node_port}: received {received_count:>5}, stored {stored_count:>5}')
+    return results
+
+
+def write_benchmark_csv(row_count):
+    # Synthetic Stat File: Three Seasons Per Player, Key Columns Where chord_populate Reads Them, Sorted By Player
+    csv_descriptor, csv_path = tempfile.mkstemp(suffix='.csv')
+    with os.fdopen(csv_descriptor, 'w', newline='') as csv_file:
+        csv_writer = csv.writer(csv_file)
+        csv_writer.writerow(['playerid', 'name', 'position', 'year', 'team', 'games', 'rating', 'yards'])
+        for index in range(row_count):
+            csv_writer.writerow([f'player{index // 3:08d}', 'Name', 'QB', str(1990 + index % 3), 'TEAM',
+                                 str(index % 17), '88.5', str(index)])
+    return csv_path
+
+
+def benchmark_streaming_ingest(node_count=4, row_count=50000):
+    csv_path = write_benchmark_csv(row_count)
+    node_processes, node_ports = launch_benchmark_ring(node_count)
+    results = {}
+    try:
+        for ingest_mode in ('whole', 'stream'):
+            start_time = time.perf_counter()
+            # Whole Mode Echoes Every Row, Kept Off The Terminal
+            with contextlib.redirect_stdout(io.StringIO()):
+                ChordPopulate(node_ports[0], csv_path, ingest_mode)
+            results[ingest_mode] = row_count / (time.perf_counter() - start_time)
+            print(f'{ingest_mode:>7}: {results[ingest_mode]:10.1f} rows/s')
+    finally:
+        for node_process in node_processes:
+            node_process.kill()
+        os.remove(csv_path)
+    return results
+
+
+async def drive_batch_query(existing_port, key_lines):
+    # Count Results That Came Back With A Record
+    found_count = 0
+    async for _, result in query_batch_stream(existing_port, key_lines):
+        found_count += result != "Not Here"
+    return found_count
+
+
+def benchmark_batch_query(node_count=4, key_count=10000, loop_sample=50):
+    node_processes, node_ports = launch_benchmark_ring(node_count)
+    key_lines = [f'player{index},{1990 + index % 30}' for index in range(key_count)]
+    # Store A Record Under Every Queried Key
+    dataset = {query_row_key(*key_line.split(',')): [[key_line]] for key_line in key_lines}
+    results = {}
+    try:
+        node_send_network_message(('Populate', (dataset, -1)), node_ports[0])
+
+        start_time = time.perf_counter()
+        found_count = asyncio.run(drive_batch_query(node_ports[0], key_lines))
+        results['batch_keys_per_second'] = key_count / (time.perf_counter() - start_time)
+        print(f'batch: {results["batch_keys_per_second"]:10.1f} keys/s, found {found_count} of {key_count}')
+
+        # Old Way: One chord_query Process Per Key, Sampled Then Extrapolated
+        start_time = time.perf_counter()
+        for key_line in key_lines[:loop_sample]:
+            subprocess.run([sys.executable, 'chord_query.py', str(node_ports[0]), *key_line.split(',')],
+                           stdout=subprocess.DEVNULL, check=True)
+        results['loop_keys_per_second'] = loop_sample / (time.perf_counter() - start_time)
+        print(f' loop: {results["loop_keys_per_second"]:10.1f} keys/s, {key_count} keys in about '
+              f'{key_count / results["loop_keys_per_second"]:.0f} s')
+    finally:
+        for node_process in node_processes:
+            node_process.kill()
+    return results
+
+
+# Requests A FindKey Can Cause Between Nodes, As Counted By Each Node's Handled RPCs
+ROUTE_MESSAGES = ('FindKey', 'FindPredecessor', 'NextHop')
+
+
+def route_rpc_count(connection_pool, node_ports):
+    # Route Requests Handled So Far, Summed Over The Ring
+    handled_count = 0
+    for node_port in node_ports:
+        handled_rpcs = connection_pool.node_send_network_message(('Stats', (0, -1)), node_port)['handled_rpcs']
+        handled_count += sum(handled_rpcs[message_name]['count'] for message_name in ROUTE_MESSAGES
+                             if message_name in handled_rpcs)
+    return handled_count
+
+
+async def drive_record_hops(node_ports, lookup_count):
+    random_gen = random.Random(lookup_count)
+    connection_pool = AsyncConnectionPool()
+    # Node Identifiers In Ring Order, As Nodes Hash Their Endpoints
+    ring_ports = sorted(node_ports, key=lambda node_port: Identifier.from_key('localhost' + str(node_port)))
+    ring_identifiers = [Identifier.from_key('localhost' + str(node_port)) for node_port in ring_ports]
+    walked_hops = []
+    for _ in range(lookup_count):
+        identifier = random_identifier(random_gen)
+        start_port = random_gen.choice(node_ports)
+        # Finger Routing: The Node's Own FindKey Path, Counted By The Nodes
+        await connection_pool.node_send_network_message(('FindKey', (hex(identifier), -1)), start_port)
+        # Linear Walk: Successor Steps From Start Node To Owner, Each A Request Between Nodes
+        owner_index = bisect_left(ring_identifiers, identifier) % len(ring_identifiers)
+        walked_hops.append((owner_index - ring_ports.index(start_port)) % len(ring_ports))
+    connection_pool.close()
+    return sum(walked_hops) / lookup_count
+
+
+def benchmark_record_hops(ring_sizes=(2, 4, 8, 12), lookup_count=500):
+    results = {}
+    for node_count in ring_sizes:
+        # No Location Cache and No Background Maintenance, So Every Route Request Counted Belongs To A FindKey
+        node_processes, node_ports = launch_benchmark_ring(node_count, '--location-cache', '0', '--stabilize-interval',
+                                                           '0', '--fix-fingers-interval', '0')
+        connection_pool = ConnectionPool()
+        try:
+            handled_before = route_rpc_count(connection_pool, node_ports)
+            walked_hops = asyncio.run(drive_record_hops(node_ports, lookup_count))
+            # Less The Client's Own FindKey Into Each Start Node
+            routed_hops = (route_rpc_count(connection_pool, node_ports) - handled_before - lookup_count) / lookup_count
+        finally:
+            connection_pool.close()
+            for node_process in node_processes:
+                node_process.kill()
+        results[node_count] = {'finger_hops': routed_hops, 'linear_walk_hops': walked_hops}
+        print(f'{node_count:>3} nodes: {routed_hops:5.2f} hops routed, {walked_hops:5.2f} hops walking the ring')
+    return results
+
+
+def benchmark_wire_encoding(ring_size=16, rounds=2000):
+    random_gen = random.Random(ring_size)
+    # Ring of Nodes Linked Both Ways, As Each Process Holds Them
+    ring_nodes = []
+    for port_num in range(ring_size):
+        chord_node = ChordNode()
+        chord_node.identifier = random_identifier(random_gen)
+        chord_node.listen_address = ('127.0.0.1', 40000 + port_num)
+        ring_nodes.append(chord_node)
+    for index, chord_node in enumerate(ring_nodes):
+        chord_node.successor = ring_nodes[(index + 1) % ring_size]
+        chord_node.predecessor = ring_nodes[index - 1]
+    single_node = ring_nodes[0]
+    records = [(random_identifier(random_gen), [['Name', 'QB', 'TEAM', str(index), '88.5']])
+               for index in range(POPULATE_BATCH_SIZE)]
+    # Representative Body of Each Message Kind
+    message_bodies = {
+        'FindSuccessor': (random_identifier(random_gen), -1),
+        'UpdateFinger': (single_node, 17, -1),
+        'Reply node': single_node,
+        'Reply next hop': (True, single_node),
+        'FindKeys x100': ([identifier for identifier, _ in records[:100]], -1),
+        'StoreRecords x1000': (records, -1),
+    }
+    results = {}
+    for message_name, message_body in message_bodies.items():
+        message_rounds = max(rounds // len(str(message_body)) * 100, 20)
+        pickled = pickle.dumps(message_body)
+        encoded = node_encode_body(message_body)
+        # Seconds Per Encode and Per Decode
+        pickle_encode = timeit.timeit(lambda: pickle.dumps(message_body), number=message_rounds) / message_rounds
+        pickle_decode = timeit.timeit(lambda: pickle.loads(pickled), number=message_rounds) / message_rounds
+        codec_encode = timeit.timeit(lambda: node_encode_body(message_body), number=message_rounds) / message_rounds
+        codec_decode = timeit.timeit(lambda: node_decode_body(encoded), number=message_rounds) / message_rounds
+        results[message_name] = {
+            'pickle_bytes': len(pickled), 'codec_bytes': len(encoded),
+            'pickle_encode': pickle_encode, 'pickle_decode': pickle_decode,
+            'codec_encode': codec_encode, 'codec_decode': codec_decode,
+        }
+        print(f'{message_name:>18}: pickle {len(pickled):>6} B {pickle_encode * 1e6:8.1f}/'
+              f'{pickle_decode * 1e6:8.1f} us, codec {len(encoded):>6} B {codec_encode * 1e6:8.1f}/'
+              f'{codec_decode * 1e6:8.1f} us')
+    return results
+
+
+def benchmark_record_store(record_count=100000, read_count=20000, batch_size=POPULATE_BATCH_SIZE):
+    random_gen = random.Random(record_count)
+    records = [(random_identifier(random_gen), [['Name', 'QB', 'TEAM', str(index), '88.5', '4012']])
+               for index in range(record_count)]
+    read_keys = [random_gen.choice(records)[0] for _ in range(read_count)]
+    store_directory = tempfile.mkdtemp()
+    data_path = os.path.join(store_directory, 'records.dat')
+    results = {}
+    for backend_name in ('memory', 'disk'):
+        record_store = dict() if backend_name == 'memory' else DiskStore(data_path)
+        # Batched Writes, As StoreRecords Delivers Them
+        start_time = time.perf_counter()
+        for batch_start in range(0, record_count, batch_size):
+            record_store.update(dict(records[batch_start:batch_start + batch_size]))
+        write_rate = record_count / (time.perf_counter() - start_time)
+        start_time = time.perf_counter()
+        for key in read_keys:
+            record_store.get(key)
+        read_cost = (time.perf_counter() - start_time) / read_count
+        results[backend_name] = {'writes_per_second': write_rate, 'read_us': read_cost * 1e6}
+        print(f'{backend_name:>7}: {write_rate:10.1f} writes/s, {read_cost * 1e6:6.2f} us per read')
+    # Reopen After Restart: From Saved Index, Then By Replaying The Data File
+    record_store.close()
+    start_time = time.perf_counter()
+    DiskStore(data_path).close()
+    results['reopen_index_seconds'] = time.perf_counter() - start_time
+    os.remove(data_path + '.idx')
+    start_time = time.perf_counter()
+    record_store = DiskStore(data_path)
+    results['reopen_replay_seconds'] = time.perf_counter() - start_time
+    # Overwrite Everything Once, Then Compact
+    record_store.update({key: [['updated']] for key, _ in records})
+    data_size = record_store.data_size
+    start_time = time.perf_counter()
+    record_store.compact()
+    results['compact_seconds'] = time.perf_counter() - start_time
+    print(f' reopen: {results["reopen_index_seconds"] * 1e3:.1f} ms from index, '
+          f'{results["reopen_replay_seconds"] * 1e3:.1f} ms replaying {record_count} records')
+    print(f'compact: {data_size} to {record_store.data_size} bytes in {results["compact_seconds"] * 1e3:.1f} ms')
+    record_store.close()
+    for file_name in os.listdir(store_directory):
+        os.remove(os.path.join(store_directory, file_name))
+    os.rmdir(store_directory)
+    return results
+
+
+async def drive_ring_health(node_ports, lookup_count, random_gen):
+    # Fraction of Lookups Answered With The True Owner, and Mean Iterative Hops
+    connection_pool = AsyncConnectionPool()
+    ring_identifiers = sorted(Identifier.from_key('localhost' + str(node_port)) for node_port in node_ports)
+    correct_count, hop_total = 0, 0
+    for _ in range(lookup_count):
+        identifier = random_identifier(random_gen)
+        true_owner = ring_identifiers[bisect_left(ring_identifiers, identifier) % len(ring_identifiers)]
+        owner_node = await connection_pool.node_send_network_message(('FindSuccessor', (identifier, -1)),
+                                                                     random_gen.choice(node_ports))
+        correct_count += owner_node is not None and owner_node.identifier == true_owner
+        lookup_result = await node_iterative_find_successor(connection_pool, identifier,
+                                                            random_gen.choice(node_ports))
+        hop_total += lookup_result.hop_count()
+    connection_pool.close()
+    return correct_count / lookup_count, hop_total / lookup_count
+
+
+def benchmark_churn_recovery(node_count=12, failed_count=3, lookup_count=50, settle_seconds=3.0, deadline=8.0):
+    random_gen = random.Random(node_count)
+    results = {}
+    for ring_name, node_arguments in (('stabilized', ()),
+                                      ('join-only', ('--stabilize-interval', '0', '--fix-fingers-interval', '0'))):
+        node_processes, node_ports = launch_benchmark_ring(node_count, *node_arguments)
+        try:
+            time.sleep(settle_seconds)
+            correct_ratio, mean_hops = asyncio.run(drive_ring_health(node_ports, lookup_count, random_gen))
+            # Fail Nodes Spread Around The Ring, Never The Entry Node
+            failed_indexes = range(1, node_count, node_count // failed_count)[:failed_count]
+            for failed_index in failed_indexes:
+                node_processes[failed_index].kill()
+            live_ports = [node_port for index, node_port in enumerate(node_ports) if index not in failed_indexes]
+            failure_time = time.perf_counter()
+            recovery_seconds = None
+            while time.perf_counter() - failure_time < deadline:
+                after_ratio, after_hops = asyncio.run(drive_ring_health(live_ports, lookup_count, random_gen))
+                if after_ratio == 1.0:
+                    recovery_seconds = time.perf_counter() - failure_time
+                    break
+                time.sleep(0.25)
+            ring_stats = [node_send_network_message(('RingStats', (True, -1)), node_port) for node_port in live_ports]
+        finally:
+            for node_process in node_processes:
+                node_process.kill()
+        results[ring_name] = {
+            'correct_before': correct_ratio, 'hops_before': mean_hops,
+            'correct_after': after_ratio, 'hops_after': after_hops, 'recovery_seconds': recovery_seconds,
+            'stale_fingers_fixed': sum(stats['stale_fingers_fixed'] for stats in ring_stats if stats),
+            'dead_fingers_dropped': sum(stats['dead_fingers_dropped'] for stats in ring_stats if stats),
+        }
+        recovery_text = f'{recovery_seconds:.2f} s' if recovery_seconds is not None else f'not within {deadline} s'
+        print(f'{ring_name:>10}: before {correct_ratio:.0%} correct, {mean_hops:.2f} hops; after {failed_count} '
+              f'failures {after_ratio:.0%} correct, {after_hops:.2f} hops, recovered {recovery_text}; stale fingers '
+              f'{results[ring_name]["stale_fingers_fixed"]} fixed, '
+              f'{results[ring_name]["dead_fingers_dropped"]} dropped as dead')
+    return results
+
+
+def benchmark_join_cost(ring_sizes=(4, 8, 16, 24)):
+    # Join Cost of The Last Node Into Rings of Growing Size
+    results = {}
+    node_processes, node_ports = [], []
+    try:
+        for node_count in ring_sizes:
+            while len(node_ports) < node_count:
+                node_process, node_port = launch_benchmark_node(node_ports[0] if node_ports else 0)
+                node_processes.append(node_process)
+                node_ports.append(node_port)
+            join_line = next(line for line in node_processes[-1].startup_lines if 'Join Time' in line)
+            join_seconds, join_rpcs = re.search(r'Join Time: ([\d.]+) s, RPCs: (\d+)', join_line).groups()
+            results[node_count] = {'join_seconds': float(join_seconds), 'join_rpcs': int(join_rpcs)}
+            print(f'{node_count:>3} nodes: join {float(join_seconds) * 1e3:8.1f} ms, {join_rpcs:>5} RPCs')
+    finally:
+        for node_process in node_processes:
+            node_process.kill()
+    return results
+
+
+async def drive_repeat_find_keys(node_port, row_keys):
+    # Repeated Single-Key Reads Through One Node, Which Resolves Each Owner
+    connection_pool = AsyncConnectionPool()
+    start_time = time.perf_counter()
+    for row_key in row_keys:
+        await connection_pool.node_send_network_message(('FindKey', (row_key, -1)), node_port)
+    seconds_per_key = (time.perf_counter() - start_time) / len(row_keys)
+    ring_stats = await connection_pool.node_send_network_message(('RingStats', (0, -1)), node_port)
+    connection_pool.close()
+    return seconds_per_key, ring_stats['location_cache']
+
+
+async def drive_repeat_batches(node_port, key_batches, location_cache):
+    # Small Client Batches Sharing One Location Cache, Lookups Only On Misses
+    connection_pool = AsyncConnectionPool()
+    start_time = time.perf_counter()
+    for row_keys in key_batches:
+        await query_batch(connection_pool, node_port, row_keys, location_cache)
+    seconds_per_batch = (time.perf_counter() - start_time) / len(key_batches)
+    connection_pool.close()
+    return seconds_per_batch
+
+
+def benchmark_location_cache(node_count=12, hot_keys=200, read_count=2000, batch_count=200, batch_keys=20):
+    # Skewed Reads: Most Requests Go To A Small Set of Hot Player-Year Keys
+    random_gen = random.Random(hot_keys)
+    key_lines = [f'player{index},{1990 + index % 30}' for index in range(hot_keys)]
+    row_keys = [query_row_key(*key_line.split(',')) for key_line in key_lines]
+    dataset = {row_key: [[key_line]] for row_key, key_line in zip(row_keys, key_lines)}
+    reads = [row_keys[min(int(random_gen.expovariate(8 / hot_keys)), hot_keys - 1)] for _ in range(read_count)]
+    key_batches = [random_gen.sample(reads, batch_keys) for _ in range(batch_count)]
+    results = {}
+    for cache_name, cache_size in (('uncached', 0), ('cached', LOCATION_CACHE_SIZE)):
+        node_processes, node_ports = launch_benchmark_ring(node_count, '--location-cache', str(cache_size))
+        try:
+            node_send_network_message(('Populate', (dataset, -1)), node_ports[0])
+            seconds_per_key, cache_stats = asyncio.run(drive_repeat_find_keys(node_ports[-1], reads))
+            location_cache = LocationCache(cache_size)
+            seconds_per_batch = asyncio.run(drive_repeat_batches(node_ports[-1], key_batches, location_cache))
+        finally:
+            for node_process in node_processes:
+                node_process.kill()
+        results[cache_name] = {'find_key_seconds': seconds_per_key, 'node_cache': cache_stats,
+                               'batch_seconds': seconds_per_batch, 'client_cache': location_cache.node_stats()}
+        print(f'{cache_name:>9}: FindKey {seconds_per_key * 1e3:6.3f} ms, node hits {cache_stats["hits"]} '
+              f'misses {cache_stats["misses"]}; {batch_keys}-key batch {seconds_per_batch * 1e3:6.3f} ms, '
+              f'client lookups {location_cache.misses}')
+
+    # Cost of One Store On A Miss, Into A Full Cache of A Ring's Arcs
+    ring_nodes = []
+    for port_num, identifier in enumerate(sorted(random_identifier(random_gen) for _ in range(LOCATION_CACHE_SIZE))):
+        chord_node = ChordNode()
+        chord_node.identifier = identifier
+        chord_node.listen_address = ('localhost', port_num)
+        ring_nodes.append(chord_node)
+    ring_arcs = [(ring_nodes[index - 1], ring_nodes[index]) for index in range(len(ring_nodes))]
+    location_cache = LocationCache(LOCATION_CACHE_SIZE)
+    for predecessor_node, owner_node in ring_arcs:
+        location_cache.node_store(predecessor_node, owner_node)
+    store_arcs = [random_gen.choice(ring_arcs) for _ in range(read_count)]
+    results['store_seconds'] = timeit.timeit(
+        lambda: [location_cache.node_store(*ring_arc) for ring_arc in store_arcs], number=1) / read_count
+    print(f'{"store":>9}: {results["store_seconds"] * 1e6:6.2f} us per arc stored, {LOCATION_CACHE_SIZE} arcs cached')
+    return results
+
+
+def load_spread(process_loads):
+    # Coefficient of Variation, and Hottest Process Against A Fair Share
+    mean_load = statistics.mean(process_loads)
+    return statistics.pstdev(process_loads) / mean_load, max(process_loads) / mean_load
+
+
+def simulated_process_loads(process_count, virtual_node_count, key_identifiers, random_gen):
+    # Ring Positions Hashed Like Nodes Do, 'localhost' + Port, Keys Counted Per Owning Process
+    node_ports = random_gen.sample(range(1024, 65536), process_count * virtual_node_count)
+    ring_positions = sorted((Identifier.from_key('localhost' + str(node_port)), position // virtual_node_count)
+                            for position, node_port in enumerate(node_ports))
+    ring_identifiers = [identifier for identifier, _ in ring_positions]
+    process_loads = [0] * process_count
+    for key_identifier in key_identifiers:
+        process_loads[ring_positions[bisect_left(ring_identifiers, key_identifier) % len(ring_positions)][1]] += 1
+    return process_loads
+
+
+def benchmark_virtual_nodes(process_count=8, vnode_counts=(1, 2, 4, 8), record_count=5000,
+                            simulated_processes=64, simulated_trials=20):
+    random_gen = random.Random(record_count)
+    dataset = {Identifier(random_identifier(random_gen)).hex_form(): [['stats', str(index)]]
+               for index in range(record_count)}
+    key_identifiers = [Identifier(int(key, 16)) for key in dataset]
+    results = {}
+    for virtual_node_count in vnode_counts:
+        # Live Ring: Records Each Process Holds Across Its Virtual Nodes
+        node_processes, node_ports = launch_benchmark_ring(process_count, '--virtual-nodes', str(virtual_node_count))
+        try:
+            node_send_network_message(('Populate', (dataset, -1)), node_ports[0])
+            process_loads = [node_send_network_message(('RingStats', (0, -1)), node_port)['process_records']
+                             for node_port in node_ports]
+        finally:
+            for node_process in node_processes:
+                node_process.kill()
+        variation, hottest = load_spread(process_loads)
+        # Larger Rings, Hashing Only, Averaged Over Random Port Draws
+        simulated_spreads = [load_spread(simulated_process_loads(simulated_processes, virtual_node_count,
+                                                                 key_identifiers, random_gen))
+                             for _ in range(simulated_trials)]
+        simulated_variation = statistics.mean(spread[0] for spread in simulated_spreads)
+        simulated_hottest = statistics.mean(spread[1] for spread in simulated_spreads)
+        results[virtual_node_count] = {'process_records': process_loads, 'variation': variation,
+                                       'hottest_over_mean': hottest, 'simulated_variation': simulated_variation,
+                                       'simulated_hottest_over_mean': simulated_hottest}
+        print(f'{virtual_node_count:>3} vnodes: {process_count} processes cv {variation:5.2f}, '
+              f'hottest {hottest:4.2f}x mean {process_loads}; {simulated_processes} processes (simulated) '
+              f'cv {simulated_variation:5.2f}, hottest {simulated_hottest:4.2f}x mean')
+    return results
+
+
+async def drive_skewed_reads(node_ports, reads, client_count):
+    # Concurrent Clients, Each Reading Through A Random Node
+    random_gen = random.Random(client_count)
+    connection_pool = AsyncConnectionPool()
+    read_queue = iter(reads)
+
+    async def client_loop():
+        for row_key in read_queue:
+            await connection_pool.node_send_network_message(('FindKey', (row_key, -1)), random_gen.choice(node_ports))
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(client_count)))
+    reads_per_second = len(reads) / (time.perf_counter() - start_time)
+    connection_pool.close()
+    return reads_per_second
+
+
+def benchmark_replicated_reads(node_count=6, hot_keys=50, record_count=2000, read_count=20000, client_count=16,
+                               replication_factors=(1, 3)):
+    # Skewed Reads: A Few Hot Player-Year Keys Take Most Requests
+    random_gen = random.Random(record_count)
+    key_lines = [f'player{index},{1990 + index % 30}' for index in range(record_count)]
+    row_keys = [query_row_key(*key_line.split(',')) for key_line in key_lines]
+    dataset = {row_key: [[key_line]] for row_key, key_line in zip(row_keys, key_lines)}
+    reads = [row_keys[min(int(random_gen.expovariate(8 / hot_keys)), record_count - 1)] for _ in range(read_count)]
+    results = {}
+    for replication_factor in replication_factors:
+        node_processes, node_ports = launch_benchmark_ring(node_count, '--replicas', str(replication_factor))
+        try:
+            # Successor Lists, Which Pick The Replicas, Fill In Over The First Stabilize Rounds
+            time.sleep(3.0)
+            node_send_network_message(('Populate', (dataset, -1)), node_ports[0])
+            copy_count = sum(node_send_network_message(('RingStats', (0, -1)), node_port)['process_records']
+                             for node_port in node_ports)
+            # Warm Location Caches, Then Count Only The Measured Reads
+            asyncio.run(drive_skewed_reads(node_ports, reads[:1000], client_count))
+            served_before = [node_send_network_message(('RingStats', (0, -1)), node_port)['reads_served']
+                             for node_port in node_ports]
+            reads_per_second = asyncio.run(drive_skewed_reads(node_ports, reads, client_count))
+            served_reads = [node_send_network_message(('RingStats', (0, -1)), node_port)['reads_served'] - served
+                            for node_port, served in zip(node_ports, served_before)]
+        finally:
+            for node_process in node_processes:
+                node_process.kill()
+        hottest_share = max(served_reads) / sum(served_reads)
+        results[replication_factor] = {'reads_per_second': reads_per_second, 'served_reads': served_reads,
+                                       'hottest_share': hottest_share, 'record_copies': copy_count}
+        print(f'k={replication_factor}: {copy_count} copies, {reads_per_second:9.1f} reads/s, busiest node served '
+              f'{hottest_share * 100:5.1f}% of reads {served_reads}')
+    return results
+
+
+def benchmark_hot_key_caching(node_count=6, hot_keys=50, record_count=2000, chunk_reads=2000, chunk_count=6,
+                              client_count=16):
+    # Same Skewed Reads As 'replicas', Watching The Hottest Key's Owner Chunk By Chunk
+    random_gen = random.Random(record_count)
+    key_lines = [f'player{index},{1990 + index % 30}' for index in range(record_count)]
+    row_keys = [query_row_key(*key_line.split(',')) for key_line in key_lines]
+    dataset = {row_key: [[key_line]] for row_key, key_line in zip(row_keys, key_lines)}
+    reads = [row_keys[min(int(random_gen.expovariate(8 / hot_keys)), record_count - 1)]
+             for _ in range(chunk_reads * chunk_count)]
+    results = {}
+    for cache_name, cache_size in (('no record cache', 0), ('record cache', RECORD_CACHE_SIZE)):
+        node_processes, node_ports = launch_benchmark_ring(node_count, '--record-cache', str(cache_size))
+        chunk_results = []
+        try:
+            node_send_network_message(('Populate', (dataset, -1)), node_ports[0])
+            owner_node = node_send_network_message(('FindSuccessor', (row_keys[0], -1)), node_ports[0])
+            owner_port = owner_node.listen_address[1]
+            for chunk_index in range(chunk_count):
+                served_before = node_send_network_message(('RingStats', (0, -1)), owner_port)['reads_served']
+                reads_per_second = asyncio.run(drive_skewed_reads(
+                    node_ports, reads[chunk_index * chunk_reads:(chunk_index + 1) * chunk_reads], client_count))
+                owner_reads = node_send_network_message(('RingStats', (0, -1)), owner_port)['reads_served'] - \
+                    served_before
+                chunk_results.append({'owner_reads': owner_reads, 'reads_per_second': reads_per_second})
+            cache_hits = sum(node_send_network_message(('RingStats', (0, -1)), node_port)['record_cache']['hits']
+                             for node_port in node_ports)
+        finally:
+            for node_process in node_processes:
+                node_process.kill()
+        results[cache_name] = {'chunks': chunk_results, 'path_cache_hits': cache_hits}
+        print(f'{cache_name:>15}: hottest key owner served per {chunk_reads} reads '
+              f'{[chunk["owner_reads"] for chunk in chunk_results]}, '
+              f'{statistics.mean(chunk["reads_per_second"] for chunk in chunk_results):8.1f} reads/s, '
+              f'{cache_hits} answered on the path')
+    return results
+
+
+def benchmark_observability(rounds=200000):
+    # Per-Call Cost of What Hot Paths Now Do, Against The print They Used To Do
+    identifier = Identifier.from_key('benchmark')
+    node_logger = logging.getLogger('chord_node')
+    node_logger.setLevel(logging.INFO)
+    rpc_metrics = RpcMetrics()
+    results = {}
+    with open(os.devnull, 'w') as null_output:
+        results['print'] = timeit.timeit(lambda: print(f'Asking Closest Node: {identifier}', file=null_output),
+                                         number=rounds) / rounds
+    results['debug_disabled'] = timeit.timeit(lambda: node_logger.debug('Asking Closest Node: %s', identifier),
+                                              number=rounds) / rounds
+    results['rpc_metrics_record'] = timeit.timeit(lambda: rpc_metrics.record('FindKey', 0.00025),
+                                                  number=rounds) / rounds
+    for name, seconds in results.items():
+        print(f'{name:>20}: {seconds * 1e9:8.1f} ns per call')
+    return results
+
+
+def latency_percentile(sorted_latencies, fraction):
+    return sorted_latencies[min(int(fraction * len(sorted_latencies)), len(sorted_latencies) - 1)]
+
+
+async def drive_cluster_load(node_ports, messages, concurrency):
+    # Each Message Sent Through A Random Node, concurrency In Flight, Latency Seen By The Client
+    random_gen = random.Random(len(messages))
+    connection_pool = AsyncConnectionPool()
+    in_flight = asyncio.Semaphore(concurrency)
+    latencies = []
+    failed_count = 0
+
+    async def one_request(message):
+        nonlocal failed_count
+        async with in_flight:
+            start_time = time.perf_counter()
+            response = await connection_pool.node_send_network_message(message, random_gen.choice(node_ports))
+            latencies.append(time.perf_counter() - start_time)
+            failed_count += response is None
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(one_request(message) for message in messages))
+    throughput = len(messages) / (time.perf_counter() - start_time)
+    connection_pool.close()
+    latencies.sort()
+    return {'requests_per_second': throughput, 'p50': latency_percentile(latencies, 0.5),
+            'p99': latency_percentile(latencies, 0.99), 'failed': failed_count}
+
+
+async def drive_cluster_hops(node_ports, lookup_count):
+    # Hops As The Querying Side Sees Them, Walking The Ring With NextHop
+    random_gen = random.Random(lookup_count)
+    connection_pool = AsyncConnectionPool()
+    hop_counts = []
+    for _ in range(lookup_count):
+        lookup_result = await node_iterative_find_successor(connection_pool, random_identifier(random_gen),
+                                                            random_gen.choice(node_ports))
+        hop_counts.append(lookup_result.hop_count())
+    connection_pool.close()
+    hop_counts.sort()
+    return {'mean': statistics.mean(hop_counts), 'p99': latency_percentile(hop_counts, 0.99)}
+
+
+def benchmark_cluster(ring_sizes=(4, 8, 16), row_count=20000, request_count=5000, concurrency=32, hop_samples=300):
+    # Whole System As N Grows: Sequential Joins, CSV Populate, Then FindKey and FindSuccessor Load
+    random_gen = random.Random(row_count)
+    csv_path = write_benchmark_csv(row_count)
+    row_keys = [ChordPopulate.split_row([f'player{index // 3}', '', '', str(1990 + index % 3)])[0]
+                for index in range(row_count)]
+    results = {}
+    try:
+        for node_count in ring_sizes:
+            node_processes, node_ports = launch_benchmark_ring(node_count)
+            try:
+                join_costs = [re.search(r'Join Time: ([\d.]+) s, RPCs: (\d+)', line).groups()
+                              for node_process in node_processes[1:] for line in node_process.startup_lines
+                              if 'Join Time' in line]
+                start_time = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    ChordPopulate(node_ports[0], csv_path, 'stream')
+                populate_rows_per_second = row_count / (time.perf_counter() - start_time)
+                find_key_load = asyncio.run(drive_cluster_load(
+                    node_ports, [('FindKey', (random_gen.choice(row_keys), -1)) for _ in range(request_count)],
+                    concurrency))
+                find_successor_load = asyncio.run(drive_cluster_load(
+                    node_ports, [('FindSuccessor', (hex(random_identifier(random_gen)), -1))
+                                 for _ in range(request_count)], concurrency))
+                lookup_hops = asyncio.run(drive_cluster_hops(node_ports, hop_samples))
+            finally:
+                for node_process in node_processes:
+                    node_process.kill()
+            join_seconds = [float(join_time) for join_time, _ in join_costs]
+            results[node_count] = {
+                'join_seconds_mean': statistics.mean(join_seconds) if join_seconds else 0.0,
+                'join_seconds_max': max(join_seconds, default=0.0),
+                'join_rpcs_mean': statistics.mean(int(join_rpcs) for _, join_rpcs in join_costs) if join_costs else 0,
+                'populate_rows_per_second': populate_rows_per_second,
+                'find_key': find_key_load,
+                'find_successor': find_successor_load,
+                'lookup_hops': lookup_hops,
+            }
+            print(f'{node_count:>3} nodes: join {results[node_count]["join_seconds_mean"] * 1e3:6.1f} ms '
+                  f'(max {results[node_count]["join_seconds_max"] * 1e3:6.1f}), '
+                  f'populate {populate_rows_per_second:8.0f} rows/s, '
+                  f'FindKey {find_key_load["requests_per_second"]:7.0f}/s p50 {find_key_load["p50"] * 1e3:6.2f} '
+                  f'p99 {find_key_load["p99"] * 1e3:6.2f} ms, '
+                  f'FindSuccessor {find_successor_load["requests_per_second"]:7.0f}/s '
+                  f'p50 {find_successor_load["p50"] * 1e3:6.2f} p99 {find_successor_load["p99"] * 1e3:6.2f} ms, '
+                  f'hops {lookup_hops["mean"]:.2f} (p99 {lookup_hops["p99"]})')
+    finally:
+        os.remove(csv_path)
+    return results
+
+
+def simulated_populate_table(record_count):
+    # Populate Message Body: Hex Key -> Rows, One Row Per Record
+    return {row_key: [player_team_stats] for row_key, player_team_stats in
+            (ChordPopulate.split_row([f'player{index}', 'team', '100', str(1990 + index % 3)])
+             for index in range(record_count))}
+
+
+async def simulated_join(simulated_network, chord_nodes):
+    # One More Node Through The First Live One, Joins Alone Keep The Fingers Exact So Maintenance Is Off
+    chord_node = ChordProtocol(chord_nodes[0].SingleNode.listen_address[1] if chord_nodes else 0,
+                               stabilize_interval=0, fix_fingers_interval=0,
+                               transport=simulated_network.node_transport(), run_forever=False)
+    await chord_node.protocol_start()
+    chord_nodes.append(chord_node)
+    return chord_node
+
+
+async def drive_simulated_ring(node_count, record_count, lookup_count, latency, loss):
+    # Whole Ring In This Process: Sequential Joins, Iterative Lookups From A Client, One Populate Through Node 0
+    simulated_network = SimulatedNetwork(latency=latency, loss=loss, seed=node_count)
+    random_gen = random.Random(node_count)
+    chord_nodes, join_seconds, join_rpcs = [], [], []
+    failed_joins = 0
+    start_time = time.perf_counter()
+    for _ in range(node_count):
+        # Joins Alone Build Exact Fingers, Maintenance Would Only Add Background Traffic
+        chord_node = ChordProtocol(chord_nodes[0].SingleNode.listen_address[1] if chord_nodes else 0,
+                                   stabilize_interval=0, fix_fingers_interval=0,
+                                   transport=simulated_network.node_transport(), run_forever=False)
+        join_start = time.perf_counter()
+        try:
+            await chord_node.protocol_start()
+        except Exception as error_msg:
+            # Join Has No Retry: A Lost Join Message Leaves The Node Half Linked, Treat It As Crashed
+            logging.getLogger('chord_node').warning('%s: Join Failed, %r', chord_node.SingleNode.listen_address,
+                                                    error_msg)
+            chord_node.listener.close()
+            failed_joins += 1
+            continue
+        if chord_nodes:
+            join_seconds.append(time.perf_counter() - join_start)
+            join_rpcs.append(chord_node.connection_pool.request_count)
+        chord_nodes.append(chord_node)
+    build_seconds = time.perf_counter() - start_time
+    node_ports = [chord_node.SingleNode.listen_address[1] for chord_node in chord_nodes]
+
+    client_pool = simulated_network.node_transport().connection_pool
+    hop_counts = []
+    for _ in range(lookup_count):
+        lookup_result = await node_iterative_find_successor(client_pool, random_identifier(random_gen),
+                                                            random_gen.choice(node_ports))
+        hop_counts.append(lookup_result.hop_count())
+    hop_counts.sort()
+
+    populate_table = simulated_populate_table(record_count)
+    network_stats = simulated_network.node_stats()
+    start_time = time.perf_counter()
+    populate_report = await client_pool.node_send_network_message(('Populate', (populate_table, -1)), node_ports[0])
+    populate_seconds = time.perf_counter() - start_time
+    populate_stats = simulated_network.node_stats()
+    return {
+        'build_seconds': build_seconds,
+        'join_seconds_mean': statistics.mean(join_seconds) if join_seconds else 0.0,
+        'join_rpcs_mean': statistics.mean(join_rpcs) if join_rpcs else 0,
+        'join_rpcs_max': max(join_rpcs, default=0),
+        'failed_joins': failed_joins,
+        'lookup_hops': {'mean': statistics.mean(hop_counts), 'p99': latency_percentile(hop_counts, 0.99),
+                        'histogram': {hop_count: hop_counts.count(hop_count) for hop_count in sorted(set(hop_counts))}},
+        'populate_seconds': populate_seconds,
+        'populate_stored': sum(stored_count for _, stored_count in (populate_report or {}).values()),
+        'populate_messages': populate_stats['messages_delivered'] - network_stats['messages_delivered'],
+        'populate_bytes': populate_stats['bytes_carried'] - network_stats['bytes_carried'],
+        'messages_lost': populate_stats['messages_lost'],
+    }
+
+
+async def drive_join_handoff(node_count, join_count, record_count):
+    # Populate A Simulated Ring, Then Join More Nodes One At A Time, Each Pulling Its Arc
+    simulated_network = SimulatedNetwork(seed=record_count)
+    chord_nodes = []
+    for _ in range(node_count):
+        await simulated_join(simulated_network, chord_nodes)
+    populate_table = simulated_populate_table(record_count)
+    client_pool = simulated_network.node_transport().connection_pool
+    await client_pool.node_send_network_message(('Populate', (populate_table, -1)),
+                                                chord_nodes[0].SingleNode.listen_address[1])
+
+    join_results = []
+    for _ in range(join_count):
+        bytes_carried = simulated_network.bytes_carried
+        start_time = time.perf_counter()
+        chord_node = await simulated_join(simulated_network, chord_nodes)
+        arc_fraction = ((chord_node.SingleNode.identifier - chord_node.SingleNode.predecessor.identifier) %
+                        RING_SIZE) / RING_SIZE
+        join_results.append((time.perf_counter() - start_time, simulated_network.bytes_carried - bytes_carried,
+                             chord_node.records_handed_in, arc_fraction))
+
+    # Every Record Should Sit On The Node Owning Its Key, and Only There
+    ring_identifiers = sorted(chord_node.SingleNode.identifier for chord_node in chord_nodes)
+    misplaced_count = sum(
+        ring_identifiers[bisect_left(ring_identifiers, key) % len(ring_identifiers)] != chord_node.SingleNode.identifier
+        for chord_node in chord_nodes for key in chord_node.nfl_dictionary_table)
+    return join_results, misplaced_count
+
+
+async def drive_rolling_restart(node_count, record_count, read_count):
+    # Every Node In Turn Leaves and A Fresh One Joins, Oldest First, Against A Full Repopulate
+    simulated_network = SimulatedNetwork(seed=record_count)
+    random_gen = random.Random(record_count)
+    chord_nodes = []
+    for _ in range(node_count):
+        await simulated_join(simulated_network, chord_nodes)
+    populate_table = simulated_populate_table(record_count)
+    client_pool = simulated_network.node_transport().connection_pool
+    bytes_carried = simulated_network.bytes_carried
+    await client_pool.node_send_network_message(('Populate', (populate_table, -1)),
+                                                chord_nodes[0].SingleNode.listen_address[1])
+    populate_bytes = simulated_network.bytes_carried - bytes_carried
+
+    leave_bytes, rejoin_bytes, handed_counts = [], [], []
+    for _ in range(node_count):
+        leaving_node = chord_nodes.pop(0)
+        bytes_carried = simulated_network.bytes_carried
+        leave_report = await client_pool.node_send_network_message(('Leave', (0, -1)),
+                                                                   leaving_node.SingleNode.listen_address[1])
+        leave_bytes.append(simulated_network.bytes_carried - bytes_carried)
+        handed_counts.append(sum(leave_report.values()))
+        bytes_carried = simulated_network.bytes_carried
+        await simulated_join(simulated_network, chord_nodes)
+        rejoin_bytes.append(simulated_network.bytes_carried - bytes_carried)
+
+    # Ring After A Full Rotation: Records Kept, Reads Answered, Nothing Routed At A Departed Node
+    records_kept = sum(len(chord_node.nfl_dictionary_table) for chord_node in chord_nodes)
+    read_misses = 0
+    for row_key in random_gen.sample(list(populate_table), read_count):
+        entry_port = random_gen.choice(chord_nodes).SingleNode.listen_address[1]
+        record = await client_pool.node_send_network_message(('FindKey', (row_key, -1)), entry_port)
+        read_misses += not isinstance(record, list)
+    failed_rpcs = sum(rpc_stats['failures'] for chord_node in chord_nodes
+                      for rpc_stats in chord_node.connection_pool.sent_rpcs.node_stats().values())
+    return {
+        'populate_bytes': populate_bytes,
+        'leave_bytes_mean': statistics.mean(leave_bytes),
+        'rejoin_bytes_mean': statistics.mean(rejoin_bytes),
+        'records_handed_mean': statistics.mean(handed_counts),
+        'records_kept': records_kept,
+        'read_misses': read_misses,
+        'failed_rpcs': failed_rpcs,
+    }
+
+
+def benchmark_rolling_restart(node_count=16, record_count=40000, read_count=2000):
+    # Restarting Every Node Once Should Cost About One Arc Out and One Arc Back Per Node
+    node_logger = logging.getLogger('chord_node')
+    log_level = node_logger.level
+    node_logger.setLevel(logging.WARNING)
+    try:
+        results = asyncio.run(drive_rolling_restart(node_count, record_count, read_count))
+    finally:
+        node_logger.setLevel(log_level)
+    print(f'Full Populate: {results["populate_bytes"] / 1e3:8.1f} kB; Per Restart: Leave '
+          f'{results["leave_bytes_mean"] / 1e3:6.1f} kB ({results["records_handed_mean"]:.0f} Records), Rejoin '
+          f'{results["rejoin_bytes_mean"] / 1e3:6.1f} kB')
+    print(f'After {node_count} Restarts: {results["records_kept"]} of {record_count} Records Kept, '
+          f'{results["read_misses"]} of {read_count} Reads Missed, {results["failed_rpcs"]} Failed RPCs')
+    return results
+
+
+def benchmark_launcher(node_count=64, launch_configs=((1, 1), (4, 1), (4, 4))):
+    # Time Until A Launched Ring Is Stable Per (Processes, Join Concurrency), Then Until It Heals From A Killed Worker
+    launcher_logger = logging.getLogger('chord_launcher')
+    log_level = launcher_logger.level
+    launcher_logger.setLevel(logging.WARNING)
+    results = {}
+    try:
+        for process_count, join_concurrency in launch_configs:
+            chord_launcher = ChordLauncher(node_count, process_count=process_count, join_concurrency=join_concurrency,
+                                           log_level='CRITICAL')
+            try:
+                chord_launcher.launcher_start()
+                stable_seconds = chord_launcher.launcher_supervise(until_stable=True)
+                recovery_seconds = None
+                if chord_launcher.process_count > 1:
+                    # Last Worker Killed Outright, Its Nodes Restarted Through A Surviving One
+                    os.kill(chord_launcher.workers[chord_launcher.process_count - 1][0].pid, signal.SIGKILL)
+                    kill_seconds = time.monotonic() - chord_launcher.start_time
+                    recovery_seconds = chord_launcher.launcher_supervise(until_stable=True) - kill_seconds
+            finally:
+                chord_launcher.launcher_stop()
+            results[f'{process_count}x{join_concurrency}'] = {'stable_seconds': stable_seconds,
+                                                              'recovery_seconds': recovery_seconds}
+            print(f'{node_count} Nodes, {chord_launcher.process_count} Processes, Join Concurrency '
+                  f'{join_concurrency}: Stable In {stable_seconds:5.1f} s' +
+                  (f', Healed {recovery_seconds:5.1f} s After A Worker Was Killed' if recovery_seconds else ''))
+    finally:
+        launcher_logger.setLevel(log_level)
+    return results
+
+
+def benchmark_join_handoff(record_counts=(10000, 40000, 160000), node_count=16, join_count=8):
+    # Data Moved By A Join Should Track The New Node's Arc, Not The Dataset
+    node_logger = logging.getLogger('chord_node')
+    log_level = node_logger.level
+    node_logger.setLevel(logging.WARNING)
+    results = {}
+    try:
+        for record_count in record_counts:
+            join_results, misplaced_count = asyncio.run(drive_join_handoff(node_count, join_count, record_count))
+            moved_records = sum(handed_in for _, _, handed_in, _ in join_results)
+            results[record_count] = {
+                'join_seconds_mean': statistics.mean(join_seconds for join_seconds, _, _, _ in join_results),
+                'join_bytes_mean': statistics.mean(join_bytes for _, join_bytes, _, _ in join_results),
+                'records_moved_mean': moved_records / join_count,
+                'arc_fraction_mean': statistics.mean(arc_fraction for _, _, _, arc_fraction in join_results),
+                'bytes_per_moved_record': sum(join_bytes for _, join_bytes, _, _ in join_results) /
+                                          max(moved_records, 1),
+                'misplaced_records': misplaced_count,
+            }
+            print(f'{record_count:>7} records: join {results[record_count]["join_seconds_mean"] * 1e3:7.1f} ms, '
+                  f'moved {results[record_count]["records_moved_mean"]:8.1f} records '
+                  f'({results[record_count]["records_moved_mean"] / record_count:.3f} of data, arc '
+                  f'{results[record_count]["arc_fraction_mean"]:.3f} of ring), '
+                  f'{results[record_count]["join_bytes_mean"] / 1e3:8.1f} kB per join, '
+                  f'{results[record_count]["bytes_per_moved_record"]:.0f} bytes per moved record, '
+                  f'{misplaced_count} misplaced')
+    finally:
+        node_logger.setLevel(log_level)
+    return results
+
+
+def benchmark_simulated_ring(ring_sizes=(100, 500, 2000), record_count=20000, lookup_count=2000, latency=0.0,
+                             loss=0.0):
+    # Ring Sizes Far Past What Processes On One Machine Allow, Over The In-Memory Transport
+    node_logger = logging.getLogger('chord_node')
+    log_level = node_logger.level
+    node_logger.setLevel(logging.WARNING)
+    results = {}
+    try:
+        for node_count in ring_sizes:
+            results[node_count] = ring_result = asyncio.run(drive_simulated_ring(node_count, record_count,
+                                                                                 lookup_count, latency, loss))
+            print(f'{node_count:>5} nodes: built in {ring_result["build_seconds"]:6.1f} s, '
+                  f'join {ring_result["join_rpcs_mean"]:6.1f} RPCs (max {ring_result["join_rpcs_max"]}, '
+                  f'{ring_result["failed_joins"]} failed), '
+                  f'hops {ring_result["lookup_hops"]["mean"]:.2f} (p99 {ring_result["lookup_hops"]["p99"]}), '
+                  f'populate {ring_result["populate_stored"]} records in {ring_result["populate_seconds"]:.2f} s, '
+                  f'{ring_result["populate_messages"]} messages, '
+                  f'{ring_result["populate_bytes"] / record_count:.0f} bytes per record')
+    finally:
+        node_logger.setLevel(log_level)
+    return results
+
+
+def receive_payload_server(listen_socket, payload):
+    # Answer Every Request With The Same Large Reply, Header and Payload Written Separately So Nothing Is Rebuilt
+    while True:
+        client_con_socket, _ = listen_socket.accept()
+        while True:
+            frame = node_receive_frame(client_con_socket)
+            if frame is None:
+                break
+            client_con_socket.sendall(FRAME_HEADER.pack(len(payload), MESSAGE_TYPES['Reply'], frame[1]))
+            client_con_socket.sendall(payload)
+        client_con_socket.close()
+
+
+def receive_node_listener(listen_ports):
+    # A Node's Listener On Its Own Loop, Acknowledging Whatever It Is Sent
+    async def request_handler(message_name, message_body):
+        return True
+
+    async def serve_listener():
+        tcp_listener = TcpListener(request_handler)
+        await tcp_listener.node_open()
+        listen_ports.put(tcp_listener.listen_address[1])
+        await tcp_listener.node_serve_forever()
+    asyncio.run(serve_listener())
+
+
+async def drive_async_receive(port_num, rounds):
+    connection_pool = AsyncConnectionPool()
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        await connection_pool.node_send_network_message(('Stats', (0, -1)), port_num)
+    receive_seconds = (time.perf_counter() - start_time) / rounds
+    connection_pool.close()
+    return receive_seconds
+
+
+def benchmark_receive_throughput(message_sizes=(1, 10, 100), megabytes_per_size=200):
+    # Reply Frames of Each Size In MB, Received and Decoded By The Threaded and The Asyncio Client Paths,
+    # Then Request Frames of Each Size Received By A Node's Listener
+    results = {}
+    listen_ports = queue.Queue()
+    threading.Thread(target=receive_node_listener, args=(listen_ports,), daemon=True).start()
+    listener_port = listen_ports.get()
+    for message_size in message_sizes:
+        payload = node_encode_body(bytes(message_size << 20))
+        rounds = max(megabytes_per_size // message_size, 3)
+        listen_socket = create_server(('localhost', 0))
+        threading.Thread(target=receive_payload_server, args=(listen_socket, payload), daemon=True).start()
+        port_num = listen_socket.getsockname()[1]
+        # Threaded Pool: One Warm-Up Round Opens The Connection
+        connection_pool = ConnectionPool()
+        connection_pool.node_send_network_message(('Stats', (0, -1)), port_num)
+        start_time = time.perf_counter()
+        for _ in range(rounds):
+            connection_pool.node_send_network_message(('Stats', (0, -1)), port_num)
+        sync_seconds = (time.perf_counter() - start_time) / rounds
+        connection_pool.close()
+        async_seconds = asyncio.run(drive_async_receive(port_num, rounds))
+        listen_socket.close()
+        # Node Listener: Large Requests In, Short Replies Out. Encoding The Request Is Part of The Time
+        connection_pool = ConnectionPool()
+        request_message = ('StoreRecords', (bytes(message_size << 20), -1))
+        connection_pool.node_send_network_message(request_message, listener_port)
+        start_time = time.perf_counter()
+        for _ in range(rounds):
+            connection_pool.node_send_network_message(request_message, listener_port)
+        listener_seconds = (time.perf_counter() - start_time) / rounds
+        connection_pool.close()
+        results[message_size] = {'sync_seconds': sync_seconds, 'async_seconds': async_seconds,
+                                 'listener_seconds': listener_seconds,
+                                 'sync_mb_per_second': message_size / sync_seconds,
+                                 'async_mb_per_second': message_size / async_seconds,
+                                 'listener_mb_per_second': message_size / listener_seconds}
+        print(f'{message_size:>4} MB: Reply Threaded {message_size / sync_seconds:7.1f} MB/s, Asyncio '
+              f'{message_size / async_seconds:7.1f} MB/s; Request Into Node Listener '
+              f'{message_size / listener_seconds:7.1f} MB/s')
+    return results
+
+
+BENCHMARKS = {
+    'identifier': benchmark_routing_decision,
+    'fingers': benchmark_closest_finger,
+    'rpc': benchmark_rpc_latency,
+    'concurrency': benchmark_concurrent_clients,
+    'lookups': benchmark_lookup_modes,
+    'populate': benchmark_partitioned_populate,
+    'ingest': benchmark_streaming_ingest,
+    'query': benchmark_batch_query,
+    'hops': benchmark_record_hops,
+    'wire': benchmark_wire_encoding,
+    'store': benchmark_record_store,
+    'churn': benchmark_churn_recovery,
+    'join': benchmark_join_cost,
+    'cache': benchmark_location_cache,
+    'vnodes': benchmark_virtual_nodes,
+    'replicas': benchmark_replicated_reads,
+    'hotkeys': benchmark_hot_key_caching,
+    'observability': benchmark_observability,
+    'cluster': benchmark_cluster,
+    'simulate': benchmark_simulated_ring,
+    'handoff': benchmark_join_handoff,
+    'restart': benchmark_rolling_restart,
+    'launcher': benchmark_launcher,
+    'receive': benchmark_receive_throughput,
+}
+
+
+def benchmark_commit():
+    # Commit The Tree Was Measured At, None Outside A Git Checkout
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == '__main__':
+    # Benchmark Name, Keyword Overrides, and Where To Append Machine-Readable Results
+    argument_parser = argparse.ArgumentParser(prog='python chord_benchmark.py')
+    argument_parser.add_argument('benchmark_name', choices=list(BENCHMARKS))
+    argument_parser.add_argument('parameters', metavar='NAME=VALUE', nargs='*',
+                                 help='Benchmark Keyword Argument, Value As A Python Literal, e.g. ring_sizes=(4,8)')
+    argument_parser.add_argument('--output', metavar='RESULTS.jsonl', help='Append One JSON Line Per Run')
+    benchmark_arguments = argument_parser.parse_args()
+    benchmark_parameters = {name: ast.literal_eval(value) for name, value in
+                            (parameter.split('=', 1) for parameter in benchmark_arguments.parameters)}
+
+    benchmark_results = BENCHMARKS[benchmark_arguments.benchmark_name](**benchmark_parameters)
+
+    if benchmark_arguments.output:
+        # One Run Per Line, So Runs Across Changes Can Be Compared
+        run_record = {
+            'benchmark': benchmark_arguments.benchmark_name,
+            'parameters': benchmark_parameters,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'commit': benchmark_commit(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'results': benchmark_results,
+        }
+        with open(benchmark_arguments.output, 'a') as results_file:
+            results_file.write(json.dumps(run_record, default=str) + '\n')
@@ -0,0 +1,246 @@
+"""
+@author Edwin Kaburu
+@date 11/19/2022
+@see "Seattle University, CPSC 5520, Fall 2022" - Distributed Systems
+@file chord_codec.py
+Lab4 Chord
+"""
+
+import struct
+from socket import AF_INET, inet_pton, inet_ntop
+from chord_identifier import Identifier
+
+# Node Descriptor: 20-Byte Identifier, IPv4 Address, Port. Port Zero Means No Node
+NODE_DESCRIPTOR = struct.Struct('!20s4sH')
+EMPTY_DESCRIPTOR = bytes(NODE_DESCRIPTOR.size)
+# Length and Count Prefixes, Small Integers and Floats
+LENGTH_PREFIX = struct.Struct('!I')
+SMALL_INTEGER = struct.Struct('!q')
+FLOAT_NUMBER = struct.Struct('!d')
+
+# One Tag Byte Ahead of Every Value
+TAG_NONE = 0
+TAG_FALSE = 1
+TAG_TRUE = 2
+TAG_SMALL_INTEGER = 3
+TAG_BIG_INTEGER = 4
+TAG_IDENTIFIER = 5
+TAG_STRING = 6
+TAG_BYTES = 7
+TAG_LIST = 8
+TAG_TUPLE = 9
+TAG_DICTIONARY = 10
+TAG_NODE = 11
+TAG_FLOAT = 12
+# Strings, Lists and Tuples Under 256 Long Carry A One-Byte Length
+TAG_SHORT_STRING = 13
+TAG_SHORT_LIST = 14
+TAG_SHORT_TUPLE = 15
+# Short List of Short Strings, All Lengths Up Front Then All Bytes (CSV Rows)
+TAG_STRING_ROW = 16
+
+
+class ChordNode:
+    # Unique Identifier, Integer Held (Hex-Decimal For Display)
+    identifier = None
+    # Immediate Successor Node
+    successor = None
+    # Immediate Predecessor Node
+    predecessor = None
+    # Node Address (name, port)
+    listen_address = ()
+
+
+def node_identifier_from_bytes(identifier_bytes):
+    # 20 Bytes Always Fit The Circle, Skip The Normalizing Constructor
+    return int.__new__(Identifier, int.from_bytes(identifier_bytes, 'big'))
+
+
+def node_pack_descriptor(chord_node):
+    # Fixed-Size Identity of One Node, Its Own Pointers Left Out
+    if chord_node is None:
+        return EMPTY_DESCRIPTOR
+    return NODE_DESCRIPTOR.pack(chord_node.identifier.to_bytes(20, 'big'),
+                                inet_pton(AF_INET, chord_node.listen_address[0]), chord_node.listen_address[1])
+
+
+def node_unpack_descriptor(payload, offset):
+    identifier_bytes, address_bytes, port_num = NODE_DESCRIPTOR.unpack_from(payload, offset)
+    if port_num == 0:
+        return None
+    chord_node = ChordNode()
+    chord_node.identifier = node_identifier_from_bytes(identifier_bytes)
+    chord_node.listen_address = (inet_ntop(AF_INET, address_bytes), port_num)
+    return chord_node
+
+
+def node_encode_string_row(buffer, value):
+    # False Unless 1 To 255 Strings, Each Under 256 Bytes
+    if not 0 < len(value) < 256 or type(value[0]) is not str:
+        return False
+    try:
+        encoded_items = [item.encode() for item in value]
+        item_lengths = bytes(map(len, encoded_items))
+    except (AttributeError, TypeError, ValueError):
+        return False
+    buffer.append(TAG_STRING_ROW)
+    buffer.append(len(value))
+    buffer += item_lengths
+    buffer += b''.join(encoded_items)
+    return True
+
+
+def node_encode_value(buffer, value):
+    # Exact Type Match, So bool and Identifier Are Not Taken For int
+    value_type = type(value)
+    if value_type is list and node_encode_string_row(buffer, value):
+        # Row of Short Strings, Packed Together
+        return
+    if value is None:
+        buffer.append(TAG_NONE)
+    elif value_type is bool:
+        buffer.append(TAG_TRUE if value else TAG_FALSE)
+    elif value_type is str:
+        encoded = value.encode()
+        if len(encoded) < 256:
+            buffer.append(TAG_SHORT_STRING)
+            buffer.append(len(encoded))
+        else:
+            buffer.append(TAG_STRING)
+            buffer += LENGTH_PREFIX.pack(len(encoded))
+        buffer += encoded
+    elif value_type is list or value_type is tuple:
+        if len(value) < 256:
+            buffer.append(TAG_SHORT_LIST if value_type is list else TAG_SHORT_TUPLE)
+            buffer.append(len(value))
+        else:
+            buffer.append(TAG_LIST if value_type is list else TAG_TUPLE)
+            buffer += LENGTH_PREFIX.pack(len(value))
+        for item in value:
+            node_encode_value(buffer, item)
+    elif value_type is Identifier:
+        buffer.append(TAG_IDENTIFIER)
+        buffer += value.to_bytes(20, 'big')
+    elif value_type is int:
+        if -(1 << 63) <= value < (1 << 63):
+            buffer.append(TAG_SMALL_INTEGER)
+            buffer += SMALL_INTEGER.pack(value)
+        else:
+            encoded = value.to_bytes(value.bit_length() // 8 + 1, 'big', signed=True)
+            buffer.append(TAG_BIG_INTEGER)
+            buffer += LENGTH_PREFIX.pack(len(encoded))
+            buffer += encoded
+    elif value_type is dict:
+        buffer.append(TAG_DICTIONARY)
+        buffer += LENGTH_PREFIX.pack(len(value))
+        for key, item in value.items():
+            node_encode_value(buffer, key)
+            node_encode_value(buffer, item)
+    elif value_type is ChordNode:
+        # Node, Then Its Successor and Predecessor, Never Their Pointers
+        buffer.append(TAG_NODE)
+        buffer += node_pack_descriptor(value)
+        buffer += node_pack_descriptor(value.successor)
+        buffer += node_pack_descriptor(value.predecessor)
+    elif value_type is bytes or value_type is bytearray:
+        buffer.append(TAG_BYTES)
+        buffer += LENGTH_PREFIX.pack(len(value))
+        buffer += value
+    elif value_type is float:
+        buffer.append(TAG_FLOAT)
+        buffer += FLOAT_NUMBER.pack(value)
+    else:
+        raise TypeError(f'Cannot Encode {value_type.__name__} On The Wire')
+
+
+def node_decode_value(payload, offset):
+    # Return (Value, Offset Past It)
+    tag = payload[offset]
+    offset += 1
+    # Most Frequent Tags First
+    if tag == TAG_SHORT_STRING:
+        length = payload[offset]
+        offset += 1
+        return payload[offset:offset + length].decode(), offset + length
+    if tag == TAG_STRING_ROW:
+        count = payload[offset]
+        offset += 1 + count
+        items = []
+        for length in payload[offset - count:offset]:
+            items.append(payload[offset:offset + length].decode())
+            offset += length
+        return items, offset
+    if tag == TAG_SHORT_LIST or tag == TAG_SHORT_TUPLE or tag == TAG_LIST or tag == TAG_TUPLE:
+        if tag == TAG_SHORT_LIST or tag == TAG_SHORT_TUPLE:
+            count = payload[offset]
+            offset += 1
+        else:
+            (count,) = LENGTH_PREFIX.unpack_from(payload, offset)
+            offset += 4
+        items = []
+        for _ in range(count):
+            item, offset = node_decode_value(payload, offset)
+            items.append(item)
+        return (items if tag == TAG_SHORT_LIST or tag == TAG_LIST else tuple(items)), offset
+    if tag == TAG_IDENTIFIER:
+        return node_identifier_from_bytes(payload[offset:offset + 20]), offset + 20
+    if tag == TAG_STRING:
+        (length,) = LENGTH_PREFIX.unpack_from(payload, offset)
+        offset += 4
+        return payload[offset:offset + length].decode(), offset + length
+    if tag == TAG_NONE:
+        return None, offset
+    if tag == TAG_FALSE or tag == TAG_TRUE:
+        return tag == TAG_TRUE, offset
+    if tag == TAG_SMALL_INTEGER:
+        return SMALL_INTEGER.unpack_from(payload, offset)[0], offset + 8
+    if tag == TAG_BIG_INTEGER:
+        (length,) = LENGTH_PREFIX.unpack_from(payload, offset)
+        offset += 4
+        return int.from_bytes(payload[offset:offset + length], 'big', signed=True), offset + length
+    if tag == TAG_DICTIONARY:
+        (count,) = LENGTH_PREFIX.unpack_from(payload, offset)
+        offset += 4
+        items = dict()
+        for _ in range(count):
+            key, offset = node_decode_value(payload, offset)
+            items[key], offset = node_decode_value(payload, offset)
+        return items, offset
+    if tag == TAG_NODE:
+        chord_node = node_unpack_descriptor(payload, offset)
+        chord_node.successor = node_unpack_descriptor(payload, offset + NODE_DESCRIPTOR.size)
+        chord_node.predecessor = node_unpack_descriptor(payload, offset + 2 * NODE_DESCRIPTOR.size)
+        return chord_node, offset + 3 * NODE_DESCRIPTOR.size
+    if tag == TAG_BYTES:
+        (length,) = LENGTH_PREFIX.unpack_from(payload, offset)
+        offset += 4
+        # Sliced Through A View, So A bytearray Buffer Is Copied Once, Not Twice
+        with memoryview(payload) as payload_view:
+            return bytes(payload_view[offset:offset + length]), offset + length
+    if tag == TAG_FLOAT:
+        return FLOAT_NUMBER.unpack_from(payload, offset)[0], offset + 8
+    raise ValueError(f'Unknown Wire Tag {tag}')
+
+
+def node_encode_body(message_body):
+    # Compact Binary Body, Replaces Pickle On The Wire
+    buffer = bytearray()
+    node_encode_value(buffer, message_body)
+    return bytes(buffer)
+
+
+def node_decode_body(payload, payload_length=None, payload_offset=0):
+    # payload_length and payload_offset Bound A Body Inside A Larger Receive Buffer, Decoded There Without Slicing
+    if payload_length is None:
+        payload_length = len(payload) - payload_offset
+    try:
+        message_body, offset = node_decode_value(payload, payload_offset)
+    except (IndexError, struct.error) as error_msg:
+        # Body Cut Short: Ran Off The Buffer Mid-Value. Every Malformed Body Raises ValueError
+        raise ValueError(f'Truncated Message Body, {error_msg}') from error_msg
+    payload_end = payload_offset + payload_length
+    if offset > payload_end:
+        raise ValueError(f'Message Body Runs {offset - payload_end} Bytes Past Its Frame')
+    if offset != payload_end:
+        raise ValueError(f'{payload_end - offset} Trailing Bytes After Message Body')
+    return message_body
@@ -0,0 +1,87 @@
+"""
+@author Edwin Kaburu
+@date 11/19/2022
+@see "Seattle University, CPSC 5520, Fall 2022" - Distributed Systems
+@file chord_finger_table.py
+Lab4 Chord
+"""
+
+from bisect import bisect_left
+from chord_identifier import SHA1_M_BIT_LENGTH, RING_SIZE
+
+
+class FingerTable:
+    # Fixed Array of m Finger Starts and Nodes, Plus The Distinct Finger Nodes
+    # Sorted By Clockwise Distance From The Owner, For Bisect Lookups
+
+    def __init__(self, owner_identifier):
+        # Identifier of The Node Owning This Table
+        self.owner_identifier = owner_identifier
+        # Finger Starts, Index 0 Holds Finger 1: (n + 2^(i-1)) mod 2^m
+        self.starts = owner_identifier.finger_starts()
+        # Finger Nodes, Parallel To Starts
+        self.nodes = [None] * SHA1_M_BIT_LENGTH
+        # Distinct Finger Nodes and Their Distances From Owner, Rebuilt After Changes
+        self.distinct_nodes = []
+        self.distinct_distances = []
+        self.distinct_dirty = False
+
+    def finger_start(self, i_i):
+        # Start of Finger i (1-Based)
+        return self.starts[i_i - 1]
+
+    def get_finger(self, i_i):
+        # Node of Finger i (1-Based)
+        return self.nodes[i_i - 1]
+
+    def set_finger(self, i_i, chord_node):
+        # Replace Node of Finger i (1-Based)
+        self.nodes[i_i - 1] = chord_node
+        self.distinct_dirty = True
+
+    def fill(self, chord_node):
+        # Every Finger Points At One Node
+        self.nodes = [chord_node] * SHA1_M_BIT_LENGTH
+        self.distinct_dirty = True
+
+    def replace_node(self, identifier, chord_node):
+        # Point Every Finger On identifier At chord_node Instead, Return How Many Changed
+        replaced_count = 0
+        for index, finger_node in enumerate(self.nodes):
+            if finger_node is not None and finger_node.identifier == identifier:
+                self.nodes[index] = chord_node
+                replaced_count += 1
+        if replaced_count:
+            self.distinct_dirty = True
+        return replaced_count
+
+    def rebuild_distinct(self):
+        # Deduplicate Finger Nodes By Identifier
+        distinct_by_identifier = {chord_node.identifier: chord_node for chord_node in self.nodes
+                                  if chord_node is not None}
+        # Sort By Clockwise Distance From Owner
+        distance_pairs = sorted(((identifier - self.owner_identifier) % RING_SIZE, chord_node)
+                                for identifier, chord_node in distinct_by_identifier.items()
+                                if identifier != self.owner_identifier)
+        self.distinct_distances = [distance for distance, _ in distance_pairs]
+        self.distinct_nodes = [chord_node for _, chord_node in distance_pairs]
+        self.distinct_dirty = False
+
+    def distinct_finger_count(self):
+        # Number of Distinct Finger Nodes, Owner Excluded
+        if self.distinct_dirty:
+            self.rebuild_distinct()
+        return len(self.distinct_nodes)
+
+    def closest_preceding_node(self, identifier):
+        # Finger Node Closest Before Identifier, Inside Arc (owner, identifier). O(log m)
+        if self.distinct_dirty:
+            self.rebuild_distinct()
+        # Arc (owner, owner) Is The Whole Circle Less The Owner
+        identifier_distance = (identifier - self.owner_identifier) % RING_SIZE or RING_SIZE
+        # Nodes Strictly Closer Than Identifier Sit Left of Its Insertion Point
+        position = bisect_left(self.distinct_distances, identifier_distance)
+        if position == 0:
+            # No Finger Precedes Identifier
+            return None
+        return self.distinct_nodes[position - 1]
@@ -0,0 +1,100 @@
+"""
+@author Edwin Kaburu
+@date 11/19/2022
+@see "Seattle University, CPSC 5520, Fall 2022" - Distributed Systems
+@file chord_hotkeys.py
+Lab4 Chord
+"""
+
+import sys
+import time
+from array import array
+from collections import OrderedDict
+
+# Count-Min Sketch Shape: Rows of Counters, Each Row Indexed By Its Own Slice of The Key
+SKETCH_DEPTH = 4
+SKETCH_WIDTH = 4096
+# Counts Halve After This Many Requests, So Keys That Cooled Off Stop Looking Hot
+SKETCH_WINDOW = 10 * SKETCH_WIDTH
+# Requests Within The Window That Make A Key Hot
+HOT_KEY_THRESHOLD = 8
+# Hot Records Kept Along Lookup Paths, and Seconds Each Copy Stays Valid
+RECORD_CACHE_SIZE = 1024
+RECORD_CACHE_TTL = 5.0
+
+
+class HotKeySketch:
+    # Approximate Per-Key Request Counts In Fixed Memory, Never Under-Counting
+
+    def __init__(self, depth=SKETCH_DEPTH, width=SKETCH_WIDTH, window=SKETCH_WINDOW):
+        self.depth = depth
+        self.width = width
+        self.window = window
+        self.counter_rows = [array('I', bytes(4 * width)) for _ in range(depth)]
+        # A Row Read As One Integer, Every Counter's Low 31 Bits Set: Clears Bits Shifted In From The Next Counter
+        self.decay_mask = int.from_bytes(array('I', [0x7FFFFFFF]) * width, sys.byteorder)
+        # Requests Counted Since Counts Last Halved, and In Total
+        self.window_count = 0
+        self.requests_counted = 0
+
+    def count(self, identifier):
+        # Count One Request For identifier, Return Its Estimated Count
+        self.window_count += 1
+        self.requests_counted += 1
+        if self.window_count >= self.window:
+            self.decay()
+        estimate = None
+        for row_index, counter_row in enumerate(self.counter_rows):
+            # SHA-1 Identifiers Are Uniform, Each Row Takes A Different 32-Bit Slice
+            column = (identifier >> (32 * row_index)) % self.width
+            counter_row[column] += 1
+            if estimate is None or counter_row[column] < estimate:
+                estimate = counter_row[column]
+        return estimate
+
+    def decay(self):
+        # Halve Every Counter of A Row In One Shift, Not One Python Step Per Counter
+        for row_index, counter_row in enumerate(self.counter_rows):
+            halved_row = (int.from_bytes(counter_row, sys.byteorder) >> 1) & self.decay_mask
+            self.counter_rows[row_index] = array('I', halved_row.to_bytes(4 * self.width, sys.byteorder))
+        self.window_count = 0
+
+
+class RecordCache:
+    # Bounded LRU of Hot Records, Each Copy Expiring After ttl Seconds
+
+    def __init__(self, capacity=RECORD_CACHE_SIZE, ttl=RECORD_CACHE_TTL):
+        self.capacity = capacity
+        self.ttl = ttl
+        # Key -> (Expiry Time, Record), Least Recently Used First
+        self.cached_records = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def get(self, key):
+        cached_record = self.cached_records.get(key)
+        if cached_record is None:
+            self.misses += 1
+            return None
+        if cached_record[0] < time.monotonic():
+            # Stale Copy, The Owner Is Asked Again
+            del self.cached_records[key]
+            self.expired += 1
+            self.misses += 1
+            return None
+        self.cached_records.move_to_end(key)
+        self.hits += 1
+        return cached_record[1]
+
+    def put(self, key, record):
+        if self.capacity <= 0:
+            return
+        self.cached_records.pop(key, None)
+        if len(self.cached_records) >= self.capacity:
+            # Evict Least Recently Used Record
+            self.cached_records.popitem(last=False)
+        self.cached_records[key] = (time.monotonic() + self.ttl, record)
+
+    def node_stats(self):
+        return {'size': len(self.cached_records), 'hits': self.hits, 'misses': self.misses, 'expired': self.expired}
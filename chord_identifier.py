@@ -0,0 +1,70 @@
+"""
+@author Edwin Kaburu
+@date 11/19/2022
+@see "Seattle University, CPSC 5520, Fall 2022" - Distributed Systems
+@file chord_identifier.py
+Lab4 Chord
+"""
+
+import hashlib
+
+SHA1_M_BIT_LENGTH = 160
+# Size of the Identifier Circle, 2^m
+RING_SIZE = 1 << SHA1_M_BIT_LENGTH
+# Precomputed Finger Offsets, 2^(i-1) for i in [1, m]
+FINGER_OFFSETS = tuple(1 << (i - 1) for i in range(1, SHA1_M_BIT_LENGTH + 1))
+
+
+class Identifier(int):
+    # Position On The Identifier Circle, Held As Integer So Routing Never Parses Strings.
+    # Converted To Hex-Decimal Only For Display and On The Wire
+    __slots__ = ()
+
+    def __new__(cls, value):
+        if isinstance(value, Identifier):
+            # Already Normalized
+            return value
+        if isinstance(value, (str, bytes)):
+            # Parse Hex-Decimal Form, once, at the edge
+            value = int(value, 16)
+        # Keep Value Inside The Identifier Circle
+        return super().__new__(cls, value % RING_SIZE)
+
+    @classmethod
+    def from_key(cls, text):
+        # Hash Text using SHA-1 function
+        return cls(int.from_bytes(hashlib.sha1(text.encode()).digest(), 'big'))
+
+    def hex_form(self):
+        # Hex-Decimal Form, Used For Display and On The Wire
+        return hex(self)
+
+    def finger_start(self, i_i, summation=True):
+        # Add By Default, To Get Next Successor Halfway
+        if summation:
+            return Identifier(self + FINGER_OFFSETS[i_i - 1])
+        # Subtract, To Get Predecessor
+        return Identifier(self - FINGER_OFFSETS[i_i - 1])
+
+    def finger_starts(self):
+        # All m Finger Starts, Index 0 Holds Finger 1
+        return tuple(Identifier(self + offset) for offset in FINGER_OFFSETS)
+
+    def in_arc(self, left, right, notation_str='()'):
+        # Clockwise Distances From Left Endpoint
+        span = (right - left) % RING_SIZE
+        offset = (self - left) % RING_SIZE
+        if offset == 0:
+            # On Left Endpoint, or Both Endpoints when Arc Covers Whole Circle
+            return notation_str[0] == '[' or (span == 0 and notation_str[1] == ']')
+        if offset == span:
+            # On Right Endpoint
+            return notation_str[1] == ']'
+        # Strictly Inside, Equal Endpoints Mean The Whole Circle
+        return span == 0 or offset < span
+
+    def __repr__(self):
+        return f'Identifier({hex(self)})'
+
+    def __str__(self):
+        return hex(self)
@@ -0,0 +1,279 @@
+"""
+@author Edwin Kaburu
+@date 11/19/2022
+@see "Seattle University, CPSC 5520, Fall 2022" - Distributed Systems
+@file chord_launcher.py
+Lab4 Chord
+"""
+
+import os
+import sys
+import time
+import queue
+import signal
+import asyncio
+import logging
+import argparse
+import multiprocessing
+from chord_codec import ChordNode
+from chord_identifier import Identifier
+from chord_network import ConnectionPool
+from chord_node import STABILIZE_INTERVAL, FIX_FINGERS_INTERVAL, SUCCESSOR_LIST_LENGTH, VIRTUAL_NODE_COUNT, \
+    REPLICATION_FACTOR, ChordProtocol
+
+# Nodes Joining At Once Across All Workers, Stabilize Settles What Concurrent Joins Leave Behind
+JOIN_CONCURRENCY = 1
+# Seconds A Join Waits For A Slot. A Worker Killed Mid-Join Never Gives Its Slot Back
+JOIN_SLOT_TIMEOUT = 10.0
+# Tries Per Node Join, A Stabilize Round Apart. Joining While The Ring Repairs Around A Dead Worker Can Fail
+JOIN_ATTEMPTS = 3
+# Seconds A Fully Joined Ring May Stay Unstable Before The Supervisor Repairs It, A Few Stabilize Rounds
+RING_REPAIR_AFTER = 5.0
+# Seconds Between Supervisor Rounds: Worker Liveness, Then A Ring Check Until Stable
+SUPERVISE_INTERVAL = 0.5
+
+# Supervisor Status Lines
+launcher_logger = logging.getLogger('chord_launcher')
+
+
+def launcher_worker(worker_index, node_count, bootstrap_port, node_options, join_semaphore, status_queue, log_level):
+    # One Process Per Core, Its Nodes Share One Event Loop. Ctrl-C Is The Supervisor's To Handle
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(stream=sys.stdout, level=log_level, format='%(message)s', force=True)
+    asyncio.run(launcher_worker_main(worker_index, node_count, bootstrap_port, node_options, join_semaphore,
+                                     status_queue))
+
+
+async def launcher_worker_main(worker_index, node_count, bootstrap_port, node_options, join_semaphore, status_queue):
+    event_loop = asyncio.get_running_loop()
+    chord_nodes = []
+    for _ in range(node_count):
+        # Join Slot Shared With The Other Workers, Waited For Off The Loop So Our Nodes Keep Serving
+        slot_acquired = await event_loop.run_in_executor(None, join_semaphore.acquire, True, JOIN_SLOT_TIMEOUT)
+        try:
+            # First Node of The First Worker Starts The Ring, Everyone Else Joins Through It
+            chord_node = await launcher_join(bootstrap_port, node_options)
+            for _ in range(1, chord_node.virtual_node_count):
+                await chord_node.protocol_start_virtual_node()
+        finally:
+            if slot_acquired:
+                join_semaphore.release()
+        if not bootstrap_port:
+            bootstrap_port = chord_node.SingleNode.listen_address[1]
+        chord_nodes.append(chord_node)
+        status_queue.put((worker_index, [chord_protocol.SingleNode.listen_address[1]
+                                         for chord_protocol in [chord_node, *chord_node.virtual_nodes]]))
+    # Serve Until The Supervisor Stops Us
+    await event_loop.create_future()
+
+
+async def launcher_join(bootstrap_port, node_options):
+    for join_attempt in range(1, JOIN_ATTEMPTS + 1):
+        chord_node = ChordProtocol(bootstrap_port, run_forever=False, **node_options)
+        try:
+            await chord_node.protocol_start()
+            return chord_node
+        except Exception as error_msg:
+            # Join Has No Retry Of Its Own: Drop The Half Linked Node, A Fresh One Tries After Stabilize Runs
+            launcher_logger.warning('%s: Join Attempt %d Failed, %r', chord_node.SingleNode.listen_address,
+                                    join_attempt, error_msg)
+            if chord_node.listener is not None:
+                chord_node.listener.close()
+            chord_node.connection_pool.close()
+            if join_attempt == JOIN_ATTEMPTS:
+                raise
+            await asyncio.sleep(node_options.get('stabilize_interval', STABILIZE_INTERVAL))
+
+
+def launcher_ring_order(node_ports):
+    # Ports In Ring Order, Identifiers Hashed The Way Nodes Hash Their Own Endpoints
+    return sorted(node_ports, key=lambda node_port: Identifier.from_key('localhost' + str(node_port)))
+
+
+def launcher_misplaced_nodes(connection_pool, node_ports):
+    # Port -> (Successor, Predecessor) It Should Have, For Every Node Not Linked To Its Neighbours In Identifier Order
+    ordered_ports = launcher_ring_order(node_ports)
+    misplaced_nodes = dict()
+    for port_index, node_port in enumerate(ordered_ports):
+        successor_port, predecessor_port = ordered_ports[(port_index + 1) % len(ordered_ports)], \
+            ordered_ports[port_index - 1]
+        ring_stats = connection_pool.node_send_network_message(('RingStats', (0, -1)), node_port)
+        if ring_stats is None or ring_stats['successor_list'][:1] != [successor_port] or \
+                ring_stats['predecessor'] != predecessor_port:
+            misplaced_nodes[node_port] = (successor_port, predecessor_port)
+    return misplaced_nodes
+
+
+def launcher_chord_node(node_port):
+    # Descriptor of A Launched Node, Built The Way It Builds Its Own
+    chord_node = ChordNode()
+    chord_node.identifier = Identifier.from_key('localhost' + str(node_port))
+    chord_node.listen_address = ('127.0.0.1', node_port)
+    return chord_node
+
+
+def launcher_repair_ring(connection_pool, misplaced_nodes):
+    # Stabilize Cannot Undo A Ring Looping Round Twice After Concurrent Failures and Joins, But The Launcher
+    # Knows Every Member: Offer Each Misplaced Node Its True Neighbours Through The Usual Finger Update and Notify
+    for node_port, (successor_port, predecessor_port) in misplaced_nodes.items():
+        connection_pool.node_send_network_message(
+            ('UpdateFingers', (launcher_chord_node(successor_port), [1], -1)), node_port)
+        connection_pool.node_send_network_message(('Notify', (launcher_chord_node(predecessor_port), -1)), node_port)
+
+
+class ChordLauncher:
+    # Starts Nodes Across A Pool of Worker Processes, Restarts Workers That Die, Reports When The Ring Settles
+
+    def __init__(self, node_count, bootstrap_port=0, process_count=None, join_concurrency=JOIN_CONCURRENCY,
+                 node_options=None, log_level='WARNING'):
+        self.node_count = node_count
+        self.bootstrap_port = bootstrap_port
+        self.process_count = max(1, min(process_count or os.cpu_count() or 1, node_count))
+        self.node_options = node_options or dict()
+        self.log_level = log_level
+        self.join_semaphore = multiprocessing.Semaphore(join_concurrency)
+        self.status_queue = multiprocessing.Queue()
+        # Worker Index -> (Process, Nodes It Hosts), and Worker Index -> Ports Its Nodes Listen On
+        self.workers = dict()
+        self.worker_ports = dict()
+        self.restart_count = 0
+        self.start_time = time.monotonic()
+        # Seconds From Launch Until The Ring Was Last Found Stable, None While Settling
+        self.stable_seconds = None
+        # When A Fully Joined Ring Was First Seen Unstable, None Until Then
+        self.unstable_since = None
+
+    def launcher_node_ports(self):
+        return [node_port for worker_ports in self.worker_ports.values() for node_port in worker_ports]
+
+    def launcher_start_worker(self, worker_index, node_count, bootstrap_port):
+        worker_process = multiprocessing.Process(
+            target=launcher_worker, args=(worker_index, node_count, bootstrap_port, self.node_options,
+                                          self.join_semaphore, self.status_queue, self.log_level), daemon=True)
+        worker_process.start()
+        self.workers[worker_index] = (worker_process, node_count)
+        self.worker_ports[worker_index] = []
+
+    def launcher_collect_status(self, timeout=None):
+        # Ports Reported By Workers As Their Nodes Join: Waits Up To timeout For The First, Then Drains The Rest
+        try:
+            worker_index, node_ports = self.status_queue.get(timeout=timeout)
+            while True:
+                if worker_index in self.worker_ports:
+                    self.worker_ports[worker_index].extend(node_ports)
+                    self.stable_seconds = None
+                worker_index, node_ports = self.status_queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def launcher_start(self):
+        # Nodes Split Evenly, Earlier Workers Take The Remainder
+        worker_sizes = [self.node_count // self.process_count + (worker_index < self.node_count % self.process_count)
+                        for worker_index in range(self.process_count)]
+        worker_indexes = range(self.process_count)
+        if not self.bootstrap_port:
+            # No Ring Yet: Worker 0 Creates It, The Rest Wait For Its First Port
+            self.launcher_start_worker(0, worker_sizes[0], 0)
+            while not self.worker_ports[0]:
+                self.launcher_collect_status(timeout=SUPERVISE_INTERVAL)
+                if not self.workers[0][0].is_alive():
+                    raise RuntimeError('First Node Failed To Start')
+            self.bootstrap_port = self.worker_ports[0][0]
+            worker_indexes = range(1, self.process_count)
+        for worker_index in worker_indexes:
+            self.launcher_start_worker(worker_index, worker_sizes[worker_index], self.bootstrap_port)
+        launcher_logger.info('Launching %d Nodes On %d Processes Through Port %d', self.node_count,
+                             self.process_count, self.bootstrap_port)
+
+    def launcher_supervise(self, until_stable=False):
+        # Runs Forever, Or Returns Seconds Since Launch Once The Ring Is Stable
+        connection_pool = ConnectionPool()
+        while True:
+            self.launcher_collect_status(timeout=SUPERVISE_INTERVAL)
+            for worker_index, (worker_process, node_count) in list(self.workers.items()):
+                if worker_process.is_alive():
+                    continue
+                # Crashed Worker: Its Nodes Are Gone, A Fresh Worker Joins The Same Number Through A Live Node
+                lost_ports = set(self.worker_ports.pop(worker_index))
+                live_ports = [node_port for node_port in self.launcher_node_ports() if node_port not in lost_ports]
+                launcher_logger.warning('Worker %d Exited With Code %s, Restarting %d Nodes', worker_index,
+                                        worker_process.exitcode, node_count)
+                if not live_ports:
+                    raise RuntimeError('No Live Node Left To Rejoin Through')
+                self.bootstrap_port = live_ports[0]
+                self.launcher_start_worker(worker_index, node_count, self.bootstrap_port)
+                self.restart_count += 1
+                self.stable_seconds = None
+            node_ports = self.launcher_node_ports()
+            if self.stable_seconds is not None or len(node_ports) < self.node_count * self.launcher_ports_per_node():
+                self.unstable_since = None
+                continue
+            misplaced_nodes = launcher_misplaced_nodes(connection_pool, node_ports)
+            if misplaced_nodes:
+                if self.unstable_since is None:
+                    self.unstable_since = time.monotonic()
+                elif time.monotonic() - self.unstable_since > RING_REPAIR_AFTER:
+                    launcher_logger.warning('Ring Not Converging, Pointing %d Nodes At Their Neighbours',
+                                            len(misplaced_nodes))
+                    launcher_repair_ring(connection_pool, misplaced_nodes)
+                    self.unstable_since = None
+            else:
+                self.stable_seconds = time.monotonic() - self.start_time
+                launcher_logger.info('Ring Stable: %d Nodes In %.1f s, %d Worker Restarts\n%s', len(node_ports),
+                                     self.stable_seconds, self.restart_count,
+                                     ' '.join(map(str, launcher_ring_order(node_ports))))
+                if until_stable:
+                    connection_pool.close()
+                    return self.stable_seconds
+
+    def launcher_ports_per_node(self):
+        return self.node_options.get('virtual_node_count', VIRTUAL_NODE_COUNT)
+
+    def launcher_stop(self):
+        for worker_process, _ in self.workers.values():
+            worker_process.terminate()
+        for worker_process, _ in self.workers.values():
+            worker_process.join()
+
+
+if __name__ == '__main__':
+    # Node Count, Then Where To Join and How Hard To Push; Node Settings Match chord_node.py
+    argument_parser = argparse.ArgumentParser(prog='python chord_launcher.py')
+    argument_parser.add_argument('node_count', metavar='NODES', type=int)
+    argument_parser.add_argument('--bootstrap', dest='bootstrap_port', type=int, default=0,
+                                 help='Existing Node To Join Through, A New Ring When Left Out')
+    argument_parser.add_argument('--processes', dest='process_count', type=int, default=None,
+                                 help='Worker Processes, One Per Core When Left Out')
+    argument_parser.add_argument('--join-concurrency', type=int, default=JOIN_CONCURRENCY)
+    argument_parser.add_argument('--lookup-mode', choices=['recursive', 'iterative'], default='recursive')
+    argument_parser.add_argument('--stabilize-interval', type=float, default=STABILIZE_INTERVAL)
+    argument_parser.add_argument('--fix-fingers-interval', type=float, default=FIX_FINGERS_INTERVAL)
+    argument_parser.add_argument('--successors', dest='successor_list_length', type=int, default=SUCCESSOR_LIST_LENGTH)
+    argument_parser.add_argument('--virtual-nodes', dest='virtual_node_count', type=int, default=VIRTUAL_NODE_COUNT)
+    argument_parser.add_argument('--replicas', dest='replication_factor', type=int, default=REPLICATION_FACTOR)
+    argument_parser.add_argument('--log-level', default=os.environ.get('CHORD_LOG_LEVEL', 'INFO'),
+                                 choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'])
+    argument_parser.add_argument('--node-log-level', default='WARNING', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                                 help='Log Level Inside Workers, Per-Node Join Lines At INFO')
+    launcher_arguments = argument_parser.parse_args()
+    logging.basicConfig(stream=sys.stdout, level=launcher_arguments.log_level, format='%(message)s')
+
+    chord_launcher = ChordLauncher(
+        launcher_arguments.node_count, launcher_arguments.bootstrap_port, launcher_arguments.process_count,
+        launcher_arguments.join_concurrency,
+        {'lookup_mode': launcher_arguments.lookup_mode, 'stabilize_interval': launcher_arguments.stabilize_interval,
+         'fix_fingers_interval': launcher_arguments.fix_fingers_interval,
+         'successor_list_length': launcher_arguments.successor_list_length,
+         'virtual_node_count': launcher_arguments.virtual_node_count,
+         'replication_factor': launcher_arguments.replication_factor},
+        launcher_arguments.node_log_level)
+    # SIGTERM Stops The Workers The Same Way Ctrl-C Does
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        chord_launcher.launcher_start()
+        # Runs Until Ctrl-C
+        chord_launcher.launcher_supervise()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        chord_launcher.launcher_stop()
@@ -0,0 +1,74 @@
+"""
+@author Edwin Kaburu
+@date 11/19/2022
+@see "Seattle University, CPSC 5520, Fall 2022" - Distributed Systems
+@file chord_metrics.py
+Lab4 Chord
+"""
+
+# Power-of-Two Microsecond Buckets: Bucket i Holds Samples Under 2^i us, The Last Takes Everything Longer
+HISTOGRAM_BUCKETS = 32
+
+
+class LatencyHistogram:
+    # Fixed Buckets, So Recording Is One Index and Three Adds
+
+    def __init__(self):
+        self.bucket_counts = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds):
+        bucket_index = int(seconds * 1e6).bit_length()
+        self.bucket_counts[bucket_index if bucket_index < HISTOGRAM_BUCKETS else HISTOGRAM_BUCKETS - 1] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def percentile(self, fraction):
+        # Upper Edge of The Bucket Holding The Sample At fraction, In Seconds
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen_count = 0
+        for bucket_index, bucket_count in enumerate(self.bucket_counts):
+            seen_count += bucket_count
+            if seen_count >= rank:
+                return min((1 << bucket_index) / 1e6, self.max_seconds)
+        return self.max_seconds
+
+    def node_stats(self):
+        return {
+            'count': self.count,
+            'mean': self.total_seconds / self.count if self.count else 0.0,
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'p99': self.percentile(0.99),
+            'max': self.max_seconds,
+            # Upper Edge In Microseconds -> Samples, Empty Buckets Left Out
+            'buckets': {1 << bucket_index: bucket_count
+                        for bucket_index, bucket_count in enumerate(self.bucket_counts) if bucket_count},
+        }
+
+
+class RpcMetrics:
+    # Per Message Type: A Latency Histogram, Whose Count Is The Calls, and Failures
+
+    def __init__(self):
+        self.rpc_latency = dict()
+        self.rpc_failures = dict()
+
+    def record(self, message_name, seconds, failed=False):
+        latency_histogram = self.rpc_latency.get(message_name)
+        if latency_histogram is None:
+            latency_histogram = self.rpc_latency[message_name] = LatencyHistogram()
+        latency_histogram.record(seconds)
+        if failed:
+            self.rpc_failures[message_name] = self.rpc_failures.get(message_name, 0) + 1
+
+    def node_stats(self):
+        return {message_name: {'count': latency_histogram.count, 'failures': self.rpc_failures.get(message_name, 0),
+                               'latency': latency_histogram.node_stats()}
+                for message_name, latency_histogram in sorted(self.rpc_latency.items())}
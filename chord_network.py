@@ -0,0 +1,748 @@
+"""
+@author Edwin Kaburu
+@date 11/19/2022
+@see "Seattle University, CPSC 5520, Fall 2022" - Distributed Systems
+@file chord_network.py
+Lab4 Chord
+"""
+
+import time
+import asyncio
+import random
+import logging
+import struct
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+import itertools
+import threading
+from socket import *
+from chord_identifier import SHA1_M_BIT_LENGTH, Identifier
+from chord_codec import node_encode_body, node_decode_body
+from chord_metrics import RpcMetrics
+
+# Connection Failures Are Warnings, Silenced By Raising The Level
+network_logger = logging.getLogger('chord_network')
+
+# Frame Header: Payload Length (4 bytes), Message Type (1 byte), Request ID (4 bytes), Network Byte Order
+FRAME_HEADER = struct.Struct('!IBI')
+# Seconds A Pooled Connection May Sit Unused Before Eviction
+POOL_IDLE_TIMEOUT = 30.0
+# Seconds A Threaded Request Waits For Its Reply, Long Enough For A Whole-File Populate
+REQUEST_TIMEOUT = 300.0
+# Starting Size of A Pooled Connection's Receive Buffer, Grown As Larger Frames Arrive
+RECEIVE_BUFFER_SIZE = 256 << 10
+# Records Per Bulk Store Message
+POPULATE_BATCH_SIZE = 1000
+# Owner Arcs Kept By A Location Cache
+LOCATION_CACHE_SIZE = 1024
+# Reply From A Node Asked For A Key Outside Its Arc
+NOT_OWNER = "Not Owner"
+# Message Type Codes Carried In The Frame Header
+MESSAGE_TYPES = {
+    'Reply': 0,
+    'UpdateFinger': 1,
+    'UpdateSuccessor': 2,
+    'FindSuccessor': 3,
+    'FindPredecessor': 4,
+    'UpdatePredecessor': 5,
+    'Populate': 7,
+    'FindKey': 8,
+    'NextHop': 9,
+    'StoreRecords': 10,
+    'FindKeys': 11,
+    'StabilizeInfo': 12,
+    'Notify': 13,
+    'RingStats': 14,
+    'CopyFingers': 15,
+    'UpdateFingers': 16,
+    'ReplicaSet': 17,
+    'StoreReplicas': 18,
+    'Stats': 19,
+    'HandoffKeys': 20,
+    'LeaveRecords': 21,
+    'NodeLeft': 22,
+    'Leave': 23,
+}
+# Reverse Lookup, Code To Message Name
+MESSAGE_NAMES = {code: name for name, code in MESSAGE_TYPES.items()}
+
+
+class ReceiveBuffer:
+    # One Connection's Frame Buffer: Filled In Place By recv_into, Grown To The Largest Frame Seen and Reused,
+    # So A Large Reply Costs One Copy Out of The Kernel. Pools Drop Idle Connections, Releasing Grown Buffers
+
+    def __init__(self, buffer_size=RECEIVE_BUFFER_SIZE):
+        self.buffer_data = bytearray(buffer_size)
+
+    def node_receive_into(self, socket_t, byte_count):
+        # Exactly byte_count Bytes At The Front of The Buffer, False If Peer Closes Early
+        if byte_count > len(self.buffer_data):
+            # At Least Doubled, So A Stream of Growing Frames Reallocates Rarely
+            self.buffer_data = bytearray(max(byte_count, 2 * len(self.buffer_data)))
+        with memoryview(self.buffer_data) as buffer_view:
+            filled = 0
+            while filled < byte_count:
+                received = socket_t.recv_into(buffer_view[filled:byte_count])
+                if not received:
+                    return False
+                filled += received
+        return True
+
+    def node_receive_frame(self, socket_t):
+        try:
+            # Read Fixed-Size Header
+            if not self.node_receive_into(socket_t, FRAME_HEADER.size):
+                return None
+            payload_length, message_type, request_id = FRAME_HEADER.unpack_from(self.buffer_data)
+            # Read Exactly One Payload Over The Header, No Waiting For Peer To Close
+            if not self.node_receive_into(socket_t, payload_length):
+                return None
+            # Return (Message Name, Request ID, Body Decoded Straight From The Buffer)
+            return MESSAGE_NAMES.get(message_type), request_id, node_decode_body(self.buffer_data, payload_length)
+        except OSError:
+            return None
+        except ValueError as error_msg:
+            # Malformed Body: The Stream Cannot Be Trusted Past It, Treated As A Closed Connection
+            network_logger.warning('Dropping Connection, %s', error_msg)
+            return None
+
+
+def node_encode_frame(message_name, message_body, request_id=0):
+    # Serialize Body, Prefix With Length, Type And Request ID
+    payload = node_encode_body(message_body)
+    return FRAME_HEADER.pack(len(payload), MESSAGE_TYPES[message_name], request_id) + payload
+
+
+def node_send_frame(socket_t, message_name, message_body, request_id=0):
+    # One Write Per Frame
+    socket_t.sendall(node_encode_frame(message_name, message_body, request_id))
+
+
+def node_receive_frame(socket_t):
+    # One-Off Read, The Buffer Sized To The Frame
+    return ReceiveBuffer(FRAME_HEADER.size).node_receive_frame(socket_t)
+
+
+def node_get_response_sync(socket_t):
+    # Wait For The Reply Frame
+    frame = node_receive_frame(socket_t)
+    if frame is None or frame[0] != 'Reply':
+        return None
+    # Return Deserialized Response
+    return frame[2]
+
+
+def node_send_network_message(message, port_num):
+    # Act as a Client, asking An Existing Node To Handle (Method, Data)
+    client_socket = socket(AF_INET, SOCK_STREAM)
+    host_response = None
+    try:
+        # Connect To Existing-Node-Host
+        client_socket.connect(('localhost', port_num))
+        # Send Framed Request To Existing-Node-Host
+        node_send_frame(client_socket, message[0], message[1])
+        # Get Response from Existing-Node-Host
+        host_response = node_get_response_sync(client_socket)
+    except OSError as error_msg:
+        # Log Exception message
+        network_logger.warning('%s', error_msg)
+
+    # Close Client Connection Socket
+    client_socket.close()
+    # Return Result
+    return host_response
+
+
+class NodeConnection:
+    # Long-Lived Connection To One Peer, Many Requests May Be Outstanding At Once
+
+    def __init__(self, port_num, buffer_size=RECEIVE_BUFFER_SIZE, request_timeout=REQUEST_TIMEOUT):
+        # Peer Port
+        self.port_num = port_num
+        self.request_timeout = request_timeout
+        # Request ID -> [Event, Response], Waiting For Replies
+        self.pending_requests = dict()
+        # Monotonic Request IDs, Wrapped To The 4-Byte Header Field
+        self.request_ids = itertools.count(1)
+        # Serializes Writers Sharing The Socket
+        self.send_lock = threading.Lock()
+        self.pending_lock = threading.Lock()
+        # Last Time A Request Went Out
+        self.last_used = time.monotonic()
+        self.closed = False
+        # Connect To Peer, Small Frames Go Out Without Delay
+        self.client_socket = create_connection(('localhost', port_num))
+        self.client_socket.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+        # Only The Reader Thread Fills It
+        self.receive_buffer = ReceiveBuffer(buffer_size)
+        # Reader Dispatches Replies By Request ID
+        threading.Thread(target=self.node_reader_loop, daemon=True).start()
+
+    def node_reader_loop(self):
+        while True:
+            frame = self.receive_buffer.node_receive_frame(self.client_socket)
+            if frame is None:
+                break
+            with self.pending_lock:
+                waiting = self.pending_requests.pop(frame[1], None)
+            if waiting is not None:
+                # Hand Response To Its Caller
+                waiting[1] = frame[2]
+                waiting[0].set()
+        # Peer Closed Or Died: Wake Everyone Still Waiting
+        self.close()
+
+    def node_request(self, message):
+        # Register Before Sending, The Reply May Beat Us Back
+        request_id = next(self.request_ids) & 0xFFFFFFFF
+        waiting = [threading.Event(), None]
+        with self.pending_lock:
+            if self.closed:
+                raise ConnectionError(f'Connection To {self.port_num} Closed')
+            self.pending_requests[request_id] = waiting
+        self.last_used = time.monotonic()
+        try:
+            with self.send_lock:
+                node_send_frame(self.client_socket, message[0], message[1], request_id)
+        except OSError:
+            with self.pending_lock:
+                self.pending_requests.pop(request_id, None)
+            self.close()
+            # Nothing Reached The Peer, Safe To Retry
+            raise ConnectionError(f'Connection To {self.port_num} Lost Before Send')
+        if not waiting[0].wait(self.request_timeout):
+            with self.pending_lock:
+                self.pending_requests.pop(request_id, None)
+            raise TimeoutError(f'No Reply From {self.port_num} In {self.request_timeout} s')
+        return waiting[1]
+
+    def node_close_if_idle(self, idle_timeout):
+        # Closed Only If Unused That Long With Nothing Waiting. Checked Under The Lock Requests Register With, So A
+        # Later Request Sees The Connection Closed and Is Retried On A New One
+        with self.pending_lock:
+            if self.closed:
+                return True
+            if self.pending_requests or time.monotonic() - self.last_used <= idle_timeout:
+                return False
+            self.closed = True
+        self.node_close_socket()
+        return True
+
+    def node_close_socket(self):
+        try:
+            self.client_socket.shutdown(SHUT_RDWR)
+        except OSError:
+            pass
+        self.client_socket.close()
+
+    def close(self):
+        with self.pending_lock:
+            if self.closed:
+                return
+            self.closed = True
+            waiting_list = list(self.pending_requests.values())
+            self.pending_requests.clear()
+        self.node_close_socket()
+        for waiting in waiting_list:
+            # Outstanding Requests Fail With No Response
+            waiting[0].set()
+
+
+class ConnectionPool:
+    # Persistent Connections Keyed By Peer Port
+
+    def __init__(self, idle_timeout=POOL_IDLE_TIMEOUT, buffer_size=RECEIVE_BUFFER_SIZE,
+                 request_timeout=REQUEST_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        # Starting Receive Buffer of Each Connection
+        self.buffer_size = buffer_size
+        self.request_timeout = request_timeout
+        self.connections = dict()
+        self.pool_lock = threading.Lock()
+
+    def node_get_connection(self, port_num):
+        with self.pool_lock:
+            # Evict Idle And Dead Connections, Never One Another Thread Still Waits On
+            for peer_port, connection in list(self.connections.items()):
+                if connection.node_close_if_idle(self.idle_timeout):
+                    del self.connections[peer_port]
+            connection = self.connections.get(port_num)
+            if connection is None:
+                connection = NodeConnection(port_num, self.buffer_size, self.request_timeout)
+                self.connections.update({port_num: connection})
+        return connection
+
+    def node_send_network_message(self, message, port_num):
+        # Same Contract As The Module Function, Over A Pooled Connection
+        for attempt in range(2):
+            try:
+                return self.node_get_connection(port_num).node_request(message)
+            except ConnectionError as error_msg:
+                # Dead Peer Connection: Reconnect Once
+                if attempt == 1:
+                    network_logger.warning('%s', error_msg)
+            except TimeoutError as error_msg:
+                # Slow Peer, Not Retried: It May Still Act On The Request
+                network_logger.warning('%s', error_msg)
+                break
+            except OSError as error_msg:
+                # Peer Not Accepting Connections
+                network_logger.warning('%s', error_msg)
+                break
+        return None
+
+    def close(self):
+        with self.pool_lock:
+            for connection in self.connections.values():
+                connection.close()
+            self.connections.clear()
+
+
+class FrameProtocol(asyncio.BufferedProtocol):
+    # Asyncio Side of ReceiveBuffer: The Event Loop recv_intos Straight Into A Growable bytearray, Each Whole Frame
+    # Is Decoded Where It Landed and Handed To frame_handler(Protocol, Frame); Frame None Once The Peer Is Gone
+
+    def __init__(self, frame_handler, buffer_size=RECEIVE_BUFFER_SIZE):
+        self.frame_handler = frame_handler
+        self.buffer_data = bytearray(max(buffer_size, FRAME_HEADER.size))
+        # Bytes Received But Not Yet Handed On, Always At The Front of The Buffer
+        self.filled = 0
+        # Header Plus Payload of The Frame Being Received, 0 Until Its Header Is In
+        self.frame_length = 0
+        self.transport = None
+        # Set While The Transport's Write Buffer Is Full
+        self.drain_waiter = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        # Small Frames Go Out Without Delay
+        transport.get_extra_info('socket').setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+
+    def get_buffer(self, sizehint):
+        if self.frame_length > len(self.buffer_data):
+            # At Least Doubled, Received Bytes Carried Over. Replaced, Never Resized: The Loop May Still Hold A View
+            grown_buffer = bytearray(max(self.frame_length, 2 * len(self.buffer_data)))
+            grown_buffer[:self.filled] = self.buffer_data[:self.filled]
+            self.buffer_data = grown_buffer
+        return memoryview(self.buffer_data)[self.filled:]
+
+    def buffer_updated(self, nbytes):
+        self.filled += nbytes
+        frame_start = 0
+        # Every Whole Frame Now In The Buffer, Several When Small Replies Arrive Together
+        while self.filled - frame_start >= FRAME_HEADER.size:
+            payload_length, message_type, request_id = FRAME_HEADER.unpack_from(self.buffer_data, frame_start)
+            self.frame_length = FRAME_HEADER.size + payload_length
+            if self.filled - frame_start < self.frame_length:
+                break
+            try:
+                message_body = node_decode_body(self.buffer_data, payload_length, frame_start + FRAME_HEADER.size)
+            except ValueError as error_msg:
+                # Malformed Body: The Stream Cannot Be Trusted Past It, connection_lost Follows
+                network_logger.warning('Dropping Connection, %s', error_msg)
+                self.transport.abort()
+                return
+            frame_start += self.frame_length
+            self.frame_length = 0
+            self.frame_handler(self, (MESSAGE_NAMES.get(message_type), request_id, message_body,
+                                      FRAME_HEADER.size + payload_length))
+        if frame_start:
+            # Partial Frame Moved To The Front, Same Length Assignment So No Resize
+            remaining = self.filled - frame_start
+            self.buffer_data[:remaining] = self.buffer_data[frame_start:self.filled]
+            self.filled = remaining
+
+    def pause_writing(self):
+        self.drain_waiter = asyncio.get_running_loop().create_future()
+
+    def resume_writing(self):
+        drain_waiter, self.drain_waiter = self.drain_waiter, None
+        if drain_waiter is not None and not drain_waiter.done():
+            drain_waiter.set_result(None)
+
+    async def node_drain(self):
+        # Wait Until The Transport Takes More, ConnectionResetError Once It Is Closed
+        if self.drain_waiter is not None:
+            await self.drain_waiter
+        if self.transport.is_closing():
+            raise ConnectionResetError('Connection Lost')
+
+    def connection_lost(self, error_msg):
+        self.resume_writing()
+        self.frame_handler(self, None)
+
+
+class AsyncNodeConnection:
+    # Long-Lived Connection To One Peer For The Asyncio Node Runtime
+
+    def __init__(self, port_num):
+        self.port_num = port_num
+        # Set Once Connected, Replies Arrive Through node_receive_reply
+        self.frame_protocol = None
+        # Request ID -> Future, Waiting For Replies
+        self.pending_requests = dict()
+        self.request_ids = itertools.count(1)
+        self.last_used = time.monotonic()
+        self.closed = False
+        # Frame Bytes Written and Read On This Connection
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    @classmethod
+    async def node_open(cls, port_num, buffer_size=RECEIVE_BUFFER_SIZE):
+        connection = cls(port_num)
+        _, connection.frame_protocol = await asyncio.get_running_loop().create_connection(
+            lambda: FrameProtocol(connection.node_receive_reply, buffer_size), 'localhost', port_num)
+        return connection
+
+    def node_receive_reply(self, frame_protocol, frame):
+        if frame is None:
+            # Peer Closed Or Died: Wake Everyone Still Waiting
+            self.close()
+            return
+        self.bytes_received += frame[3]
+        reply_future = self.pending_requests.pop(frame[1], None)
+        if reply_future is not None and not reply_future.done():
+            # Hand Response To Its Caller
+            reply_future.set_result(frame[2])
+
+    async def node_request(self, message):
+        if self.closed:
+            raise ConnectionError(f'Connection To {self.port_num} Closed')
+        # Register Before Sending, The Reply May Beat Us Back
+        request_id = next(self.request_ids) & 0xFFFFFFFF
+        reply_future = asyncio.get_running_loop().create_future()
+        self.pending_requests[request_id] = reply_future
+        self.last_used = time.monotonic()
+        try:
+            # Whole Frame Buffered In One Write, Never Interleaved
+            frame = node_encode_frame(message[0], message[1], request_id)
+            self.frame_protocol.transport.write(frame)
+            self.bytes_sent += len(frame)
+            await self.frame_protocol.node_drain()
+        except OSError:
+            self.pending_requests.pop(request_id, None)
+            self.close()
+            # Nothing Reached The Peer, Safe To Retry
+            raise ConnectionError(f'Connection To {self.port_num} Lost Before Send')
+        return await reply_future
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.frame_protocol.transport.close()
+        for reply_future in self.pending_requests.values():
+            if not reply_future.done():
+                # Outstanding Requests Fail With No Response
+                reply_future.set_result(None)
+        self.pending_requests.clear()
+
+
+class AsyncConnectionPool:
+    # Persistent Asyncio Connections Keyed By Peer Port
+
+    def __init__(self, idle_timeout=POOL_IDLE_TIMEOUT, buffer_size=RECEIVE_BUFFER_SIZE):
+        self.idle_timeout = idle_timeout
+        # Starting Receive Buffer of Each Connection
+        self.buffer_size = buffer_size
+        self.connections = dict()
+        # One Connect In Flight Per Peer
+        self.connect_locks = dict()
+        # Requests Sent Through This Pool, Their Latency By Message Type
+        self.request_count = 0
+        self.sent_rpcs = RpcMetrics()
+        # Frame Bytes of Connections Already Evicted
+        self.retired_bytes_sent = 0
+        self.retired_bytes_received = 0
+
+    def node_pending_count(self, port_num):
+        # Requests To port_num Still Waiting For Replies
+        connection = self.connections.get(port_num)
+        return len(connection.pending_requests) if connection is not None else 0
+
+    async def node_get_connection(self, port_num):
+        now = time.monotonic()
+        # Evict Idle And Dead Connections
+        for peer_port, connection in list(self.connections.items()):
+            if connection.closed or (now - connection.last_used > self.idle_timeout
+                                     and not connection.pending_requests):
+                del self.connections[peer_port]
+                self.node_retire(connection)
+        connection = self.connections.get(port_num)
+        if connection is None:
+            connect_lock = self.connect_locks.setdefault(port_num, asyncio.Lock())
+            async with connect_lock:
+                connection = self.connections.get(port_num)
+                if connection is None:
+                    connection = await AsyncNodeConnection.node_open(port_num, self.buffer_size)
+                    self.connections.update({port_num: connection})
+        return connection
+
+    async def node_send_network_message(self, message, port_num):
+        # Same Contract As The Module Function, Awaited Instead Of Blocking
+        self.request_count += 1
+        start_time = time.perf_counter()
+        for attempt in range(2):
+            try:
+                connection = await self.node_get_connection(port_num)
+                response = await connection.node_request(message)
+                self.sent_rpcs.record(message[0], time.perf_counter() - start_time)
+                return response
+            except ConnectionError as error_msg:
+                # Dead Peer Connection: Reconnect Once
+                if attempt == 1:
+                    network_logger.warning('%s', error_msg)
+            except OSError as error_msg:
+                # Peer Not Accepting Connections
+                network_logger.warning('%s', error_msg)
+                break
+        self.sent_rpcs.record(message[0], time.perf_counter() - start_time, failed=True)
+        return None
+
+    def node_retire(self, connection):
+        connection.close()
+        self.retired_bytes_sent += connection.bytes_sent
+        self.retired_bytes_received += connection.bytes_received
+
+    def node_traffic(self):
+        # (Bytes Sent, Bytes Received) Over Every Connection This Pool Has Held
+        return (self.retired_bytes_sent + sum(connection.bytes_sent for connection in self.connections.values()),
+                self.retired_bytes_received + sum(connection.bytes_received
+                                                  for connection in self.connections.values()))
+
+    def close(self):
+        for connection in self.connections.values():
+            self.node_retire(connection)
+        self.connections.clear()
+
+
+class TcpListener:
+    # One Node's Asyncio Server: Frames In, Requests Handed To The Node, Replies Out Tagged With Their ID
+
+    def __init__(self, request_handler, buffer_size=RECEIVE_BUFFER_SIZE):
+        # Awaited With (Message Name, Body), Returns The Reply Body
+        self.request_handler = request_handler
+        # Starting Receive Buffer of Each Client Connection
+        self.buffer_size = buffer_size
+        self.listen_server = None
+        self.listen_address = None
+        # Frame Bytes Served
+        self.bytes_in = 0
+        self.bytes_out = 0
+        # In-Flight Request Tasks, Referenced Until Done
+        self.request_tasks = set()
+
+    async def node_open(self):
+        # Bound To Any Free Port On IPv4 localhost Only: Descriptors Carry IPv4 Addresses, and localhost May Also
+        # Resolve To ::1, Which Would Open A Second Socket On Another Port
+        self.listen_server = await asyncio.get_running_loop().create_server(
+            lambda: FrameProtocol(self.node_serve_frame, self.buffer_size), 'localhost', 0, family=AF_INET,
+            backlog=128)
+        self.listen_address = self.listen_server.sockets[0].getsockname()
+
+    def node_serve_frame(self, frame_protocol, client_con_data):
+        if client_con_data is None:
+            # Peer Closed Connection
+            return
+        self.bytes_in += client_con_data[3]
+        # Each Request Runs As Its Own Task, Many In Flight Per Connection
+        request_task = asyncio.ensure_future(self.node_serve_request(client_con_data, frame_protocol.transport))
+        self.request_tasks.add(request_task)
+        request_task.add_done_callback(self.request_tasks.discard)
+
+    async def node_serve_request(self, client_con_data, client_transport):
+        response_message = await self.request_handler(client_con_data[0], client_con_data[2])
+        if not client_transport.is_closing():
+            # Send Framed Response Back, Tagged With The Request ID
+            reply_frame = node_encode_frame('Reply', response_message, client_con_data[1])
+            client_transport.write(reply_frame)
+            self.bytes_out += len(reply_frame)
+
+    async def node_serve_forever(self):
+        async with self.listen_server:
+            await self.listen_server.serve_forever()
+
+    def close(self):
+        self.listen_server.close()
+
+
+class TcpTransport:
+    # Real Sockets: A Listener Per Node, Requests Out Over One Connection Pool Per Process
+
+    def __init__(self, idle_timeout=POOL_IDLE_TIMEOUT, buffer_size=RECEIVE_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self.connection_pool = AsyncConnectionPool(idle_timeout, buffer_size)
+
+    async def node_listen(self, request_handler):
+        tcp_listener = TcpListener(request_handler, self.buffer_size)
+        await tcp_listener.node_open()
+        return tcp_listener
+
+
+class LookupResult:
+    # Identifier Looked Up
+    identifier = None
+    # Node Whose Successor Arc Holds The Identifier
+    predecessor = None
+    # Node Owning The Identifier, None If The Lookup Failed
+    owner = None
+    # Successors of The Owner Holding Copies of Its Records
+    replicas = ()
+    # Seconds For The Whole Lookup
+    elapsed = 0.0
+
+    def __init__(self, identifier):
+        self.identifier = identifier
+        # Seconds Spent On Each Hop, Iterative Lookups Only
+        self.hop_times = []
+        # Hops Taken By Forwarding, Reported Back By Recursive Lookups
+        self.forwarded_hops = 0
+
+    def hop_count(self):
+        # Requests Between Nodes: Those The Querying Side Made, Plus Those Forwarded For It
+        return len(self.hop_times) + self.forwarded_hops
+
+
+class LocationCache:
+    # Bounded LRU of Owner Arcs (predecessor, owner], Found By Bisect Over Owner Identifiers
+
+    def __init__(self, capacity=LOCATION_CACHE_SIZE):
+        self.capacity = capacity
+        # Owner Identifier -> (Predecessor Node, Owner Node, Replica Nodes), Least Recently Used First
+        self.cached_arcs = OrderedDict()
+        # Same Owner Identifiers, Sorted
+        self.owner_identifiers = []
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def node_find(self, identifier):
+        # (Predecessor, Owner, Replicas) Whose Arc Holds identifier, or None
+        if self.owner_identifiers:
+            position = bisect_left(self.owner_identifiers, identifier) % len(self.owner_identifiers)
+            owner_identifier = self.owner_identifiers[position]
+            cached_arc = self.cached_arcs[owner_identifier]
+            if Identifier(identifier).in_arc(cached_arc[0].identifier, owner_identifier, '(]'):
+                self.cached_arcs.move_to_end(owner_identifier)
+                self.hits += 1
+                return cached_arc
+        self.misses += 1
+        return None
+
+    def node_replicas(self, owner_identifier):
+        # Replicas Cached For An Owner, Not Counted As A Lookup
+        cached_arc = self.cached_arcs.get(owner_identifier)
+        return cached_arc[2] if cached_arc is not None else ()
+
+    def node_remove(self, owner_identifier):
+        del self.cached_arcs[owner_identifier]
+        self.owner_identifiers.pop(bisect_left(self.owner_identifiers, owner_identifier))
+
+    def node_store(self, predecessor_node, owner_node, replica_nodes=()):
+        if self.capacity <= 0 or predecessor_node is None or owner_node is None:
+            return
+        owner_identifier = owner_node.identifier
+        # Cached Owners Inside The New Arc (predecessor, owner) Have Left The Ring, Cut Out By Bisect
+        arc_start = bisect_right(self.owner_identifiers, predecessor_node.identifier)
+        arc_end = bisect_left(self.owner_identifiers, owner_identifier)
+        if predecessor_node.identifier < owner_identifier:
+            inside_slices = [(arc_start, arc_end)]
+        else:
+            # Arc Wraps Past Zero: Its Tail End First, So The Head's Positions Still Hold
+            inside_slices = [(arc_start, len(self.owner_identifiers)), (0, arc_end)]
+        for slice_start, slice_end in inside_slices:
+            for cached_identifier in self.owner_identifiers[slice_start:slice_end]:
+                del self.cached_arcs[cached_identifier]
+            del self.owner_identifiers[slice_start:slice_end]
+        if owner_identifier in self.cached_arcs:
+            self.node_remove(owner_identifier)
+        elif len(self.cached_arcs) >= self.capacity:
+            # Evict Least Recently Used Arc
+            self.node_remove(next(iter(self.cached_arcs)))
+        self.cached_arcs[owner_identifier] = (predecessor_node, owner_node, tuple(replica_nodes))
+        insort(self.owner_identifiers, owner_identifier)
+
+    def node_invalidate(self, identifier):
+        # Drop The Arc Holding identifier: Its Owner Refused It, or A Node Joined or Left There
+        if self.owner_identifiers:
+            position = bisect_left(self.owner_identifiers, identifier) % len(self.owner_identifiers)
+            owner_identifier = self.owner_identifiers[position]
+            predecessor_node = self.cached_arcs[owner_identifier][0]
+            if Identifier(identifier).in_arc(predecessor_node.identifier, owner_identifier, '(]'):
+                self.node_remove(owner_identifier)
+                self.invalidations += 1
+
+    def node_stats(self):
+        return {'size': len(self.cached_arcs), 'hits': self.hits, 'misses': self.misses,
+                'invalidations': self.invalidations}
+
+
+async def node_cached_lookup(location_cache, lookup_function, identifier, replica_function=None):
+    # Cached Arc Answers With No Hops, Otherwise Look Up and Remember The Arc
+    cached_arc = location_cache.node_find(identifier)
+    if cached_arc is not None:
+        lookup_result = LookupResult(identifier)
+        lookup_result.predecessor, lookup_result.owner, lookup_result.replicas = cached_arc
+        lookup_result.elapsed = 0.0
+        return lookup_result
+    lookup_result = await lookup_function(identifier)
+    if replica_function is not None and lookup_result.owner is not None and location_cache.capacity > 0:
+        # Replica Set Costs One Request, Paid Once Per Cached Arc
+        lookup_result.replicas = await replica_function(lookup_result.owner) or ()
+    location_cache.node_store(lookup_result.predecessor, lookup_result.owner, lookup_result.replicas)
+    return lookup_result
+
+
+def node_pick_replica(connection_pool, owner_node, replica_nodes, random_gen=random):
+    # Owner or Replica With The Fewest Requests In Flight From Us, Ties Broken At Random
+    candidate_nodes = [owner_node, *replica_nodes]
+    return min(candidate_nodes, key=lambda chord_node: (
+        connection_pool.node_pending_count(chord_node.listen_address[1]), random_gen.random()))
+
+
+async def node_iterative_find_successor(connection_pool, identifier, start_port, max_hops=SHA1_M_BIT_LENGTH):
+    # Ask Each Node For Its Best Next Hop, Then Contact That Node Directly
+    lookup_result = LookupResult(identifier)
+    lookup_start = time.perf_counter()
+    port_num = start_port
+    for _ in range(max_hops):
+        hop_start = time.perf_counter()
+        next_hop = await connection_pool.node_send_network_message(('NextHop', (identifier, -1)), port_num)
+        lookup_result.hop_times.append(time.perf_counter() - hop_start)
+        if next_hop is None:
+            # Node Unreachable, Lookup Failed
+            break
+        is_final, chord_node = next_hop
+        if is_final:
+            # Identifier Falls Between This Node and Its Successor
+            lookup_result.predecessor = chord_node
+            lookup_result.owner = chord_node.successor
+            break
+        port_num = chord_node.listen_address[1]
+    lookup_result.elapsed = time.perf_counter() - lookup_start
+    return lookup_result
+
+
+async def node_group_by_owner(lookup_function, keyed_items):
+    # Split (Identifier, Item) Pairs, Sorted By Identifier, Into (Owner, Items) Groups.
+    # One Lookup Per Owner: Its Arc (predecessor, owner] Is Cut Out By Bisect
+    identifiers = [identifier for identifier, _ in keyed_items]
+    low_index, high_index = 0, len(keyed_items)
+    while low_index < high_index:
+        lookup_result = await lookup_function(identifiers[low_index])
+        if lookup_result.owner is None:
+            # Ring Unreachable, Remaining Items Have No Owner
+            yield None, [item for _, item in keyed_items[low_index:high_index]]
+            return
+        lower_point = lookup_result.predecessor.identifier
+        highest_point = lookup_result.owner.identifier
+        arc_end = bisect_right(identifiers, highest_point, low_index, high_index)
+        group_items = [item for _, item in keyed_items[low_index:arc_end]]
+        if lower_point >= highest_point:
+            # Arc Wraps Past Zero, It Also Holds The Largest Identifiers
+            tail_start = max(bisect_right(identifiers, lower_point, low_index, high_index), arc_end)
+            group_items += [item for _, item in keyed_items[tail_start:high_index]]
+            high_index = tail_start
+        low_index = arc_end
+        yield lookup_result.owner, group_items
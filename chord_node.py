@@ -6,607 +6,1160 @@
 Lab4 Chord
 """
 
+import os
 import sys
-import pickle
-import hashlib
-from socket import *
-
-SHA1_M_BIT_LENGTH = 160
-
-
-def get_decimal_form(identifier):
-    # Convert Hex-Identifier To Digit
-    return int(identifier, 16)
-
-
-def is_unique(identifier_1, identifier_2):
-    if get_decimal_form(identifier_1) == get_decimal_form(identifier_2):
-        # Not Unique
-        return False
-    # Unique
-    return True
-
-
-def get_immediate_indexes(identifier, i_i, summation=True):
-    # Convert Hex-Identifier to Digit
-    deci_num = get_decimal_form(identifier)
-    # Add By Default, To Get Next Successor Halfway
-    operation_results = (deci_num + pow(2, (i_i - 1))) % pow(2, SHA1_M_BIT_LENGTH)
-    if not summation:
-        # Subtract, To Get Predecessor
-        operation_results = (deci_num - pow(2, (i_i - 1))) % pow(2, SHA1_M_BIT_LENGTH)
-    # Return Result in Hex-decimal form
-    return hex(operation_results)
-
-
-def interval_condition(l_id, x_id, r_id, notation_str):
-    # Parameters Are In Hex-Decimal, To Get Insane Large Integer
-    l_digit = get_decimal_form(l_id)
-    x_digit = get_decimal_form(x_id)
-    r_digit = get_decimal_form(r_id)
-    # Return Boolean Condition
-    if notation_str == '()':
-        return l_digit < x_digit < r_digit
-    if notation_str == '[)':
-        return l_digit <= x_digit < r_digit
-    if notation_str == '(]':
-        return l_digit < x_digit <= r_digit
-    if notation_str == '[]':
-        return l_digit <= x_digit <= r_digit
-
-
-def node_get_response_sync(socket_t, set_timer=False):
-    try:
-        server_host_response = b''
-        counter = 0
-        while True:
-            if set_timer:
-                # Set a 5 seconds timeout
-                socket_t.settimeout(1)
-            # Save to response message to 4096 bytes buffer
-            counter += 4096
-            try:
-                pkt_data = socket_t.recv(4096)
-            except TimeoutError:
-                break
-            else:
-                if pkt_data == b'':
-                    break
-                else:
-                    server_host_response += pkt_data
-
-    except Exception as error:
-        return None
-    else:
-        # No Errors Raised
-        if server_host_response == b'':
-            return None
-        # return deserialized response
-        return pickle.loads(server_host_response)
-
-
-def node_send_network_message(message, port_num, set_timer=False):
-    # Act as a Client, asking An Existing Node To Find Successor
-    client_socket = socket(AF_INET, SOCK_STREAM)
-    # set socket timeout to 1.5 seconds
-    # client_socket.settimeout(2)
-    host_response = None
-    try:
-        # Connect To Existing-Node-Host
-        client_socket.connect(('localhost', port_num))
-    except Exception as error_msg:
-        # Print Exception message
-        print(error_msg)
-    else:
-        # Send Node's Identifier To Existing-Node-Host
-        client_socket.send(pickle.dumps(message))
-        # Get Response from Existing-Node-Host
-        host_response = node_get_response_sync(client_socket, set_timer)
-
-    # Close Client Connection Socket
-    client_socket.close()
-    # Return Result
-    return host_response
-
-
-class ChordNode:
-    # Unique Identifier in Hex-Decimal
-    identifier = None
-    # Immediate Successor Node
-    successor = None
-    # Immediate Predecessor Node
-    predecessor = None
-    # Node Address (name, port)
-    listen_address = ()
+import time
+import signal
+import asyncio
+import logging
+import argparse
+from bisect import bisect_left
+from chord_identifier import SHA1_M_BIT_LENGTH, RING_SIZE, FINGER_OFFSETS, Identifier
+from chord_finger_table import FingerTable
+from chord_codec import ChordNode
+from chord_store import STORE_MAINTENANCE_INTERVAL, DiskStore
+from chord_hotkeys import HOT_KEY_THRESHOLD, RECORD_CACHE_SIZE, RECORD_CACHE_TTL, HotKeySketch, RecordCache
+from chord_metrics import LatencyHistogram, RpcMetrics
+from chord_network import POPULATE_BATCH_SIZE, LOCATION_CACHE_SIZE, NOT_OWNER, TcpTransport, LookupResult, \
+    LocationCache, node_iterative_find_successor, node_group_by_owner, node_pick_replica
+
+# Status At INFO, Per-Request Detail At DEBUG. Arguments Are Only Formatted When The Level Is On
+node_logger = logging.getLogger('chord_node')
+
+# Seconds Between Stabilize Rounds, and Between Fix-Fingers Rounds. Zero Turns A Task Off
+STABILIZE_INTERVAL = 1.0
+FIX_FINGERS_INTERVAL = 0.5
+# Finger Indexes Refreshed Per Fix-Fingers Round
+FIX_FINGERS_PER_ROUND = 16
+# Successors Kept, So A Dead Successor Can Be Skipped
+SUCCESSOR_LIST_LENGTH = 4
+# Ring Identifiers Hosted Per Process, Each Owning Its Own Arc
+VIRTUAL_NODE_COUNT = 1
+# Copies of Every Record: The Owner's, Plus One On Each of Its Next Successors. Same On Every Node
+REPLICATION_FACTOR = 1
+# Records Per Chunk A Joining Node Pulls From Its Successor, or A Leaving Node Pushes To It
+HANDOFF_CHUNK_SIZE = 1000
+# Seconds A Leaving Process Keeps Running, So Its Last Replies Go Out
+LEAVE_LINGER_SECONDS = 0.2
 
 
 class ChordProtocol:
     # Single Node Instance Running
     SingleNode = ChordNode()
 
-    # Node's finger table
-    finger_table = dict()
-    # Node's Listening Socket
-    listen_socket = socket()
+    # Node's finger table, Built Once The Identifier Is Known
+    finger_table = None
+    # How Messages Reach Other Nodes, and This Node's Listener On It
+    transport = None
+    listener = None
     # Known Existing Port Value
     existing_port = 0
-
+    # How This Node Resolves Its Own Lookups: 'recursive' or 'iterative'
+    lookup_mode = 'recursive'
+    # Persistent Connections To Peers, Keyed By Port, Owned By The Transport
+    connection_pool = None
+    # Owner Arcs Resolved Before, So Repeat Keys Go Straight To Their Owner
+    location_cache = LocationCache()
+    # Request Counts of Keys We Forward, and Copies of The Hot Ones
+    hot_key_sketch = None
+    record_cache = None
+    # Requests Served By Message Type, and Our Own Lookups
+    start_time = 0.0
+    handled_rpcs = None
+    lookup_hops = None
+    lookup_latency = None
+    # Record Store Maintenance Task, Disk Backend Only
+    store_task = None
+    # Stabilize and Fix-Fingers Tasks, Their Intervals, and The Successor List
+    maintenance_tasks = []
+    stabilize_interval = STABILIZE_INTERVAL
+    fix_fingers_interval = FIX_FINGERS_INTERVAL
+    successor_list_length = SUCCESSOR_LIST_LENGTH
+    successor_list = []
+    # Next Finger Index Fix-Fingers Refreshes
+    next_finger_index = 2
+    # Routing Health Counters
+    stabilize_rounds = 0
+    successor_failures = 0
+    stale_fingers_fixed = 0
+    dead_fingers_dropped = 0
+
+    # Node's Records: dict In Memory, or DiskStore When A Data File Is Given
     nfl_dictionary_table = dict()
-
-    EXCLUSIVE_PORT = -1
-
-    def __init__(self, known_port):
+    # Records Sent To Us, and Records Kept Because We Own Them
+    records_received = 0
+    records_stored = 0
+    # Copies Held For Predecessors, and Reads Answered From Our Table
+    replication_factor = REPLICATION_FACTOR
+    replicas_stored = 0
+    reads_served = 0
+    # Arc Handoff On Join: Records Taken Over From Our Successor, Records Given To New Predecessors,
+    # The Successor Still Handing Ours Over, and Arc End -> Keys Still To Hand Over
+    records_handed_in = 0
+    records_handed_off = 0
+    handoff_node = None
+    handoff_keys = None
+    # Set Once Spliced Out of The Ring, Requests Are Then Refused. The Host's Serving Task, Ended By Shutdown
+    left_ring = False
+    serve_task = None
+    # Virtual Nodes: The Host Runs The Process, Its Siblings Share Its Loop, Connections and Records
+    virtual_node_count = VIRTUAL_NODE_COUNT
+    host_protocol = None
+    virtual_nodes = []
+
+    def __init__(self, known_port, lookup_mode='recursive', store_path=None, stabilize_interval=STABILIZE_INTERVAL,
+                 fix_fingers_interval=FIX_FINGERS_INTERVAL, successor_list_length=SUCCESSOR_LIST_LENGTH,
+                 location_cache_size=LOCATION_CACHE_SIZE, virtual_node_count=VIRTUAL_NODE_COUNT, host_protocol=None,
+                 replication_factor=REPLICATION_FACTOR, record_cache_size=RECORD_CACHE_SIZE,
+                 record_cache_ttl=RECORD_CACHE_TTL, transport=None, run_forever=True):
+        # Every Virtual Node Has Its Own Ring Position
+        self.SingleNode = ChordNode()
         # Save Existing Port To Join Network
         self.existing_port = known_port
-        # Set Up Listening Server
-        self.protocol_init_listen_socket()
-
-        # Print Status
-        print(f'{self.SingleNode.listen_address}: Joining Network With\n\tDeci-ID-Form: '
-              f'{get_decimal_form(self.SingleNode.identifier)}\n\tHex-ID-Form: {self.SingleNode.identifier}')
-
-        self.protocol_join()
-        # Print Status
-        print(f'{self.SingleNode.listen_address}: ---------- Joined Network ---------')
-        # Listen For Incoming Events
-        self.protocol_main()
-
-    def protocol_init_listen_socket(self):
-        # Create TCP/IP Listening Socket
-        self.listen_socket = socket(AF_INET, SOCK_STREAM)
-        # Bind the socket to Port and Name
-        self.listen_socket.bind(('localhost', 0))
-        # Listen To Connections
-        self.listen_socket.listen(5)
+        # Save Lookup Mode
+        self.lookup_mode = lookup_mode
+        # Save Maintenance Settings
+        self.stabilize_interval = stabilize_interval
+        self.fix_fingers_interval = fix_fingers_interval
+        self.successor_list_length = successor_list_length
+        self.location_cache = LocationCache(location_cache_size)
+        self.replication_factor = replication_factor
+        self.hot_key_sketch = HotKeySketch()
+        self.record_cache = RecordCache(record_cache_size, record_cache_ttl)
+        self.start_time = time.monotonic()
+        self.handled_rpcs = RpcMetrics()
+        self.lookup_hops = dict()
+        self.lookup_latency = LatencyHistogram()
+        self.maintenance_tasks = []
+        self.virtual_nodes = []
+        self.handoff_keys = dict()
+        if host_protocol is not None:
+            # Sibling of host_protocol, Started By It On The Running Loop
+            self.host_protocol = host_protocol
+            self.transport = host_protocol.transport
+            self.connection_pool = host_protocol.connection_pool
+            self.nfl_dictionary_table = host_protocol.nfl_dictionary_table
+            return
+        # Real Sockets Unless Given Another Transport, Such As A Simulated Network
+        self.transport = transport if transport is not None else TcpTransport()
+        self.connection_pool = self.transport.connection_pool
+        self.virtual_node_count = virtual_node_count
+        if store_path is not None:
+            # Reopen Records Kept On Disk, Only The Index Is Loaded
+            self.nfl_dictionary_table = DiskStore(store_path)
+            node_logger.info('Record Store %s: %d Records', store_path, len(self.nfl_dictionary_table))
+        else:
+            # Own Table, Many Nodes May Share One Process
+            self.nfl_dictionary_table = dict()
+        if run_forever:
+            # Run The Node's Event Loop Until Shut Down
+            asyncio.run(self.protocol_main())
+
+    async def protocol_init_listen_socket(self):
+        # Start Listening On The Transport, Requests Come Back Through protocol_serve_request
+        self.listener = await self.transport.node_listen(self.protocol_serve_request)
         # Hash The Node's socket endpoints using SHA-1 function
         self.protocol_hash_endpoints()
         # Debugging Print
-        print(f"Node's Listening Server Set Up Complete")
+        node_logger.info("Node's Listening Server Set Up Complete")
 
     def protocol_hash_endpoints(self):
         # Get Address String Representation
-        end_point = "" + 'localhost' + str(self.listen_socket.getsockname()[1])
+        end_point = "" + 'localhost' + str(self.listener.listen_address[1])
         # Set the Listening Address for Node
-        self.SingleNode.listen_address = self.listen_socket.getsockname()
-        # Store Hex-Decimal Format
-        # self.SingleNode.identifier = hashlib.sha1(end_point.encode()).hexdigest()
-
-        simple_digit = get_decimal_form(hashlib.sha1(end_point.encode()).hexdigest())
-        simple_digit = simple_digit % pow(2, SHA1_M_BIT_LENGTH)
-        # Simple
-        self.SingleNode.identifier = hex(simple_digit)
-
-    def protocol_find_successor(self, identifier):
+        self.SingleNode.listen_address = self.listener.listen_address
+        # Store Integer Identifier, Hex-Decimal Only For Display
+        self.SingleNode.identifier = Identifier.from_key(end_point)
+        # Finger Starts Follow From The Identifier
+        self.finger_table = FingerTable(self.SingleNode.identifier)
+
+    async def protocol_find_successor(self, identifier):
+        if not identifier.in_arc(self.SingleNode.identifier, self.SingleNode.successor.identifier, '(]'):
+            cached_arc = self.location_cache.node_find(identifier)
+            if cached_arc is not None:
+                # Cache Hit: One Hop, The Owner's Predecessor Shows Whether Its Arc Still Holds Identifier
+                owner_node = cached_arc[1]
+                stabilize_info = await self.protocol_send_message(('StabilizeInfo', (self.SingleNode, -1)),
+                                                                  owner_node.listen_address[1])
+                if stabilize_info is not None and (stabilize_info[0] is None or identifier.in_arc(
+                        stabilize_info[0].identifier, owner_node.identifier, '(]')):
+                    # Answer With The Owner's Current Pointers
+                    owner_node.predecessor = stabilize_info[0]
+                    owner_node.successor = stabilize_info[1][0] if stabilize_info[1] else owner_node
+                    return owner_node
+                self.location_cache.node_invalidate(identifier)
         # Call Predecessor
-        node_prime = self.protocol_find_predecessor(identifier)
+        node_prime = await self.protocol_find_predecessor(identifier)
         if node_prime is None:
-            return self.protocol_find_lowest_node()
+            # Routing Failed Further Along, Best We Know Locally
+            return self.SingleNode.successor
+        self.location_cache.node_store(node_prime, node_prime.successor)
         # Return Successor
         return node_prime.successor
 
-    def protocol_find_lowest_node(self):
-        unique_predecessor = is_unique(self.SingleNode.predecessor.identifier, self.SingleNode.identifier)
-
-        if unique_predecessor and self.EXCLUSIVE_PORT != self.SingleNode.predecessor.listen_address[1]:
-            print('Finding Lowest Node')
-            lowest_message = ('FindLowestNode', (self.SingleNode.identifier, self.EXCLUSIVE_PORT))
-            # Find Lowest Node
-            node_prime = node_send_network_message(lowest_message, self.SingleNode.predecessor.listen_address[1])
-            if node_prime is not None:
-                print("None Found")
-                return node_prime
-        # We are The Lowest Node
-        return self.SingleNode
-
-    def protocol_find_predecessor(self, identifier):
-
-        unique_predecessor = is_unique(self.SingleNode.predecessor.identifier, self.SingleNode.identifier)
-        unique_successor = is_unique(self.SingleNode.successor.identifier, self.SingleNode.identifier)
+    async def protocol_find_predecessor(self, identifier):
+        predecessor_node, _ = await self.protocol_route_predecessor(identifier)
+        return predecessor_node
 
-        # Check Interval Condition of Identifier
-        # x < identifier <= z . O(1) Complex, in all cases
-        if interval_condition(self.SingleNode.identifier, identifier, self.SingleNode.successor.identifier, '[]'):
-            # Return Single Node Instance
-            return self.SingleNode
-
-        # identifier < x <= z . O(n) Complex, in worst case
-        if interval_condition(identifier, self.SingleNode.identifier, self.SingleNode.successor.identifier, '(]'):
-            # Get Predecessor Node
-            node_prime = self.SingleNode.predecessor
-            if unique_predecessor and self.EXCLUSIVE_PORT != node_prime.listen_address[1]:
-                print(f'Asking Predecessor: {node_prime.identifier}')
-                predecessor_message = ('FindPredecessor', (identifier, self.EXCLUSIVE_PORT))
-                # Ask Predecessor Pointer (for Predecessor To Identifier)
-                node_prime = node_send_network_message(predecessor_message, node_prime.listen_address[1])
-
-            if node_prime is not None and get_decimal_form(identifier) >= get_decimal_form(node_prime.identifier):
-                # Return Result
-                return node_prime
-
-            if get_decimal_form(identifier) >= get_decimal_form(self.SingleNode.predecessor.identifier):
-                return self.SingleNode.predecessor
-
-        # x <= z <= identifier. O(n) Complex, in worst case
-        if interval_condition(self.SingleNode.identifier, self.SingleNode.successor.identifier, identifier, '[]'):
-            # Get Successor Node
-            node_prime = self.SingleNode.successor
-
-            if unique_successor and self.EXCLUSIVE_PORT != node_prime.listen_address[1]:
-                print(f'Asking Successor: {node_prime.identifier}')
-                # Formulate Message
-                predecessor_message = ('FindPredecessor', (identifier, self.EXCLUSIVE_PORT))
-                # Contact And Send Message To Successor Pointer
-                node_prime = node_send_network_message(predecessor_message, node_prime.listen_address[1])
-
-            if node_prime is not None and get_decimal_form(identifier) >= get_decimal_form(node_prime.identifier):
-                # Return Result
-                return node_prime
-
-            if get_decimal_form(identifier) >= get_decimal_form(self.SingleNode.successor.identifier):
-                return self.SingleNode.successor
-
-        # Get The Closest Proceeding Node. O(log-n) Complex, in worst case
-        closest_proceed_node = self.protocol_closest_proceeding_finger(identifier)
-        if closest_proceed_node is not None and is_unique(closest_proceed_node.identifier, self.SingleNode.identifier) \
-                and self.EXCLUSIVE_PORT != closest_proceed_node.listen_address[1]:
+    async def protocol_route_predecessor(self, identifier):
+        # Same Routing Step Iterative Lookups Ask For. Returns (Predecessor, Hops Forwarded Past Us)
+        while True:
+            is_final, closest_proceed_node = self.protocol_next_hop(identifier)
+            if is_final:
+                # Return Single Node Instance
+                return closest_proceed_node, 0
 
-            print(f'Asking Closest Node: {closest_proceed_node.identifier}')
+            node_logger.debug('Asking Closest Node: %s', closest_proceed_node.identifier)
             # Formulate Message
-            predecessor_message = ('FindPredecessor', (identifier, self.EXCLUSIVE_PORT))
+            predecessor_message = ('FindPredecessor', (identifier, -1))
             # Contact And Send Message To The Closest Proceeding Node
-            node_prime = node_send_network_message(predecessor_message, closest_proceed_node.listen_address[1])
+            predecessor_reply = await self.protocol_send_message(predecessor_message,
+                                                                 closest_proceed_node.listen_address[1])
+            if predecessor_reply is not None:
+                # Our Hop To The Closest Proceeding Node, Plus Those It Forwarded
+                return predecessor_reply[0], predecessor_reply[1] + 1
+            # Finger Is Dead, Route Around It With What Remains
+            self.protocol_drop_dead_node(closest_proceed_node)
+
+    def protocol_next_hop(self, identifier):
+        # Check Interval Condition of Identifier
+        # x < identifier <= successor. O(1) Complex, in all cases
+        if identifier.in_arc(self.SingleNode.identifier, self.SingleNode.successor.identifier, '(]'):
+            # Final: Identifier Is Our Successor's
+            return True, self.SingleNode
 
-            if node_prime is not None and get_decimal_form(identifier) >= get_decimal_form(node_prime.identifier):
-                # Return Result
-                return node_prime
+        # Get The Closest Proceeding Node. O(log-m) Per Hop, O(log-n) Hops
+        closest_proceed_node = self.protocol_closest_proceeding_finger(identifier)
+        if closest_proceed_node.identifier == self.SingleNode.identifier:
+            # No Finger Gets Closer, We Precede Identifier
+            return True, self.SingleNode
+        # Not Final: Ask The Closest Proceeding Node Next
+        return False, closest_proceed_node
+
+    async def protocol_lookup(self, identifier, port_num):
+        # Resolve Identifier Starting At port_num, In This Node's Lookup Mode
+        if self.lookup_mode == 'iterative':
+            # Hops Seen By Us, Walking The Ring
+            lookup_result = await node_iterative_find_successor(self.connection_pool, identifier, port_num)
+        else:
+            lookup_result = LookupResult(identifier)
+            start_time = time.perf_counter()
+            # Recursive: One Request, The Network Forwards It and Reports How Many Times
+            predecessor_reply = await self.protocol_send_message(('FindPredecessor', (identifier, -1)), port_num)
+            if predecessor_reply is not None:
+                lookup_result.predecessor, forwarded_hops = predecessor_reply
+                lookup_result.owner = lookup_result.predecessor.successor
+                lookup_result.forwarded_hops = forwarded_hops + 1
+            lookup_result.elapsed = time.perf_counter() - start_time
+        if lookup_result.owner is not None:
+            self.protocol_record_hops(lookup_result.hop_count())
+        self.lookup_latency.record(lookup_result.elapsed)
+        return lookup_result
+
+    def protocol_record_hops(self, hop_count):
+        # Lookups Resolved, By Requests Between Nodes
+        self.lookup_hops[hop_count] = self.lookup_hops.get(hop_count, 0) + 1
+
+    async def protocol_lookup_here(self, identifier):
+        # Lookup Starting At This Node: Our Own Routing Step Is Taken Locally, Only Other Nodes Cost An RPC
+        while True:
+            is_final, closest_proceed_node = self.protocol_next_hop(identifier)
+            if is_final:
+                lookup_result = LookupResult(identifier)
+                lookup_result.predecessor = self.SingleNode
+                lookup_result.owner = self.SingleNode.successor
+                # Resolved Without Contacting Another Node
+                self.protocol_record_hops(0)
+                self.lookup_latency.record(lookup_result.elapsed)
+                return lookup_result
+            lookup_result = await self.protocol_lookup(identifier, closest_proceed_node.listen_address[1])
+            if lookup_result.owner is not None or lookup_result.hop_count() > 1:
+                # Found, or Failed Past The Next Hop: Nothing Here To Route Around
+                return lookup_result
+            # Next Hop Is Dead, Route Around It With What Remains
+            self.protocol_drop_dead_node(closest_proceed_node)
 
     def protocol_closest_proceeding_finger(self, identifier):
-        # closest proceeding node
-        closest_proceed_node = self.SingleNode
-        # Iterate Through Dictionary
-        for key, value in self.finger_table.items():
-            # Validate Interval Notation
-            condition_check = interval_condition(self.SingleNode.identifier, key, identifier, '()')
-            if condition_check:
-                # Update Closest Proceeding Node
-                closest_proceed_node = value
+        # Bisect The Distinct Finger Nodes, Falling Back To Ourselves
+        closest_proceed_node = self.finger_table.closest_preceding_node(identifier)
+        if closest_proceed_node is None:
+            return self.SingleNode
         # Return Closest-Proceeding Node
         return closest_proceed_node
 
-    def protocol_join(self):
-        # Reset Exclusive Port
-        self.EXCLUSIVE_PORT = self.SingleNode.listen_address[1]
+    async def protocol_join(self):
         # Validate Port Number
         if self.existing_port == 0:
             # Print Status
-            print(f'{self.SingleNode.listen_address}: [Only] Node In Network')
-            # Only Node in Network
-            i = 1
-            while i <= SHA1_M_BIT_LENGTH:
-                # Calculate Half-Way Potential Identifier
-                halfway_identifier = get_immediate_indexes(self.SingleNode.identifier, i)
-                # Set Key-Value To SingleNode Instance
-                self.finger_table.update({halfway_identifier: self.SingleNode})
-                i += 1
+            node_logger.info('%s: [Only] Node In Network', self.SingleNode.listen_address)
+            # Only Node in Network, Every Finger Is Ourselves
+            self.finger_table.fill(self.SingleNode)
             # Set Predecessor To Ourselves
             self.SingleNode.predecessor = self.SingleNode
             # Set Successor To Ourselves
             self.SingleNode.successor = self.SingleNode
         else:
             # Print Status
-            print(f'{self.SingleNode.listen_address}: [Not] Only Node In Network')
+            node_logger.info('%s: [Not] Only Node In Network', self.SingleNode.listen_address)
             # Init Finger Table
-            self.protocol_init_finger_table()
+            await self.protocol_init_finger_table()
+            # Update Others
+            await self.protocol_update_others()
+            # Move Our Arc's Records Over From The Successor
+            await self.protocol_pull_keys()
 
-            if get_decimal_form(self.SingleNode.identifier) != get_decimal_form(self.SingleNode.predecessor.identifier):
-                # Update Others
-                self.protocol_update_others()
-        self.EXCLUSIVE_PORT = -1
-
-    def protocol_init_finger_table(self):
+    async def protocol_init_finger_table(self):
         i = 1
-        # Immediate Halfway Identifier Successor
-        halfway_identifier = get_immediate_indexes(self.SingleNode.identifier, i)
-        # Formulate Message
-        successor_msg = ("FindSuccessor", (self.SingleNode.identifier, self.EXCLUSIVE_PORT))
-        # Get Successor Node
-        successor_node = node_send_network_message(successor_msg, self.existing_port)
-
-        # Validate Successor Node is Greater
-        if get_decimal_form(successor_node.identifier) > get_decimal_form(self.SingleNode.identifier):
-            # Print Status
-            print(f'{self.SingleNode.listen_address}:'
-                  f' Init-Finger-Table, Successor Node is {successor_node.listen_address}')
-
-            # Update Predecessor Pointer
-            self.SingleNode.predecessor = successor_node.predecessor
-            # Update Successor Pointer
-            self.SingleNode.successor = successor_node
-
-            unique_cond = is_unique(successor_node.predecessor.identifier, successor_node.identifier)
-
-            # Validate The Successor Node and Its Predecessor Pointer Have Different Identifiers
-            if unique_cond is False:
-                # Modify Predecessor Pointer To Ourselves
-                self.SingleNode.predecessor = self.SingleNode
+        # Successor of Finger 1 Start Is Our Successor, Its Predecessor Answered The Lookup
+        lookup_result = await self.protocol_lookup(self.finger_table.finger_start(i), self.existing_port)
+        successor_node = lookup_result.owner
 
-            # Formulate Message
-            update_predecessor_msg = ("UpdatePredecessor", (self.SingleNode, self.EXCLUSIVE_PORT))
-            # Inform Successor of Predecessor Change
-            self.SingleNode.successor = node_send_network_message(update_predecessor_msg,
-                                                                  self.SingleNode.successor.listen_address[1])
-
-            if unique_cond:
-                # Formulate Message
-                update_successor_msg = ("UpdateSuccessor", (self.SingleNode, self.EXCLUSIVE_PORT))
-                # Inform Predecessor of Immediate Change
-                self.SingleNode.predecessor = node_send_network_message(update_successor_msg,
-                                                                        self.SingleNode.predecessor.listen_address[1])
-
-            # Update Finger-Table with Immediate Successor Node
-            self.finger_table.update({halfway_identifier: self.SingleNode.successor})
-
-            print("Setting Up Finger Table")
-            while i < SHA1_M_BIT_LENGTH:
-                # current i node
-                current_i_finger_node = self.finger_table.get(get_immediate_indexes(self.SingleNode.identifier, i))
-                # Next Identifier Key
-                next_i_finger_index = get_immediate_indexes(self.SingleNode.identifier, (i + 1))
-
-                if current_i_finger_node is not None and interval_condition(self.SingleNode.identifier,
-                                                                            next_i_finger_index,
-                                                                            current_i_finger_node.identifier, '[)'):
-                    # Update Finger Table at Next Identifier
-                    self.finger_table.update({next_i_finger_index: current_i_finger_node})
-
-                elif current_i_finger_node is not None and interval_condition(self.SingleNode.identifier,
-                                                                              current_i_finger_node.identifier,
-                                                                              next_i_finger_index, '(]'):
-                    # Ask Successor
-                    if is_unique(self.SingleNode.identifier, next_i_finger_index):
-                        # Find next-halfway-identifier successor
-                        successor_msg = ("FindSuccessor", (next_i_finger_index, self.EXCLUSIVE_PORT))
-                        # Get Successor Node
-                        successor_node = node_send_network_message(successor_msg, self.existing_port)
-                        # Update Finger Table To New Successor
-                        self.finger_table.update({next_i_finger_index: successor_node})
-                else:
+        # Print Status
+        node_logger.info('%s: Init-Finger-Table, Successor Node is %s', self.SingleNode.listen_address,
+                         successor_node.listen_address)
 
-                    # Update Finger Table To New Successor
-                    self.finger_table.update({next_i_finger_index: self.SingleNode})
+        if successor_node.listen_address[1] not in self.protocol_local_ports():
+            # We Answer For Our Arc From Here On, Its Records Still On The Successor Until Pull-Keys Is Done
+            self.handoff_node = successor_node
+        # Update Successor Pointer, Predecessor Is Successor's Old Predecessor
+        self.SingleNode.successor = successor_node
+        self.SingleNode.predecessor = lookup_result.predecessor
 
-                # Increment Index
-                i += 1
-        else:
-            # Print Status
-            print(f'{self.SingleNode.listen_address}: Init-Finger-Table,'
-                  f' Predecessor Node is {successor_node.listen_address}')
-
-            # No Successors Only Predecessors In Network
-            i = 1
-            while i <= SHA1_M_BIT_LENGTH:
-                # Calculate Half-Way Potential Identifier
-                halfway_identifier = get_immediate_indexes(self.SingleNode.identifier, i)
-                # Set Key-Value To SingleNode Instance
-                self.finger_table.update({halfway_identifier: self.SingleNode})
-                # Increment
-                i += 1
-
-            # Update Predecessor Pointer
-            self.SingleNode.predecessor = successor_node
-
-            # Inform Predecessor Node, To UpdateSuccessor
-            upt_successor_msg = ("UpdateSuccessor", (self.SingleNode, self.EXCLUSIVE_PORT))
-            # Get Successor Node
-            self.SingleNode.predecessor = node_send_network_message(upt_successor_msg, successor_node.listen_address[1])
-
-            # Update Successor Pointer
-            self.SingleNode.successor = self.SingleNode
+        # Successor's Fingers, One Request, As Hints For Ours
+        hint_nodes = await self.protocol_send_message(('CopyFingers', (self.SingleNode, -1)),
+                                                      successor_node.listen_address[1])
 
-    def protocol_update_others(self):
+        # Formulate Message
+        update_predecessor_msg = ("UpdatePredecessor", (self.SingleNode, -1))
+        # Inform Successor of Predecessor Change
+        self.SingleNode.successor = await self.protocol_send_message(update_predecessor_msg,
+                                                                     self.SingleNode.successor.listen_address[1])
+        # Formulate Message
+        update_successor_msg = ("UpdateSuccessor", (self.SingleNode, -1))
+        # Inform Predecessor of Immediate Change
+        self.SingleNode.predecessor = await self.protocol_send_message(update_successor_msg,
+                                                                       self.SingleNode.predecessor.listen_address[1])
+
+        # Update Finger-Table with Immediate Successor Node
+        self.finger_table.set_finger(i, self.SingleNode.successor)
+
+        node_logger.debug('Setting Up Finger Table')
+        await self.protocol_fill_fingers((hint_nodes or []) + [self.SingleNode.successor, self.SingleNode.predecessor])
+
+    def protocol_clockwise_distance(self, identifier):
+        # Distance From Us, Ourselves Counted As A Full Circle
+        return (identifier - self.SingleNode.identifier) % RING_SIZE or RING_SIZE
+
+    async def protocol_fill_fingers(self, hint_nodes):
+        # Known Nodes By Identifier, Ourselves Included So Starts Past The Last Hint Come Back To Us
+        known_nodes = {chord_node.identifier: chord_node for chord_node in hint_nodes if chord_node is not None}
+        known_nodes[self.SingleNode.identifier] = self.SingleNode
+        unresolved_indexes = list(range(2, SHA1_M_BIT_LENGTH + 1))
+        corrected_count = 0
+        while unresolved_indexes:
+            known_order = sorted(known_nodes.values(),
+                                 key=lambda chord_node: self.protocol_clockwise_distance(chord_node.identifier))
+            known_distances = [self.protocol_clockwise_distance(node.identifier) for node in known_order]
+            # Collapse: Starts With The Same Hinted Node Share One Verification
+            hint_groups = dict()
+            for i in unresolved_indexes:
+                finger_start = self.finger_table.finger_start(i)
+                if finger_start.in_arc(self.SingleNode.identifier, self.SingleNode.successor.identifier, '(]'):
+                    # Nothing Sits Between Us and Our Successor
+                    self.finger_table.set_finger(i, self.SingleNode.successor)
+                    continue
+                hint_position = bisect_left(known_distances, self.protocol_clockwise_distance(finger_start))
+                hint_groups.setdefault(hint_position, []).append(i)
+
+            # Verify Each Group's First Start, Asking The Known Node Just Before It. All In Flight Together
+            group_items = list(hint_groups.items())
+            lookup_results = await asyncio.gather(*(
+                self.protocol_lookup(self.finger_table.finger_start(finger_indexes[0]),
+                                     known_order[hint_position - 1].listen_address[1])
+                for hint_position, finger_indexes in group_items))
+
+            unresolved_indexes = []
+            for (hint_position, finger_indexes), lookup_result in zip(group_items, lookup_results):
+                hinted_node = known_order[hint_position]
+                owner_node = lookup_result.owner
+                if owner_node is None:
+                    # Verification Failed, Keep The Hint, Fix-Fingers Repairs It Later
+                    owner_node = hinted_node
+                elif self.SingleNode.identifier.in_arc(self.finger_table.finger_start(finger_indexes[0]),
+                                                       owner_node.identifier, '[)'):
+                    # We Sit Between The Start and The Node Found, So We Are Its Successor
+                    owner_node = self.SingleNode
+                if owner_node.identifier != hinted_node.identifier:
+                    # Hint Was Stale Or Missed A Node, Learn The Node Found
+                    corrected_count += 1
+                    known_nodes[owner_node.identifier] = owner_node
+                owner_distance = self.protocol_clockwise_distance(owner_node.identifier)
+                for i in finger_indexes:
+                    if self.protocol_clockwise_distance(self.finger_table.finger_start(i)) <= owner_distance:
+                        self.finger_table.set_finger(i, owner_node)
+                    else:
+                        # Start Lies Past The Node Found, Resolve Next Round
+                        unresolved_indexes.append(i)
+        node_logger.debug('%s: Finger Hints Corrected: %d', self.SingleNode.listen_address, corrected_count)
+
+    def protocol_finger_hints(self):
+        # Our Distinct Fingers and Successor List, For A Joining Predecessor To Start From
+        self.finger_table.distinct_finger_count()
+        return list(self.finger_table.distinct_nodes) + list(self.successor_list)
+
+    async def protocol_update_others(self):
         # Update All Nodes Whose Finger Table Should refer To current Node
         # Print Status
-        print(f'{self.SingleNode.listen_address}: Update-Others, Whose Finger Table Should Refer To N')
-        i = 1
-        while i < SHA1_M_BIT_LENGTH:
-            # Previous Halfway Identifier
-            pr_half_way_identifier = get_immediate_indexes(self.SingleNode.identifier, i, False)
-
-            if pr_half_way_identifier in self.finger_table:
-                print("Skip Tim")
+        node_logger.debug('%s: Update-Others, Whose Finger Table Should Refer To N', self.SingleNode.listen_address)
+        update_targets = await self.protocol_finger_holders(self.existing_port)
 
-            # Formulate Message And Get Predecessor Over Network
-            predecessor_message = ('FindPredecessor', (pr_half_way_identifier, self.EXCLUSIVE_PORT))
+        # One Batched Notification Per Node, All Sent Together
+        await asyncio.gather(*(
+            self.protocol_send_message(("UpdateFingers", (self.SingleNode, finger_indexes, -1)),
+                                       target_node.listen_address[1])
+            for target_node, finger_indexes in update_targets.values()))
 
-            # Contact And Send Message To The Closest Proceeding Node
-            predecessor_node = node_send_network_message(predecessor_message, self.existing_port)
-
-            # Do Not Send Message To Ourselves
-            if predecessor_node is not None and is_unique(predecessor_node.identifier, self.SingleNode.identifier):
-                # Print Status
-                print(f'{self.SingleNode.listen_address}: Informing {predecessor_node.listen_address} '
-                      f'To Update Finger Table')
-                # Formulate Message
-                update_finger_msg = ("UpdateFinger", (self.SingleNode, i, self.EXCLUSIVE_PORT))
-                # Inform Predecessor To Update Finger Table
-                node_send_network_message(update_finger_msg, predecessor_node.listen_address[1])
-
-            # Increment I-Index
-            i += 1
-
-    def protocol_update_finger_table(self, s, i):
-        # Half Way Identifier
-        half_way_identifier = get_immediate_indexes(self.SingleNode.identifier, i)
-        # Get Finger Node at Identifier
-        # i_finger_node = self.finger_table.get(half_way_identifier)
-
-        # Validate Node-S
-        if get_decimal_form(s.identifier) == get_decimal_form(half_way_identifier):
-            # Print Status
-            print(f'{self.SingleNode.listen_address}: Updating Finger Table at {i} th')
-            # Great, Node-S, is in-between the conditions: Modify finger Node
-            self.finger_table.update({half_way_identifier: s})
+    async def protocol_finger_holders(self, start_port):
+        # Nodes Whose Fingers Should Refer To Us -> Those Finger Indexes, Our Predecessor Always Included
+        predecessor_node = self.SingleNode.predecessor
+        # Targets n - 2^(i-1) + 1 Inside (predecessor, n] All Resolve To Our Predecessor
+        predecessor_gap = (self.SingleNode.identifier - predecessor_node.identifier) % RING_SIZE
+        near_indexes = [i for i in range(1, SHA1_M_BIT_LENGTH + 1) if FINGER_OFFSETS[i - 1] <= predecessor_gap]
+        far_indexes = [i for i in range(1, SHA1_M_BIT_LENGTH + 1) if FINGER_OFFSETS[i - 1] > predecessor_gap]
+        # Remaining Targets Looked Up Concurrently
+        lookup_results = await asyncio.gather(*(
+            self.protocol_lookup(Identifier(self.SingleNode.identifier.finger_start(i, False) + 1), start_port)
+            for i in far_indexes))
+
+        # Node To Update -> Finger Indexes, Only Where Its Finger Start Now Falls In (predecessor, n]
+        update_targets = {predecessor_node.identifier: (predecessor_node, near_indexes)}
+        for i, lookup_result in zip(far_indexes, lookup_results):
+            target_node = lookup_result.predecessor
+            if target_node is None or target_node.identifier == self.SingleNode.identifier:
+                continue
+            if target_node.identifier.finger_start(i).in_arc(predecessor_node.identifier,
+                                                             self.SingleNode.identifier, '(]'):
+                update_targets.setdefault(target_node.identifier, (target_node, []))[1].append(i)
+        return {identifier: update_target for identifier, update_target in update_targets.items()
+                if update_target[1] and identifier != self.SingleNode.identifier}
+
+    def protocol_drop_dead_node(self, dead_node):
+        if dead_node.identifier == self.SingleNode.identifier:
+            return
+        # Skip Dead Successor, Next Live Entry of The Successor List Takes Over
+        self.successor_list = [successor_node for successor_node in self.successor_list
+                               if successor_node.identifier != dead_node.identifier]
+        if self.SingleNode.successor.identifier == dead_node.identifier:
+            self.successor_failures += 1
+            self.SingleNode.successor = self.successor_list[0] if self.successor_list else self.SingleNode
+            self.finger_table.set_finger(1, self.SingleNode.successor)
+            node_logger.warning('%s: Successor %s Unreachable, Now %s', self.SingleNode.listen_address,
+                                dead_node.listen_address, self.SingleNode.successor.listen_address)
+        if self.SingleNode.predecessor is not None and self.SingleNode.predecessor.identifier == dead_node.identifier:
+            self.SingleNode.predecessor = None
+        self.location_cache.node_invalidate(dead_node.identifier)
+        # Fingers On The Dead Node Fall Back To Our Successor Until Fix-Fingers Finds Better
+        self.dead_fingers_dropped += self.finger_table.replace_node(dead_node.identifier, self.SingleNode.successor)
+
+    async def protocol_node_left(self, leaving_node, successor_node):
+        # Graceful Leave: Its Successor Takes Its Place Wherever We Point At It
+        if leaving_node.identifier == self.SingleNode.identifier:
+            return 0
+        if successor_node.identifier == self.SingleNode.identifier:
+            successor_node = self.SingleNode
+        spliced_list = []
+        for chord_node in self.successor_list:
+            chord_node = successor_node if chord_node.identifier == leaving_node.identifier else chord_node
+            if all(chord_node.identifier != listed_node.identifier for listed_node in spliced_list):
+                spliced_list.append(chord_node)
+        self.successor_list = spliced_list
+        if self.SingleNode.successor.identifier == leaving_node.identifier:
+            self.SingleNode.successor = successor_node
+            node_logger.info('%s: Successor %s Left, Now %s', self.SingleNode.listen_address,
+                             leaving_node.listen_address, successor_node.listen_address)
+        self.location_cache.node_invalidate(leaving_node.identifier)
+        replaced_count = self.finger_table.replace_node(leaving_node.identifier, successor_node)
+        predecessor_node = self.SingleNode.predecessor
+        if replaced_count and predecessor_node is not None and predecessor_node.identifier not in (
+                self.SingleNode.identifier, leaving_node.identifier):
+            # Same Entries May Point At It On Our Predecessor Too
+            await self.protocol_send_message(('NodeLeft', (leaving_node, successor_node, -1)),
+                                             predecessor_node.listen_address[1])
+        return replaced_count
+
+    def protocol_owns(self, identifier):
+        # Keys In (predecessor, us] Are Ours, All of Them While Predecessor Is Unknown
+        if self.SingleNode.predecessor is None:
+            return True
+        return identifier.in_arc(self.SingleNode.predecessor.identifier, self.SingleNode.identifier, '(]')
+
+    async def protocol_stabilize(self):
+        # Ask Successor For Its Predecessor and Successor List, Skipping Dead Successors
+        for _ in range(self.successor_list_length + 1):
+            successor_node = self.SingleNode.successor
+            if successor_node.identifier == self.SingleNode.identifier:
+                stabilize_info = (self.SingleNode.predecessor, self.successor_list)
+            else:
+                stabilize_info = await self.protocol_send_message(('StabilizeInfo', (self.SingleNode, -1)),
+                                                                  successor_node.listen_address[1])
+            if stabilize_info is not None:
+                break
+            self.protocol_drop_dead_node(successor_node)
+        else:
+            return
+        self.stabilize_rounds += 1
+        x_node, successor_successors = stabilize_info
+        if x_node is not None and x_node.identifier.in_arc(self.SingleNode.identifier,
+                                                            successor_node.identifier, '()'):
+            # A Node Joined Between Us and Our Successor
+            node_logger.info('%s: Stabilize, Successor Now %s', self.SingleNode.listen_address, x_node.listen_address)
+            self.SingleNode.successor = x_node
+            self.finger_table.set_finger(1, x_node)
+            self.location_cache.node_invalidate(x_node.identifier)
+            successor_successors = [successor_node] + list(successor_successors)
+        # Our Successor, Then Its Successors, Never Ourselves
+        self.successor_list = [self.SingleNode.successor] + [
+            chord_node for chord_node in successor_successors
+            if chord_node.identifier != self.SingleNode.identifier][:self.successor_list_length - 1]
+        if self.SingleNode.successor.identifier != self.SingleNode.identifier:
+            # Tell Successor We Might Be Its Predecessor
+            await self.protocol_send_message(('Notify', (self.SingleNode, -1)),
+                                             self.SingleNode.successor.listen_address[1])
+        await self.protocol_check_predecessor()
+
+    async def protocol_check_predecessor(self):
+        predecessor_node = self.SingleNode.predecessor
+        if predecessor_node is None or predecessor_node.identifier == self.SingleNode.identifier:
+            return
+        # Dead Predecessor Is Forgotten, The Next Notify Replaces It
+        if await self.protocol_send_message(('StabilizeInfo', (self.SingleNode, -1)),
+                                            predecessor_node.listen_address[1]) is None:
+            node_logger.warning('%s: Predecessor %s Unreachable', self.SingleNode.listen_address,
+                                predecessor_node.listen_address)
+            self.protocol_drop_dead_node(predecessor_node)
+
+    async def protocol_notify(self, possible_predecessor):
+        predecessor_node = self.SingleNode.predecessor
+        if predecessor_node is not None and predecessor_node.identifier == possible_predecessor.identifier:
+            return self.SingleNode
+        if predecessor_node is None or predecessor_node.identifier == self.SingleNode.identifier or \
+                possible_predecessor.identifier.in_arc(predecessor_node.identifier, self.SingleNode.identifier, '()'):
+            self.protocol_new_predecessor(possible_predecessor)
+        elif await self.protocol_send_message(('StabilizeInfo', (self.SingleNode, -1)),
+                                              predecessor_node.listen_address[1]) is None:
+            # Current Predecessor Is Gone, Do Not Wait For check_predecessor
+            self.protocol_new_predecessor(possible_predecessor)
+        return self.SingleNode
 
+    async def protocol_fix_fingers(self):
+        # Refresh The Next Run of Finger Indexes, One Lookup Per Distinct Finger Node
+        found_node = None
+        for _ in range(FIX_FINGERS_PER_ROUND):
+            i = self.next_finger_index
+            # Finger 1 Is Kept By Stabilize
+            self.next_finger_index = i + 1 if i < SHA1_M_BIT_LENGTH else 2
+            finger_start = self.finger_table.finger_start(i)
+            if found_node is None or not finger_start.in_arc(self.SingleNode.identifier, found_node.identifier, '(]'):
+                if finger_start.in_arc(self.SingleNode.identifier, self.SingleNode.successor.identifier, '(]'):
+                    found_node = self.SingleNode.successor
+                else:
+                    predecessor_node = await self.protocol_find_predecessor(finger_start)
+                    if predecessor_node is None or predecessor_node.successor is None:
+                        return
+                    found_node = predecessor_node.successor
+            finger_node = self.finger_table.get_finger(i)
+            if finger_node is None or finger_node.identifier != found_node.identifier:
+                # Stale Finger: Node Left, Joined In Between, or Was Patched After A Failure
+                self.finger_table.set_finger(i, found_node)
+                self.stale_fingers_fixed += 1
+
+    async def protocol_maintenance_loop(self, interval, maintenance_step):
+        # Run One Maintenance Step Every interval Seconds, Surviving Failures
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await maintenance_step()
+            except Exception as error_msg:
+                node_logger.warning('%s: %s Failed, %r', self.SingleNode.listen_address, maintenance_step.__name__,
+                                    error_msg)
+
+    def protocol_ring_stats(self):
+        # Routing Health, For Benchmarks and Operators
+        return {
+            'successor_list': [chord_node.listen_address[1] for chord_node in self.successor_list],
+            'predecessor': self.SingleNode.predecessor.listen_address[1] if self.SingleNode.predecessor else None,
+            'distinct_fingers': self.finger_table.distinct_finger_count(),
+            'stabilize_rounds': self.stabilize_rounds,
+            'successor_failures': self.successor_failures,
+            'stale_fingers_fixed': self.stale_fingers_fixed,
+            'dead_fingers_dropped': self.dead_fingers_dropped,
+            'location_cache': self.location_cache.node_stats(),
+            'records_stored': self.records_stored,
+            'replicas_stored': self.replicas_stored,
+            'reads_served': self.reads_served,
+            'records_handed_in': self.records_handed_in,
+            'records_handed_off': self.records_handed_off,
+            'keys_counted': self.hot_key_sketch.requests_counted,
+            'record_cache': self.record_cache.node_stats(),
+            # Whole Process: Records Across All Its Virtual Nodes, and Their Ports
+            'process_records': len(self.nfl_dictionary_table),
+            'virtual_nodes': [virtual_node.SingleNode.listen_address[1] for virtual_node in self.virtual_nodes],
+        }
+
+    def protocol_stats(self):
+        # Everything Measured On This Node, For chord_stats.py
+        bytes_sent, bytes_received = self.connection_pool.node_traffic()
+        store_stats = {'records': len(self.nfl_dictionary_table)}
+        if isinstance(self.nfl_dictionary_table, DiskStore):
+            store_stats.update({'data_bytes': self.nfl_dictionary_table.data_size,
+                                'garbage_bytes': self.nfl_dictionary_table.garbage_bytes})
+        return {
+            'node': self.SingleNode.listen_address[1],
+            'identifier': self.SingleNode.identifier.hex_form(),
+            'uptime': time.monotonic() - self.start_time,
+            'handled_rpcs': self.handled_rpcs.node_stats(),
+            'bytes_in': self.listener.bytes_in,
+            'bytes_out': self.listener.bytes_out,
+            # Outgoing Side Is The Connection Pool, Shared By Every Virtual Node of The Process
+            'sent_rpcs': self.connection_pool.sent_rpcs.node_stats(),
+            'bytes_sent': bytes_sent,
+            'bytes_received': bytes_received,
+            'lookup_hops': dict(sorted(self.lookup_hops.items())),
+            'lookup_latency': self.lookup_latency.node_stats(),
+            'store': store_stats,
+            'ring': self.protocol_ring_stats(),
+        }
+
+    async def protocol_update_finger_table(self, s, finger_indexes):
+        updated_indexes = []
+        for i in finger_indexes:
+            # Half Way Identifier
+            half_way_identifier = self.finger_table.finger_start(i)
+            # Get Finger Node at Identifier
+            i_finger_node = self.finger_table.get_finger(i)
+
+            # Validate Node-S: Between Finger Start and Current Finger Node, Not Ourselves. A Node Still
+            # Joining Has No Fingers Yet, Its Own Init-Finger-Table Fills Them
+            if i_finger_node is not None and s.identifier != self.SingleNode.identifier and \
+                    s.identifier.in_arc(half_way_identifier, i_finger_node.identifier, '[)'):
+                # Great, Node-S, is in-between the conditions: Modify finger Node
+                self.finger_table.set_finger(i, s)
+                if i == 1:
+                    # Finger 1 Is The Immediate Successor
+                    self.SingleNode.successor = s
+                updated_indexes.append(i)
+
+        if not updated_indexes:
+            return
+        # Node-S Joined Inside A Cached Arc
+        self.location_cache.node_invalidate(s.identifier)
+        # Print Status
+        node_logger.debug('%s: Updating Finger Table at %d Entries', self.SingleNode.listen_address,
+                          len(updated_indexes))
         # Get Immediate Predecessor : First Node Preceding N
         predecessor_node = self.SingleNode.predecessor
-        # Do Not Send Message To Ourselves or Successor
-
-        if is_unique(predecessor_node.identifier, self.SingleNode.predecessor.identifier) \
-                and is_unique(predecessor_node.identifier, s.identifier):
-            print(f"Sending UpdateFinger to {predecessor_node.identifier}")
-            # Formulate Message
-            update_finger_msg = ("UpdateFinger", (s, i, self.EXCLUSIVE_PORT))
+        # Do Not Send Message To Ourselves or Node-S
+        if predecessor_node is not None and predecessor_node.identifier != self.SingleNode.identifier \
+                and predecessor_node.identifier != s.identifier:
+            # Formulate Message, Same Entries May Need Node-S On Our Predecessor Too
+            update_finger_msg = ("UpdateFingers", (s, updated_indexes, -1))
             # Inform Predecessor To Update Finger Table
-            node_send_network_message(update_finger_msg, self.SingleNode.predecessor.listen_address[1])
+            await self.protocol_send_message(update_finger_msg, predecessor_node.listen_address[1])
 
-    def protocol_main(self):
-        # Print Status
-        print(f'{self.SingleNode.listen_address}: Ready And Listening For Events')
-        while True:
-            self.EXCLUSIVE_PORT = -1
-            # Accept Connection
-            client_con_socket, client_con_address = self.listen_socket.accept()
-            # Decode the Message from Client Connection Socket
-            client_con_data = node_get_response_sync(client_con_socket, True)
+    async def protocol_send_message(self, message, port_num):
+        # Send Over A Pooled Connection, Other Requests Keep Being Served While We Wait
+        return await self.connection_pool.node_send_network_message(message, port_num)
+
+    async def protocol_main(self):
+        await self.protocol_start()
+        # Remaining Virtual Nodes Join One At A Time, Through The Ring We Are Now In
+        for _ in range(1, self.virtual_node_count):
+            await self.protocol_start_virtual_node()
 
-            if client_con_data is not None:
-                # Event Handler Callback
-                response_message = self.protocol_event_handler(client_con_data)
-                # Send Response Back To Client
-                client_con_socket.send(pickle.dumps(response_message))
+        # Print Status
+        node_logger.info('%s: Ready And Listening For Events', self.SingleNode.listen_address)
+        # Ctrl-C or SIGTERM Leave Gracefully, Where asyncio Can Catch Signals
+        event_loop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            try:
+                event_loop.add_signal_handler(signal_number, lambda: asyncio.ensure_future(self.protocol_shutdown()))
+            except NotImplementedError:
+                break
+        # Listen For Incoming Events, Virtual Nodes' Listeners Run On The Same Loop
+        self.serve_task = asyncio.ensure_future(self.listener.node_serve_forever())
+        try:
+            await self.serve_task
+        except asyncio.CancelledError:
+            if not self.left_ring:
+                raise
+
+    async def protocol_start_virtual_node(self):
+        virtual_node = ChordProtocol(self.existing_port or self.SingleNode.listen_address[1], self.lookup_mode,
+                                     None, self.stabilize_interval, self.fix_fingers_interval,
+                                     self.successor_list_length, self.location_cache.capacity,
+                                     host_protocol=self, replication_factor=self.replication_factor,
+                                     record_cache_size=self.record_cache.capacity,
+                                     record_cache_ttl=self.record_cache.ttl)
+        await virtual_node.protocol_start()
+        self.virtual_nodes.append(virtual_node)
+        return virtual_node
+
+    async def protocol_start(self):
+        # Set Up Listening Server, Serving Starts Right Away So Join Traffic Can Reach Us
+        await self.protocol_init_listen_socket()
 
-            # close connection
-            client_con_socket.close()
+        # Print Status
+        node_logger.info('%s: Joining Network With\n\tDeci-ID-Form: %d\n\tHex-ID-Form: %s',
+                         self.SingleNode.listen_address, self.SingleNode.identifier, self.SingleNode.identifier)
+
+        join_start = time.perf_counter()
+        join_requests = self.connection_pool.request_count
+        await self.protocol_join()
+        # Print Status, With What The Join Cost
+        node_logger.info('%s: ---------- Joined Network ---------\n\tDistinct Fingers: %d\n\t'
+                         'Join Time: %.3f s, RPCs: %d', self.SingleNode.listen_address,
+                         self.finger_table.distinct_finger_count(), time.perf_counter() - join_start,
+                         self.connection_pool.request_count - join_requests)
+
+        # Background Stabilize and Fix-Fingers
+        self.successor_list = [self.SingleNode.successor]
+        if self.stabilize_interval > 0:
+            self.maintenance_tasks.append(asyncio.ensure_future(
+                self.protocol_maintenance_loop(self.stabilize_interval, self.protocol_stabilize)))
+        if self.fix_fingers_interval > 0:
+            self.maintenance_tasks.append(asyncio.ensure_future(
+                self.protocol_maintenance_loop(self.fix_fingers_interval, self.protocol_fix_fingers)))
+        if isinstance(self.nfl_dictionary_table, DiskStore) and self.host_protocol is None:
+            # Periodic Index Checkpoints and Compaction, Once Per Process
+            self.store_task = asyncio.ensure_future(self.protocol_maintain_store())
+
+    async def protocol_maintain_store(self):
+        while True:
+            await asyncio.sleep(STORE_MAINTENANCE_INTERVAL)
+            # Reclaim Space Held By Overwritten Records
+            if self.nfl_dictionary_table.compact():
+                node_logger.info('%s: Compacted Record Store, %d Records', self.SingleNode.listen_address,
+                                 len(self.nfl_dictionary_table))
+            # Reopen Then Replays Only What Came After This
+            self.nfl_dictionary_table.checkpoint()
+
+    async def protocol_serve_request(self, message_name, message_body):
+        if self.left_ring:
+            # Gone From The Ring: Callers On Old Connections See A Failed Request and Route Around Us
+            return None
+        start_time = time.perf_counter()
+        request_failed = False
+        try:
+            # Event Handler Callback
+            response_message = await self.protocol_event_handler((message_name, message_body))
+        except Exception as error_msg:
+            # Failed Handler Still Answers, So The Caller Is Not Left Waiting
+            node_logger.warning('%s: %s Failed, %r', self.SingleNode.listen_address, message_name, error_msg)
+            response_message = None
+            request_failed = True
+        self.handled_rpcs.record(message_name, time.perf_counter() - start_time, request_failed)
+        # The Transport Frames The Reply
+        return response_message
 
     def protocol_new_successor(self, possible_successor):
         # Check if the current node and or successor are identical
-        unique_cond = is_unique(self.SingleNode.identifier, self.SingleNode.successor.identifier)
+        unique_cond = self.SingleNode.identifier != self.SingleNode.successor.identifier
 
-        if unique_cond is False or interval_condition(self.SingleNode.identifier, possible_successor.identifier,
-                                                      self.SingleNode.successor.identifier, '[]'):
+        if unique_cond is False or possible_successor.identifier.in_arc(self.SingleNode.identifier,
+                                                                         self.SingleNode.successor.identifier, '()'):
             # Print Status
-            print(f'{self.SingleNode.listen_address}:'
-                  f' Updating Immediate Successor Pointer, To {possible_successor.listen_address}')
+            node_logger.info('%s: Updating Immediate Successor Pointer, To %s', self.SingleNode.listen_address,
+                             possible_successor.listen_address)
             # Update Immediate Successor Pointer
             self.SingleNode.successor = possible_successor
             # Update Finger Table
-            self.finger_table.update({get_immediate_indexes(self.SingleNode.identifier, 1): self.SingleNode.successor})
+            self.finger_table.set_finger(1, self.SingleNode.successor)
+            # Cached Arc Around The New Successor Was Split By Its Join
+            self.location_cache.node_invalidate(possible_successor.identifier)
         # Return Node
         return self.SingleNode
 
     def protocol_new_predecessor(self, possible_predecessor):
         # Print Status
-        print(f'{self.SingleNode.listen_address}: Updating Immediate Predecessor Pointer,'
-              f'To {possible_predecessor.listen_address}')
+        node_logger.info('%s: Updating Immediate Predecessor Pointer, To %s', self.SingleNode.listen_address,
+                         possible_predecessor.listen_address)
         # Update Predecessor Pointer
         self.SingleNode.predecessor = possible_predecessor
+        self.location_cache.node_invalidate(possible_predecessor.identifier)
         # Return Node
         return self.SingleNode
 
-    def protocol_populate_nfl(self, dht_data_set: dict):
-        lower_point = self.SingleNode.identifier
-        highest_point = self.SingleNode.successor.identifier
-        for key, value in dht_data_set.items():
-            if interval_condition(lower_point, key, highest_point, '[)') and \
-                    is_unique(self.SingleNode.identifier, self.SingleNode.successor.identifier):
-                # In Between x <= key < y
-                self.nfl_dictionary_table.update({key: value})
-
-            if interval_condition(lower_point, highest_point, key, '[]') and \
-                    is_unique(self.SingleNode.identifier, self.SingleNode.successor.identifier) is False:
-                # In Between x <= key <= y
-                self.nfl_dictionary_table.update({key: value})
-
-            if interval_condition(key, lower_point, highest_point, '[]') and \
-                    is_unique(self.SingleNode.identifier, self.SingleNode.predecessor.identifier) is False:
-                # In Between  key <= x <= y
-                self.nfl_dictionary_table.update({key: value})
-
-        # Need To Send Data To Predecessor and Successor
-        if is_unique(self.SingleNode.identifier, self.SingleNode.predecessor.identifier) and \
-                self.EXCLUSIVE_PORT != self.SingleNode.predecessor.listen_address[1]:
-            # Don't send message back to ourselves.
-            network_msg = ('Populate', (dht_data_set, self.SingleNode.listen_address[1]))
-            # Send Message To Predecessor
-            node_send_network_message(network_msg, self.SingleNode.predecessor.listen_address[1])
-
-        if is_unique(self.SingleNode.identifier, self.SingleNode.successor.identifier) and \
-                self.EXCLUSIVE_PORT != self.SingleNode.successor.listen_address[1]:
-            # Don't send message back to ourselves.
-            network_msg = ('Populate', (dht_data_set, self.SingleNode.listen_address[1]))
-            # Send Message To Predecessor
-            node_send_network_message(network_msg, self.SingleNode.successor.listen_address[1])
-
-        print(f'{self.SingleNode.listen_address}: Dataset Entries Populated')
-
-    def protocol_find_record(self, identifier):
-        # Check if we have the record
-        if identifier in self.nfl_dictionary_table:
-            # Return the Result
-            return self.nfl_dictionary_table.get(identifier)
-
-        data_record = "Not Here"
-        # Need To Send Data To Predecessor and Successor
-        if is_unique(self.SingleNode.identifier, self.SingleNode.predecessor.identifier) and \
-                self.EXCLUSIVE_PORT != self.SingleNode.predecessor.listen_address[1]:
-            # Don't send message back to ourselves.
-            network_msg = ('FindKey', (identifier, self.SingleNode.listen_address[1]))
-            # Send Message To Predecessor
-            data_record = node_send_network_message(network_msg, self.SingleNode.predecessor.listen_address[1])
-
-        if data_record == "Not Here" and is_unique(self.SingleNode.identifier, self.SingleNode.successor.identifier) \
-                and self.EXCLUSIVE_PORT != self.SingleNode.successor.listen_address[1]:
-            # Don't send message back to ourselves.
-            network_msg = ('FindKey', (identifier, self.SingleNode.listen_address[1]))
-            # Send Message To Predecessor
-            node_send_network_message(network_msg, self.SingleNode.successor.listen_address[1])
-
-        return data_record
-
-    def protocol_event_handler(self, client_data):
+    async def protocol_populate_nfl(self, dht_data_set: dict):
+        # Parse Hex-Decimal Keys Once, Sorted So Each Owner's Arc Is A Slice
+        keyed_records = sorted((Identifier(key), (Identifier(key), value)) for key, value in dht_data_set.items())
+        # Owner Port -> [Records Received, Records Stored]
+        populate_report = dict()
+        owner_sends = []
+        # One Lookup Per Owner, Then Only Its Own Records Travel To It
+        async for owner_node, owner_records in node_group_by_owner(self.protocol_lookup_here, keyed_records):
+            if owner_node is None:
+                node_logger.warning('%s: %d Records Have No Reachable Owner', self.SingleNode.listen_address,
+                                    len(owner_records))
+                break
+            owner_sends.append(self.protocol_send_records(owner_node, owner_records, populate_report))
+        # Owners Ingest Concurrently
+        await asyncio.gather(*owner_sends)
+
+        node_logger.info('%s: Dataset Entries Populated, %d Records To %d Nodes', self.SingleNode.listen_address,
+                         len(keyed_records), len(populate_report))
+        # Return Per-Node Report
+        return populate_report
+
+    async def protocol_send_records(self, owner_node, owner_records, populate_report):
+        owner_port = owner_node.listen_address[1]
+        owner_counts = populate_report.setdefault(owner_port, [0, 0])
+        # Bulk Batches, In Order
+        for batch_start in range(0, len(owner_records), POPULATE_BATCH_SIZE):
+            network_msg = ('StoreRecords', (owner_records[batch_start:batch_start + POPULATE_BATCH_SIZE], -1))
+            batch_counts = await self.protocol_send_message(network_msg, owner_port)
+            if batch_counts is not None:
+                owner_counts[0] += batch_counts[0]
+                owner_counts[1] += batch_counts[1]
+
+    def protocol_local_ports(self):
+        # Ports of Every Virtual Node In This Process, All Sharing One Record Table
+        host_protocol = self.host_protocol or self
+        return {chord_protocol.SingleNode.listen_address[1]
+                for chord_protocol in [host_protocol, *host_protocol.virtual_nodes]}
+
+    def protocol_replica_nodes(self):
+        # Next Successors In Other Processes, A Copy On A Sibling Virtual Node Adds Nothing
+        local_ports = self.protocol_local_ports()
+        return [chord_node for chord_node in self.successor_list
+                if chord_node.listen_address[1] not in local_ports][:self.replication_factor - 1]
+
+    async def protocol_pull_keys(self):
+        # Successor Picked At Init-Finger-Table. None For A Sibling Virtual Node, Whose Records Are Already Shared
+        successor_node = self.handoff_node
+        if successor_node is None:
+            return
+        acked_keys = []
+        try:
+            if self.SingleNode.predecessor is None:
+                return
+            # (Predecessor, Us] Was The Successor's Until Now
+            handoff_arc = (self.SingleNode.predecessor.identifier, self.SingleNode.identifier)
+            while True:
+                # Each Request Acknowledges The Chunk Before It
+                records = await self.protocol_send_message(('HandoffKeys', (handoff_arc, acked_keys, -1)),
+                                                           successor_node.listen_address[1])
+                if not records:
+                    # Arc Done, or Successor Lost: Its Replicas Still Hold What Did Not Arrive
+                    break
+                # Stored Before Acknowledged, So The Successor Only Drops Keys Already Safe Here. Keys Written
+                # To Us Directly Since We Took Over The Arc Are Newer, and Stay
+                handed_records = {Identifier(key): value for key, value in records}
+                self.nfl_dictionary_table.update({key: value for key, value in handed_records.items()
+                                                  if key not in self.nfl_dictionary_table})
+                self.records_handed_in += len(records)
+                acked_keys = [key for key, _ in records]
+        finally:
+            self.handoff_node = None
+        node_logger.info('%s: Took Over %d Records From %s', self.SingleNode.listen_address, self.records_handed_in,
+                         successor_node.listen_address)
+
+    def protocol_handoff_keys(self, handoff_arc, acked_keys):
+        # A New Predecessor Pulls Its Arc From Us, One Chunk Per Request
+        arc_start, arc_end = map(Identifier, handoff_arc)
+        if acked_keys:
+            if self.replication_factor == 1:
+                # Safe On The New Owner. With Replication We Are Its First Replica, So Our Copy Stays
+                self.protocol_delete_records(map(Identifier, acked_keys))
+            self.records_handed_off += len(acked_keys)
+        else:
+            # First Request: One Scan of Our Table For The Arc, Later Chunks Come From This List
+            self.handoff_keys[arc_end] = [key for key in self.nfl_dictionary_table
+                                          if key.in_arc(arc_start, arc_end, '(]')]
+        pending_keys = self.handoff_keys.get(arc_end, [])
+        records = []
+        while pending_keys and len(records) < HANDOFF_CHUNK_SIZE:
+            key = pending_keys.pop()
+            record = self.nfl_dictionary_table.get(key)
+            if record is not None:
+                records.append((key, record))
+        if not records:
+            self.handoff_keys.pop(arc_end, None)
+        return records
+
+    def protocol_delete_records(self, keys):
+        if isinstance(self.nfl_dictionary_table, DiskStore):
+            # Tombstones, One Append For The Batch
+            self.nfl_dictionary_table.delete(keys)
+        else:
+            for key in keys:
+                self.nfl_dictionary_table.pop(key, None)
+
+    async def protocol_leave(self):
+        # Push Our Arc To The Successor, Point Everyone Past Us, Then Stop Answering
+        for maintenance_task in self.maintenance_tasks:
+            maintenance_task.cancel()
+        successor_node = self.SingleNode.successor
+        predecessor_node = self.SingleNode.predecessor
+        handed_count = 0
+        if successor_node.identifier != self.SingleNode.identifier:
+            if successor_node.listen_address[1] not in self.protocol_local_ports():
+                owned_keys = [key for key in self.nfl_dictionary_table if self.protocol_owns(key)]
+                for batch_start in range(0, len(owned_keys), HANDOFF_CHUNK_SIZE):
+                    batch_records = [(key, self.nfl_dictionary_table.get(key))
+                                     for key in owned_keys[batch_start:batch_start + HANDOFF_CHUNK_SIZE]]
+                    if await self.protocol_send_message(('LeaveRecords', (batch_records, -1)),
+                                                        successor_node.listen_address[1]) is None:
+                        # Successor Gone Too: What Is Left Stays Here, Replicas Cover It
+                        node_logger.warning('%s: Successor %s Unreachable, %d Records Not Handed Over',
+                                            self.SingleNode.listen_address, successor_node.listen_address,
+                                            len(owned_keys) - handed_count)
+                        break
+                    handed_count += len(batch_records)
+                # Handed Over Records Would Come Back Stale On A Restart From The Same Store
+                self.protocol_delete_records(owned_keys[:handed_count])
+            # Predecessor and Every Node With A Finger On Us Skip To Our Successor
+            finger_holders = await self.protocol_finger_holders(self.SingleNode.listen_address[1])
+            await asyncio.gather(*(
+                self.protocol_send_message(('NodeLeft', (self.SingleNode, successor_node, -1)),
+                                           target_node.listen_address[1])
+                for target_node, _ in finger_holders.values()))
+            if predecessor_node is not None:
+                await self.protocol_send_message(('UpdatePredecessor', (predecessor_node, -1)),
+                                                 successor_node.listen_address[1])
+        self.left_ring = True
+        if self.host_protocol is not None:
+            self.host_protocol.virtual_nodes.remove(self)
+        self.listener.close()
+        node_logger.info('%s: Left The Ring, %d Records Handed To %s', self.SingleNode.listen_address, handed_count,
+                         successor_node.listen_address)
+        return handed_count
+
+    async def protocol_shutdown(self):
+        # Whole Process Leaves: Virtual Nodes First, Then The Host, Then Serving Stops
+        if self.left_ring:
+            return {}
+        leave_report = dict()
+        for chord_protocol in [*self.virtual_nodes, self]:
+            leave_report[chord_protocol.SingleNode.listen_address[1]] = await chord_protocol.protocol_leave()
+        if self.store_task is not None:
+            self.store_task.cancel()
+        if isinstance(self.nfl_dictionary_table, DiskStore):
+            self.nfl_dictionary_table.close()
+        if self.serve_task is not None:
+            # Let The Reply To A Leave Request Go Out First
+            asyncio.get_running_loop().call_later(LEAVE_LINGER_SECONDS, self.serve_task.cancel)
+        return leave_report
+
+    async def protocol_take_over_records(self, records):
+        # Leaving Predecessor's Arc, Ours Once It Has Spliced Itself Out
+        owned_records = {Identifier(key): value for key, value in records}
+        self.nfl_dictionary_table.update(owned_records)
+        self.records_handed_in += len(owned_records)
+        if self.replication_factor > 1:
+            # Replicas Shift One Node Along, The Last of Ours Had No Copy Yet
+            await self.protocol_replicate_records(list(owned_records.items()))
+        return len(owned_records)
+
+    async def protocol_store_records(self, records):
+        owned_records = dict()
+        for key, value in records:
+            key = Identifier(key)
+            # We Own Keys In (predecessor, us]
+            if self.protocol_owns(key):
+                owned_records.update({key: value})
+        # One Store Update Per Batch
+        self.nfl_dictionary_table.update(owned_records)
+        stored_count = len(owned_records)
+        # Track Traffic Against Records Kept
+        self.records_received += len(records)
+        self.records_stored += stored_count
+        node_logger.debug('%s: Stored %d of %d Records, %d of %d In Total', self.SingleNode.listen_address,
+                          stored_count, len(records), self.records_stored, self.records_received)
+        if owned_records and self.replication_factor > 1:
+            # Copy To Replicas Before Answering, So A Finished Populate Can Be Read Anywhere
+            await self.protocol_replicate_records(list(owned_records.items()))
+        return len(records), stored_count
+
+    async def protocol_replicate_records(self, replica_records):
+        await asyncio.gather(*(self.protocol_send_message(('StoreReplicas', (replica_records, -1)),
+                                                          replica_node.listen_address[1])
+                               for replica_node in self.protocol_replica_nodes()))
+
+    def protocol_store_replicas(self, records):
+        # Copies of A Predecessor's Records, Kept Outside Our Arc
+        self.nfl_dictionary_table.update({Identifier(key): value for key, value in records})
+        self.replicas_stored += len(records)
+        return len(records)
+
+    async def protocol_find_record(self, identifier, routed_port=-1):
+        # Our Own Records and Replica Copies Both Answer Right Here
+        record = self.nfl_dictionary_table.get(identifier)
+        if record is None and self.handoff_node is not None and self.protocol_owns(identifier):
+            # Our Arc Is Still Arriving: Keys Not Handed Over Yet Are Read From The Successor Giving Them
+            record = await self.protocol_send_message(('FindKey', (identifier, self.SingleNode.listen_address[1])),
+                                                      self.handoff_node.listen_address[1])
+            if record == NOT_OWNER or record == "Not Here":
+                record = None
+        if record is not None or self.protocol_owns(identifier):
+            # Record, or A Definitive Miss: We Own Keys In (predecessor, us]
+            self.reads_served += 1
+            return record if record is not None else "Not Here"
+        if routed_port != -1:
+            # Sent Here As Owner or Replica, But We Cannot Answer For This Key
+            return NOT_OWNER
+
+        # Count Every Key Asked of Us or Routed Through Us, Only Hot Ones Are Worth A Cached Copy
+        is_hot = self.hot_key_sketch.count(identifier) >= HOT_KEY_THRESHOLD
+        if is_hot:
+            record = self.record_cache.get(identifier)
+            if record is not None:
+                # Answered On The Path, The Owner Never Sees This Request
+                return record
+            # Hot and Not Cached Yet: Hand It To The Next Finger Hop, Which Counts and Caches It In Turn
+            record = await self.protocol_route_record(identifier)
+        if record is None:
+            record = await self.protocol_fetch_record(identifier)
+        if is_hot and record is not None and record != "Not Here":
+            self.record_cache.put(identifier, record)
+        return record
+
+    async def protocol_route_record(self, identifier):
+        # Forward Along The Finger Route. None When We Are The Last Hop, or The Next Hop Fails
+        is_final, next_node = self.protocol_next_hop(identifier)
+        if is_final:
+            return None
+        record = await self.protocol_send_message(('FindKey', (identifier, -1)), next_node.listen_address[1])
+        return None if record == NOT_OWNER else record
+
+    async def protocol_fetch_record(self, identifier):
+        # Owner Answers From Its Own Table, Without Routing Again
+        network_msg = ('FindKey', (identifier, self.SingleNode.listen_address[1]))
+        cached_arc = self.location_cache.node_find(identifier)
+        if cached_arc is not None:
+            # Cache Hit: Single Hop To The Least Loaded of Owner and Replicas
+            _, owner_node, replica_nodes = cached_arc
+            target_node = node_pick_replica(self.connection_pool, owner_node, replica_nodes)
+            record = await self.protocol_send_message(network_msg, target_node.listen_address[1])
+            if (record is None or record == NOT_OWNER) and target_node is not owner_node:
+                # Replica Missed The Copy, The Owner Has The Final Word
+                record = await self.protocol_send_message(network_msg, owner_node.listen_address[1])
+            if record is not None and record != NOT_OWNER:
+                return record
+            self.location_cache.node_invalidate(identifier)
+
+        # Route Through The Finger Table To The Owner. O(log-n) Hops
+        lookup_result = await self.protocol_lookup_here(identifier)
+        if lookup_result.owner is None:
+            return "Not Here"
+        if self.replication_factor > 1 and self.location_cache.capacity > 0:
+            # Replicas Remembered With The Arc, So Later Reads Spread Over Them
+            lookup_result.replicas = await self.protocol_send_message(
+                ('ReplicaSet', (0, -1)), lookup_result.owner.listen_address[1]) or ()
+        self.location_cache.node_store(lookup_result.predecessor, lookup_result.owner, lookup_result.replicas)
+        record = await self.protocol_send_message(network_msg, lookup_result.owner.listen_address[1])
+        if record == NOT_OWNER:
+            # Ring Changed Under The Lookup
+            self.location_cache.node_invalidate(identifier)
+            return "Not Here"
+        return record
+
+    def protocol_find_records(self, identifiers):
+        # Batched Local Reads, Answers In Request Order. Keys Outside Our Arc Without A Copy Here Are Refused
+        records = []
+        for identifier in map(Identifier, identifiers):
+            record = self.nfl_dictionary_table.get(identifier)
+            if record is None:
+                record = "Not Here" if self.protocol_owns(identifier) else NOT_OWNER
+            records.append(record)
+        self.reads_served += sum(record != NOT_OWNER for record in records)
+        return records
+
+    async def protocol_event_handler(self, client_data):
         # Get Method
         rpc_method = client_data[0]
         # Get Rpc Data
         rpc_data = client_data[1]
         # Extra Information
         rpc_params = None
+        # Port A Ring Walk Started From, Kept Per Request
+        exclusive_port = -1
 
         if len(rpc_data) == 2:
             # Get Exclusive Port
-            self.EXCLUSIVE_PORT = rpc_data[1]
+            exclusive_port = rpc_data[1]
             # Get Data
             rpc_params = rpc_data[0]
         if len(rpc_data) == 3:
             # Get Exclusive Port
-            self.EXCLUSIVE_PORT = rpc_data[2]
+            exclusive_port = rpc_data[2]
             # Get Data
             rpc_params = (rpc_data[0], rpc_data[1])
 
         if rpc_params != None:
             if rpc_method == 'UpdateFinger':
                 # Protocol-Update-Finger-Table RPC
-                self.protocol_update_finger_table(rpc_params[0], rpc_params[1])
+                await self.protocol_update_finger_table(rpc_params[0], [rpc_params[1]])
+            if rpc_method == 'UpdateFingers':
+                # Batched Update-Finger-Table, Several Entries For One Node
+                await self.protocol_update_finger_table(rpc_params[0], rpc_params[1])
+            if rpc_method == 'CopyFingers':
+                # A Joining Predecessor Bootstraps From Our Fingers
+                return self.protocol_finger_hints()
             if rpc_method == 'UpdateSuccessor':
                 # New Update Successor
                 return self.protocol_new_successor(rpc_params)
             if rpc_method == 'FindSuccessor':
                 # Protocol-Find-Successor RPC
-                return self.protocol_find_successor(rpc_params)
+                return await self.protocol_find_successor(Identifier(rpc_params))
             if rpc_method == 'FindPredecessor':
-                # Protocol-Find-Predecessor RPC
-                return self.protocol_find_predecessor(rpc_params)
+                # Protocol-Find-Predecessor RPC, Reporting The Hops It Was Forwarded
+                return await self.protocol_route_predecessor(Identifier(rpc_params))
+            if rpc_method == 'NextHop':
+                # One Routing Step, For Lookups Iterated By The Caller
+                return self.protocol_next_hop(Identifier(rpc_params))
             if rpc_method == 'UpdatePredecessor':
                 # New Update Predecessor
                 return self.protocol_new_predecessor(rpc_params)
-            if rpc_method == 'FindLowestNode':
-                # Return Node with the lowest Identifier in Network
-                return self.protocol_find_lowest_node()
             if rpc_method == 'Populate':
-                self.protocol_populate_nfl(rpc_params)
+                return await self.protocol_populate_nfl(rpc_params)
+            if rpc_method == 'StoreRecords':
+                # Bulk Batch of Records In Our Arc
+                return await self.protocol_store_records(rpc_params)
+            if rpc_method == 'StoreReplicas':
+                # Owner's Copy Of Records It Just Stored
+                return self.protocol_store_replicas(rpc_params)
+            if rpc_method == 'HandoffKeys':
+                # New Predecessor Pulling Its Arc, Acknowledging The Last Chunk
+                return self.protocol_handoff_keys(rpc_params[0], rpc_params[1])
+            if rpc_method == 'LeaveRecords':
+                # Leaving Predecessor's Records, Before It Splices Itself Out
+                return await self.protocol_take_over_records(rpc_params)
+            if rpc_method == 'NodeLeft':
+                # A Node We Point At Left, Its Successor Replaces It
+                return await self.protocol_node_left(rpc_params[0], rpc_params[1])
+            if rpc_method == 'Leave':
+                # Whole Process Leaves The Ring, Replying With Records Handed Over Per Node
+                return await (self.host_protocol or self).protocol_shutdown()
+            if rpc_method == 'ReplicaSet':
+                # Nodes Holding Copies of Our Records
+                return self.protocol_replica_nodes()
             if rpc_method == 'FindKey':
-                return self.protocol_find_record(rpc_params)
+                return await self.protocol_find_record(Identifier(rpc_params), exclusive_port)
+            if rpc_method == 'FindKeys':
+                # Caller Already Grouped These Keys By Owner
+                return self.protocol_find_records(rpc_params)
+            if rpc_method == 'StabilizeInfo':
+                # Our Predecessor and Successor List, Also Serves As A Liveness Check
+                return self.SingleNode.predecessor, self.successor_list
+            if rpc_method == 'Notify':
+                return await self.protocol_notify(rpc_params)
+            if rpc_method == 'RingStats':
+                return self.protocol_ring_stats()
+            if rpc_method == 'Stats':
+                # Counters, Latency Histograms, Traffic and Store Size
+                return self.protocol_stats()
         else:
-            print("Something Happened")
+            node_logger.warning('Something Happened: %s Without Parameters', rpc_method)
 
         # Return Node For Any Events
         return self.SingleNode
@@ -614,14 +1167,32 @@ class ChordProtocol:
 
 if __name__ == '__main__':
     print("README:\n\tProvide Port Number: Port Number Zero[0] reserve for starting network")
-    # Existing Port Number
-    if len(sys.argv) != 2:
-        print("Usage: python chord_node.py EXISTINGPORT")
-        exit(1)
+    # Existing Port Number, Optional Lookup Mode, Optional Record Data File, Maintenance Settings
+    argument_parser = argparse.ArgumentParser(prog='python chord_node.py')
+    argument_parser.add_argument('existing_port', metavar='EXISTINGPORT', type=int)
+    argument_parser.add_argument('lookup_mode', nargs='?', default='recursive', choices=['recursive', 'iterative'])
+    argument_parser.add_argument('store_path', metavar='DATAFILE', nargs='?', default=None)
+    argument_parser.add_argument('--stabilize-interval', type=float, default=STABILIZE_INTERVAL)
+    argument_parser.add_argument('--fix-fingers-interval', type=float, default=FIX_FINGERS_INTERVAL)
+    argument_parser.add_argument('--successors', dest='successor_list_length', type=int, default=SUCCESSOR_LIST_LENGTH)
+    argument_parser.add_argument('--location-cache', dest='location_cache_size', type=int, default=LOCATION_CACHE_SIZE)
+    argument_parser.add_argument('--virtual-nodes', dest='virtual_node_count', type=int, default=VIRTUAL_NODE_COUNT)
+    argument_parser.add_argument('--replicas', dest='replication_factor', type=int, default=REPLICATION_FACTOR)
+    argument_parser.add_argument('--record-cache', dest='record_cache_size', type=int, default=RECORD_CACHE_SIZE)
+    argument_parser.add_argument('--record-ttl', dest='record_cache_ttl', type=float, default=RECORD_CACHE_TTL)
+    argument_parser.add_argument('--log-level', default=os.environ.get('CHORD_LOG_LEVEL', 'INFO'),
+                                 choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'])
+    node_arguments = argument_parser.parse_args()
+    # Plain Messages On Stdout, Status Lines Look As They Always Did
+    logging.basicConfig(stream=sys.stdout, level=node_arguments.log_level, format='%(message)s')
 
-    # Get Port Number from Entry
-    port_number = int(sys.argv[1])
     # Call Method
-    chord_protocol = ChordProtocol(port_number)
+    chord_protocol = ChordProtocol(node_arguments.existing_port, node_arguments.lookup_mode, node_arguments.store_path,
+                                   node_arguments.stabilize_interval, node_arguments.fix_fingers_interval,
+                                   node_arguments.successor_list_length, node_arguments.location_cache_size,
+                                   node_arguments.virtual_node_count,
+                                   replication_factor=node_arguments.replication_factor,
+                                   record_cache_size=node_arguments.record_cache_size,
+                                   record_cache_ttl=node_arguments.record_cache_ttl)
 
     print('End of Program')
@@ -6,84 +6,60 @@
 Lab4 Chord
 """
 
+import os
 import csv
-import hashlib
 import sys
-import pickle
+import time
+import queue
+import logging
 import hashlib
-from socket import *
-
-
-def node_get_response_sync(socket_t, set_timer=False):
-    try:
-        server_host_response = b''
-        counter = 0
-        while True:
-            if set_timer:
-                # Set a 5 seconds timeout
-                socket_t.settimeout(1)
-            # Save to response message to 4096 bytes buffer
-            counter += 4096
-            try:
-                pkt_data = socket_t.recv(4096)
-            except TimeoutError:
-                break
-            else:
-                if pkt_data == b'':
-                    break
-                else:
-                    server_host_response += pkt_data
-
-    except Exception as error:
-        return None
-    else:
-        print("Reached")
-        # No Errors Raised
-        if server_host_response == b'':
-            return None
-        # return deserialized response
-        return pickle.loads(server_host_response)
-
-
-def node_send_network_message(message, port_num, set_timer=False):
-    # Act as a Client, asking An Existing Node To Find Successor
-    client_socket = socket(AF_INET, SOCK_STREAM)
-
-    host_response = None
-    try:
-        # Connect To Existing-Node-Host
-        client_socket.connect(('localhost', port_num))
-    except Exception as error_msg:
-        # Print Exception message
-        print(error_msg)
-    else:
-        # Send Node's Identifier To Existing-Node-Host
-        client_socket.send(pickle.dumps(message))
-
-    # Close Client Connection Socket
-    client_socket.close()
-    # Return Result
-    return host_response
+import threading
+from chord_network import ConnectionPool, node_send_network_message
+
+# Rows Per Streamed Batch, Bounds Client Memory
+INGEST_BATCH_ROWS = 5000
+# Batches Sent But Not Yet Acknowledged, Reading Blocks Beyond This
+INGEST_MAX_IN_FLIGHT = 4
+
+# Data Rows Are Echoed At DEBUG Only
+populate_logger = logging.getLogger('chord_populate')
 
 
 class ChordPopulate:
     existing_port = -1
     file_name = ''
     distributed_hash_table = dict()
+    ingest_mode = 'whole'
 
-    def __init__(self, ex_port, fl_name):
+    def __init__(self, ex_port, fl_name, ingest_mode='whole'):
         self.existing_port = ex_port
         self.file_name = "{fl_name}"
+        self.ingest_mode = ingest_mode
 
         if self.existing_port > 0 and self.file_name != '':
+            if self.ingest_mode == 'stream':
+                # Read, Hash and Send In Bounded Batches
+                self.stream_csv_file(fl_name)
+                return
             # read csv file data
             self.read_csv_file(fl_name)
             # Distribute DataSet To Nodes
             network_msg = ('Populate', (self.distributed_hash_table, -1))
-            node_send_network_message(network_msg, self.existing_port)
+            populate_report = node_send_network_message(network_msg, self.existing_port)
+            # Each Node Only Receives Records In Its Own Arc
+            self.print_populate_report(populate_report)
         else:
             print("Need Valid Port Number and Valid File Path")
 
+    @staticmethod
+    def print_populate_report(populate_report):
+        if not populate_report:
+            print("Populate Failed, No Report From Node")
+            return
+        # Node Port -> Records Received, Records Stored
+        for node_port, (received_count, stored_count) in sorted(populate_report.items()):
+            print(f"Node {node_port}: Received {received_count} Records, Stored {stored_count}")
+
     def read_csv_file(self, file_local):
         with open(file_local, newline='') as csv_file:
             reader_stream = csv.reader(csv_file)
@@ -93,53 +69,133 @@ class ChordPopulate:
                 # Other columns for the row can be put together in a dictionary
                 if reader_stream.line_num > 1:
                     self.add_row_to_nfl_dht(row)
-                # Print Data Rows
-                print(', '.join(row))
+                # Echo Data Rows, Joined Only When DEBUG Is On
+                if populate_logger.isEnabledFor(logging.DEBUG):
+                    populate_logger.debug('%s', ', '.join(row))
+
+    @staticmethod
+    def split_row(cr_row):
+        # Key -> SHA-1 of (PlayerID + Year), Value -> (Other Columns in rows)
+        row_key = cr_row[0] + cr_row[3] if len(cr_row) > 3 else ''.join(cr_row[:1])
+        player_team_stats = [element for i, element in enumerate(cr_row) if i != 0 and i != 3]
+        return hashlib.sha1(row_key.encode()).hexdigest(), player_team_stats
 
     def add_row_to_nfl_dht(self, cr_row: []):
-        # Key -> (PlayerID + Year), Value -> (Other Columns in rows)
-        row_value = []
-        row_key = ""
-
-        # Save The Player Stats
-        player_team_stats = []
-        # Formulate Key entries to be hashed
-        for i in range(0, len(cr_row)):
-            element = cr_row[i]
-            if i == 0 or i == 3:
-                # Entries in Column 0 and 3 make up key
-                row_key += element
-            else:
-                # Save The Rest Entries as Regular Data
-                player_team_stats.append(element)
-
-        # Hash Key using SHA-1, then add to distributed hash table
-        row_key = hashlib.sha1(row_key.encode())
-        # Check if dictionary contains key already
-        if row_key.hexdigest() in self.distributed_hash_table:
-            # Linear Probing.
-            # Get Existing Value from Key
-            row_value = self.distributed_hash_table.get(row_key.hexdigest())
-            # Append this player's stats to exist value
-            row_value.append(player_team_stats)
-        else:
-            # Append Player's Team Stats To Row Value
-            row_value.append(player_team_stats)
+        row_key, player_team_stats = self.split_row(cr_row)
+        # Linear Probing: Same Player and Year, Append this player's stats
+        self.distributed_hash_table.setdefault(row_key, []).append(player_team_stats)
 
-        # Save To Hash Table
-        self.distributed_hash_table.update({row_key.hexdigest(): row_value})
+    def read_csv_batches(self, file_local):
+        # Lazily Yield (Batch, Rows In Batch), At Most About INGEST_BATCH_ROWS Rows Each. Nodes Replace A Key's
+        # Rows On Every Store, So Rows Must Come Sorted By Player Id, Each Player-Year's Rows Together
+        with open(file_local, newline='') as csv_file:
+            reader_stream = csv.reader(csv_file)
+            # Skip Header Row
+            next(reader_stream, None)
+            batch_table, batch_rows, last_key = dict(), 0, None
+            # Current Player, and Its Years Already Finished: Constant Memory Check of The Sort Order
+            last_player, last_year, finished_years = None, None, set()
+            for row in reader_stream:
+                if not row:
+                    continue
+                player_id, year = row[0], row[3] if len(row) > 3 else ''
+                if player_id != last_player:
+                    if last_player is not None and player_id < last_player:
+                        raise ValueError(f'Line {reader_stream.line_num}: Player Id {player_id} After {last_player}, '
+                                         f'Stream Input Must Be Sorted By Player Id')
+                    last_player, finished_years = player_id, set()
+                elif year != last_year:
+                    if year in finished_years:
+                        raise ValueError(f'Line {reader_stream.line_num}: {player_id} Year {year} Seen Earlier, '
+                                         f'Stream Input Must Keep Each Player-Year\'s Rows Together')
+                    finished_years.add(last_year)
+                last_year = year
+                row_key, player_team_stats = self.split_row(row)
+                # Cut Only Between Keys, So One Player-Year Never Spans Two Batches
+                if batch_rows >= INGEST_BATCH_ROWS and row_key != last_key:
+                    yield batch_table, batch_rows
+                    batch_table, batch_rows = dict(), 0
+                batch_table.setdefault(row_key, []).append(player_team_stats)
+                batch_rows += 1
+                last_key = row_key
+            if batch_rows:
+                yield batch_table, batch_rows
+
+    def stream_csv_file(self, file_local):
+        # Bounded Hand-Off: Reader Blocks Once INGEST_MAX_IN_FLIGHT Batches Wait
+        batch_queue = queue.Queue(maxsize=INGEST_MAX_IN_FLIGHT)
+        connection_pool = ConnectionPool()
+        # Node Port -> [Records Received, Records Stored], Summed Over Batches
+        populate_report = dict()
+        report_lock = threading.Lock()
+        failed_batches = []
+
+        def send_batches():
+            while True:
+                batch_table = batch_queue.get()
+                if batch_table is None:
+                    return
+                # Entry Node Partitions Each Batch By Owner
+                batch_report = connection_pool.node_send_network_message(('Populate', (batch_table, -1)),
+                                                                         self.existing_port)
+                with report_lock:
+                    if not batch_report:
+                        failed_batches.append(len(batch_table))
+                        continue
+                    for node_port, (received_count, stored_count) in batch_report.items():
+                        node_counts = populate_report.setdefault(node_port, [0, 0])
+                        node_counts[0] += received_count
+                        node_counts[1] += stored_count
+
+        # One Sender Per In-Flight Batch, Sharing One Multiplexed Connection
+        sender_threads = [threading.Thread(target=send_batches, daemon=True) for _ in range(INGEST_MAX_IN_FLIGHT)]
+        for sender_thread in sender_threads:
+            sender_thread.start()
+
+        start_time = time.perf_counter()
+        total_rows, total_batches = 0, 0
+        try:
+            for batch_table, batch_rows in self.read_csv_batches(file_local):
+                batch_queue.put(batch_table)
+                total_rows += batch_rows
+                total_batches += 1
+                if total_batches % 50 == 0:
+                    # Progress, Rows Read So Far
+                    elapsed = time.perf_counter() - start_time
+                    print(f"Read {total_rows} Rows, {total_rows / elapsed:.0f} Rows/s")
+        except ValueError as error_msg:
+            # Unsorted Input: Stop Before A Later Batch Replaces Rows Already Sent. Use 'whole' For Such Files
+            print(f"Stopped Reading, {error_msg}")
+        # Stop Senders Once Queue Drains
+        for _ in sender_threads:
+            batch_queue.put(None)
+        for sender_thread in sender_threads:
+            sender_thread.join()
+        elapsed = time.perf_counter() - start_time
+        connection_pool.close()
+
+        self.print_populate_report(populate_report)
+        if failed_batches:
+            print(f"{len(failed_batches)} Batches Failed, {sum(failed_batches)} Keys Not Stored")
+        print(f"Streamed {total_rows} Rows In {total_batches} Batches, {elapsed:.2f} s, "
+              f"{total_rows / elapsed if elapsed else 0:.0f} Rows/s")
+        return total_rows, elapsed
 
 
 if __name__ == '__main__':
+    # CHORD_LOG_LEVEL=DEBUG Echoes Every Row
+    logging.basicConfig(stream=sys.stdout, level=os.environ.get('CHORD_LOG_LEVEL', 'INFO'), format='%(message)s')
     print("README:\n\tFile Path should be raw string for instance : "
           "C:\\Users\\EdwinK\\PycharmProjects\\DS\\Career_Stats_Passing.csv")
     # Existing Port Number
-    if len(sys.argv) != 3:
-        print("Usage: python chord_populate.py EXISTINGPORT FILEPATH")
+    if len(sys.argv) not in (3, 4) or sys.argv[3:] not in ([], ['whole'], ['stream']):
+        print("Usage: python chord_populate.py EXISTINGPORT FILEPATH [whole|stream]\n"
+              "\twhole: Any Row Order, Whole File Held In Memory\n"
+              "\tstream: Constant Memory, Rows Sorted By Player Id With Each Player-Year's Rows Together")
         exit(1)
 
     existing_port = int(sys.argv[1])
     file_path = sys.argv[2]
 
     # Populate Chord Nodes
-    population = ChordPopulate(existing_port, file_path)
+    population = ChordPopulate(existing_port, file_path, *sys.argv[3:])
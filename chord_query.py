@@ -7,87 +7,161 @@ Lab4 Chord
 """
 
 import sys
-import select
-import pickle
+import asyncio
 import hashlib
-import threading
-from socket import *
-
-
-def node_get_response_sync(socket_t, set_timer=False):
-    try:
-        server_host_response = b''
-        counter = 0
-        while True:
-            if set_timer:
-                # Set a 5 seconds timeout
-                socket_t.settimeout(1)
-            # Save to response message to 4096 bytes buffer
-            counter += 4096
-            try:
-                pkt_data = socket_t.recv(4096)
-            except TimeoutError:
-                break
-            else:
-                if pkt_data == b'':
-                    break
-                else:
-                    server_host_response += pkt_data
-
-    except Exception as error:
+from itertools import islice
+from functools import partial
+from chord_identifier import Identifier
+from chord_network import NOT_OWNER, AsyncConnectionPool, LocationCache, node_send_network_message, \
+    node_iterative_find_successor, node_cached_lookup, node_group_by_owner, node_pick_replica
+
+# Keys Resolved Together, Bounds Client Memory While Streaming
+QUERY_BATCH_KEYS = 5000
+
+
+def query_row_key(column1, column2):
+    # Hash Key using SHA-1, Same As chord_populate
+    return hashlib.sha1((column1 + str(column2)).encode()).hexdigest()
+
+
+async def query_iterative(existing_port, row_key):
+    # One Pool, So Many Lookups Can Share Connections
+    connection_pool = AsyncConnectionPool()
+    # Walk The Ring Ourselves, One Next-Hop Request Per Node
+    lookup_result = await node_iterative_find_successor(connection_pool, row_key, existing_port)
+    for hop_index, hop_time in enumerate(lookup_result.hop_times, 1):
+        print(f'Hop {hop_index}: {hop_time * 1e3:.3f} ms')
+    if lookup_result.owner is None:
+        connection_pool.close()
         return None
-    else:
-        # No Errors Raised
-        if server_host_response == b'':
-            return None
-        # return deserialized response
-        return pickle.loads(server_host_response)
-
-
-def node_send_network_message(message, port_num, set_timer=False):
-    # Act as a Client, asking An Existing Node To Find Successor
-    client_socket = socket(AF_INET, SOCK_STREAM)
-    # set socket timeout to 1.5 seconds
-    # client_socket.settimeout(2)
-    host_response = None
-    try:
-        # Connect To Existing-Node-Host
-        client_socket.connect(('localhost', port_num))
-    except Exception as error_msg:
-        # Print Exception message
-        print(error_msg)
-    else:
-        # Send Node's Identifier To Existing-Node-Host
-        client_socket.send(pickle.dumps(message))
-        # Get Response from Existing-Node-Host
-        host_response = node_get_response_sync(client_socket, set_timer)
+    print(f'Owner {lookup_result.owner.listen_address} After {lookup_result.hop_count()} Hops, '
+          f'{lookup_result.elapsed * 1e3:.3f} ms')
+    # Ask The Owner Directly
+    result = await connection_pool.node_send_network_message(('FindKey', (row_key, -1)),
+                                                             lookup_result.owner.listen_address[1])
+    connection_pool.close()
+    return result
+
+
+async def query_owner_keys(connection_pool, owner_node, replica_nodes, row_keys):
+    # Read From The Least Loaded Replica, Keys It Holds No Copy of Fall Back To The Owner
+    target_node = node_pick_replica(connection_pool, owner_node, replica_nodes)
+    network_msg = ('FindKeys', (row_keys, -1))
+    results = await connection_pool.node_send_network_message(network_msg, target_node.listen_address[1])
+    if target_node is owner_node:
+        return results
+    if results is None:
+        return await connection_pool.node_send_network_message(network_msg, owner_node.listen_address[1])
+    missed_positions = [position for position, result in enumerate(results) if result == NOT_OWNER]
+    if missed_positions:
+        owner_results = await connection_pool.node_send_network_message(
+            ('FindKeys', ([row_keys[position] for position in missed_positions], -1)), owner_node.listen_address[1])
+        for position, result in zip(missed_positions, owner_results or ()):
+            results[position] = result
+    return results
 
-    # Close Client Connection Socket
-    client_socket.close()
-    # Return Result
-    return host_response
+
+async def query_batch(connection_pool, existing_port, row_keys, location_cache=None, retry_stale=True):
+    # Sort Keys Around The Ring, Remembering Input Positions
+    keyed_positions = sorted((Identifier(row_key), position) for position, row_key in enumerate(row_keys))
+    results = ["Not Here"] * len(row_keys)
+    owner_requests = []
+    if location_cache is None:
+        location_cache = LocationCache(0)
+    # One Lookup Per Owner, From Here. Cached Arcs Need None, and Also Know Their Replicas
+    async for owner_node, positions in node_group_by_owner(partial(
+            node_cached_lookup, location_cache,
+            lambda identifier: node_iterative_find_successor(connection_pool, identifier, existing_port),
+            replica_function=lambda owner_node: connection_pool.node_send_network_message(
+                ('ReplicaSet', (0, -1)), owner_node.listen_address[1])),
+            keyed_positions):
+        if owner_node is None:
+            # Ring Unreachable, Leave These As Not Here
+            break
+        owner_requests.append((positions, query_owner_keys(
+            connection_pool, owner_node, location_cache.node_replicas(owner_node.identifier),
+            [row_keys[position] for position in positions])))
+
+    # One Batched Request Per Owner Arc, All In Flight Together
+    owner_replies = await asyncio.gather(*(owner_request for _, owner_request in owner_requests))
+    for (positions, _), owner_reply in zip(owner_requests, owner_replies):
+        if owner_reply is None:
+            continue
+        for position, result in zip(positions, owner_reply):
+            results[position] = result
+
+    # Owners That Refused Keys Were Cached Before The Ring Changed, Look Those Up Again Once
+    stale_positions = [position for position, result in enumerate(results) if result == NOT_OWNER]
+    for position in stale_positions:
+        location_cache.node_invalidate(Identifier(row_keys[position]))
+    if stale_positions and retry_stale:
+        retried_results = await query_batch(connection_pool, existing_port,
+                                            [row_keys[position] for position in stale_positions], location_cache, False)
+        for position, result in zip(stale_positions, retried_results):
+            results[position] = result
+    return [("Not Here" if result == NOT_OWNER else result) for result in results]
+
+
+async def query_batch_stream(existing_port, key_lines):
+    # Read (Column1, Column2) Lines Lazily, Yield (Line, Result) In Input Order
+    connection_pool = AsyncConnectionPool()
+    # Owner Arcs Live For The Whole Stream, Repeat Keys Skip Their Lookups
+    location_cache = LocationCache()
+    key_lines = (key_line.strip() for key_line in key_lines)
+    key_lines = (key_line for key_line in key_lines if key_line)
+    while True:
+        batch_lines = list(islice(key_lines, QUERY_BATCH_KEYS))
+        if not batch_lines:
+            break
+        # Columns Split On Comma or Whitespace
+        row_keys = [query_row_key(*key_line.replace(',', ' ').split()[:2]) for key_line in batch_lines]
+        for key_line, result in zip(batch_lines, await query_batch(connection_pool, existing_port, row_keys,
+                                                                   location_cache)):
+            yield key_line, result
+    connection_pool.close()
+    # Stderr, So Piped Results Stay Clean
+    print(f'Location Cache: {location_cache.node_stats()}', file=sys.stderr)
+
+
+async def query_batch_print(existing_port, key_lines):
+    async for key_line, result in query_batch_stream(existing_port, key_lines):
+        print(f'{key_line}\t{result}')
 
 
 if __name__ == '__main__':
+    # Batch Output Is Results Only, So It Can Be Piped
+    if sys.argv[2:3] == ['batch'] and len(sys.argv) in (3, 4):
+        # Batch Mode: One "COLUMN1,COLUMN2" Key Per Line, From File or Stdin
+        if sys.argv[3:] in ([], ['-']):
+            asyncio.run(query_batch_print(int(sys.argv[1]), sys.stdin))
+        else:
+            with open(sys.argv[3]) as key_file:
+                asyncio.run(query_batch_print(int(sys.argv[1]), key_file))
+        exit(0)
+
     print("README:\n\tProvide Port Number, Along with Column1 and Column4 values from csv file.\n\t"
           "Column1 and Column4 will be used to hashed to identifier."
           "\nExample\n\tPort: 51544\tColumn1:billdemory/2512778\tColumn2:1974")
 
-    # Existing Port Number
-    if len(sys.argv) != 4:
-        print("Usage: python chord_populate.py EXISTINGPORT COLUMN1 COLUMN2")
+    # Existing Port Number, Optional Lookup Mode
+    if len(sys.argv) not in (4, 5) or sys.argv[4:] not in ([], ['recursive'], ['iterative']):
+        print("Usage: python chord_query.py EXISTINGPORT COLUMN1 COLUMN2 [recursive|iterative]\n"
+              "       python chord_query.py EXISTINGPORT batch [KEYFILE|-]")
         exit(1)
 
     existing_port = int(sys.argv[1])
     column1 = sys.argv[2]
     column2 = int(sys.argv[3])
 
-    row_key = column1 + str(column2)
-    # Hash Key using SHA-1, then add to distributed hash table
-    row_key = hashlib.sha1(row_key.encode()).hexdigest()
+    # Hash Key using SHA-1
+    row_key = query_row_key(column1, column2)
 
-    # Distribute DataSet To Nodes
-    network_msg = ('FindKey', (row_key, -1))
-    result = node_send_network_message(network_msg, existing_port)
+    if sys.argv[4:] == ['iterative']:
+        # Resolve The Owner Hop By Hop From Here
+        result = asyncio.run(query_iterative(existing_port, row_key))
+    else:
+        # Ask The Known Node, Which Finds The Record For Us
+        network_msg = ('FindKey', (row_key, -1))
+        result = node_send_network_message(network_msg, existing_port)
 
     print(result)
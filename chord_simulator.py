@@ -0,0 +1,188 @@
+"""
+@author Edwin Kaburu
+@date 11/19/2022
+@see "Seattle University, CPSC 5520, Fall 2022" - Distributed Systems
+@file chord_simulator.py
+Lab4 Chord
+"""
+
+import time
+import random
+import asyncio
+import itertools
+from chord_codec import node_decode_body
+from chord_metrics import RpcMetrics
+from chord_network import FRAME_HEADER, MESSAGE_NAMES, node_encode_frame
+
+# One-Way Link Delay In Seconds, Up To This Much Random Extra, and The Chance Each Request or Reply Is Lost
+SIMULATED_LATENCY = 0.0
+SIMULATED_JITTER = 0.0
+SIMULATED_LOSS = 0.0
+# Simulated Nodes Take Ports From Here Up, Descriptors Carry 16-Bit Ports
+SIMULATED_FIRST_PORT = 1024
+
+
+class SimulatedListener:
+    # One Node's Endpoint On The Simulated Network, Same Interface As TcpListener
+
+    def __init__(self, simulated_network, request_handler, listen_address):
+        self.simulated_network = simulated_network
+        # Awaited With (Message Name, Body), Returns The Reply Body
+        self.request_handler = request_handler
+        self.listen_address = listen_address
+        # Frame Bytes Served
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    async def node_serve_frame(self, request_frame):
+        # Decoded As A Socket Would Deliver It, So No Object Is Ever Shared Between Nodes
+        self.bytes_in += len(request_frame)
+        _, message_type, request_id = FRAME_HEADER.unpack_from(request_frame)
+        response_message = await self.request_handler(MESSAGE_NAMES.get(message_type),
+                                                      node_decode_body(request_frame[FRAME_HEADER.size:]))
+        reply_frame = node_encode_frame('Reply', response_message, request_id)
+        self.bytes_out += len(reply_frame)
+        return reply_frame
+
+    async def node_serve_forever(self):
+        # Nothing To Accept, Requests Arrive As Calls: Park Until Cancelled
+        await asyncio.get_running_loop().create_future()
+
+    def close(self):
+        self.simulated_network.node_remove(self.listen_address[1])
+
+
+class SimulatedConnectionPool:
+    # Same Interface As AsyncConnectionPool, Requests Cross The Simulated Network Instead of Sockets
+
+    def __init__(self, simulated_network):
+        self.simulated_network = simulated_network
+        # Port Links Are Measured From, The First Listener Opened Through This Pool's Transport
+        self.source_port = 0
+        # Requests Sent Through This Pool, Their Latency By Message Type
+        self.request_count = 0
+        self.sent_rpcs = RpcMetrics()
+        # Port -> Requests Still Waiting For Replies
+        self.pending_counts = dict()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def node_pending_count(self, port_num):
+        return self.pending_counts.get(port_num, 0)
+
+    async def node_send_network_message(self, message, port_num):
+        self.request_count += 1
+        start_time = time.perf_counter()
+        request_frame = node_encode_frame(message[0], message[1], self.request_count & 0xFFFFFFFF)
+        self.bytes_sent += len(request_frame)
+        self.pending_counts[port_num] = self.pending_counts.get(port_num, 0) + 1
+        try:
+            reply_frame = await self.simulated_network.node_deliver(self.source_port, port_num, request_frame)
+        finally:
+            self.pending_counts[port_num] -= 1
+            if not self.pending_counts[port_num]:
+                del self.pending_counts[port_num]
+        if reply_frame is None:
+            # Dead Port or Lost Message: The Caller Sees What A Failed Connection Gives
+            self.sent_rpcs.record(message[0], time.perf_counter() - start_time, failed=True)
+            return None
+        self.bytes_received += len(reply_frame)
+        self.sent_rpcs.record(message[0], time.perf_counter() - start_time)
+        return node_decode_body(reply_frame[FRAME_HEADER.size:])
+
+    def node_traffic(self):
+        # (Bytes Sent, Bytes Received)
+        return self.bytes_sent, self.bytes_received
+
+    def close(self):
+        # No Connections To Release
+        pass
+
+
+class SimulatedTransport:
+    # Transport For One Simulated Process: Its Nodes Listen On The Network, Requests Out Over One Pool
+
+    def __init__(self, simulated_network):
+        self.simulated_network = simulated_network
+        self.connection_pool = SimulatedConnectionPool(simulated_network)
+
+    async def node_listen(self, request_handler):
+        simulated_listener = self.simulated_network.node_register(request_handler)
+        if not self.connection_pool.source_port:
+            self.connection_pool.source_port = simulated_listener.listen_address[1]
+        return simulated_listener
+
+
+class SimulatedNetwork:
+    # Thousands of Nodes In One Process and Event Loop: Listeners Found By Port, Every Message Encoded,
+    # Delayed and Possibly Dropped On Its Way, Then Decoded, As It Would Be Over TCP
+
+    def __init__(self, latency=SIMULATED_LATENCY, jitter=SIMULATED_JITTER, loss=SIMULATED_LOSS, link_latency=None,
+                 seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        # Optional (Source Port, Destination Port) -> One-Way Seconds, Used Instead of latency
+        self.link_latency = link_latency
+        self.random_gen = random.Random(seed)
+        # Port -> Listener
+        self.listeners = dict()
+        self.port_numbers = itertools.count(SIMULATED_FIRST_PORT)
+        # Messages Carried and Lost, Frame Bytes Both Ways
+        self.messages_delivered = 0
+        self.messages_lost = 0
+        self.bytes_carried = 0
+
+    def node_transport(self):
+        # One Per Simulated Process, Shared By Its Virtual Nodes
+        return SimulatedTransport(self)
+
+    def node_register(self, request_handler):
+        port_num = next(self.port_numbers)
+        if port_num > 0xFFFF:
+            raise OSError('Simulated Network Out of Ports')
+        simulated_listener = SimulatedListener(self, request_handler, ('127.0.0.1', port_num))
+        self.listeners[port_num] = simulated_listener
+        return simulated_listener
+
+    def node_remove(self, port_num):
+        # Node Crashed or Left: Its Port Stops Answering
+        self.listeners.pop(port_num, None)
+
+    async def node_delay(self, source_port, destination_port):
+        if self.link_latency is not None:
+            link_delay = self.link_latency(source_port, destination_port)
+        else:
+            link_delay = self.latency
+        if self.jitter:
+            link_delay += self.random_gen.uniform(0.0, self.jitter)
+        if link_delay > 0:
+            await asyncio.sleep(link_delay)
+
+    def node_lost(self):
+        if self.loss and self.random_gen.random() < self.loss:
+            self.messages_lost += 1
+            return True
+        return False
+
+    async def node_deliver(self, source_port, port_num, request_frame):
+        # Request Frame There, Reply Frame Back, None When The Port Is Gone or Either Message Is Lost
+        await self.node_delay(source_port, port_num)
+        simulated_listener = self.listeners.get(port_num)
+        if simulated_listener is None or self.node_lost():
+            return None
+        self.messages_delivered += 1
+        self.bytes_carried += len(request_frame)
+        # Served In Its Own Task As A Socket Server Would: Long Forwarding Chains Do Not Nest Stacks,
+        # and A Caller Giving Up Does Not Cancel The Handler
+        reply_frame = await asyncio.shield(simulated_listener.node_serve_frame(request_frame))
+        await self.node_delay(port_num, source_port)
+        if self.node_lost():
+            return None
+        self.messages_delivered += 1
+        self.bytes_carried += len(reply_frame)
+        return reply_frame
+
+    def node_stats(self):
+        return {'nodes': len(self.listeners), 'messages_delivered': self.messages_delivered,
+                'messages_lost': self.messages_lost, 'bytes_carried': self.bytes_carried}
@@ -0,0 +1,54 @@
+"""
+@author Edwin Kaburu
+@date 11/19/2022
+@see "Seattle University, CPSC 5520, Fall 2022" - Distributed Systems
+@file chord_stats.py
+Lab4 Chord
+"""
+
+import json
+import argparse
+from chord_network import node_send_network_message
+
+
+def stats_print_rpcs(title, rpc_stats):
+    print(f'  {title}')
+    print(f'    {"message":<16}{"count":>9}{"failed":>8}{"mean ms":>10}{"p50 ms":>9}{"p99 ms":>9}{"max ms":>9}')
+    for message_name, message_stats in rpc_stats.items():
+        latency = message_stats['latency']
+        print(f'    {message_name:<16}{message_stats["count"]:>9}{message_stats["failures"]:>8}'
+              f'{latency["mean"] * 1e3:>10.3f}{latency["p50"] * 1e3:>9.3f}{latency["p99"] * 1e3:>9.3f}'
+              f'{latency["max"] * 1e3:>9.3f}')
+
+
+def stats_print(node_stats):
+    # Human Readable Dump of One Node's Stats Reply
+    print(f'Node {node_stats["node"]} ({node_stats["identifier"]}), Up {node_stats["uptime"]:.1f} s')
+    print(f'  Traffic: {node_stats["bytes_in"]} Bytes In, {node_stats["bytes_out"]} Bytes Out Serving; '
+          f'{node_stats["bytes_sent"]} Bytes Sent, {node_stats["bytes_received"]} Bytes Received As Client')
+    print(f'  Store: ' + ', '.join(f'{name} {value}' for name, value in node_stats['store'].items()))
+    stats_print_rpcs('Handled RPCs', node_stats['handled_rpcs'])
+    stats_print_rpcs('Sent RPCs (Whole Process)', node_stats['sent_rpcs'])
+    lookup_latency = node_stats['lookup_latency']
+    print(f'  Lookups: {lookup_latency["count"]}, p50 {lookup_latency["p50"] * 1e3:.3f} ms, '
+          f'p99 {lookup_latency["p99"] * 1e3:.3f} ms, Hops ' +
+          (', '.join(f'{hop_count}: {lookup_count}' for hop_count, lookup_count in node_stats['lookup_hops'].items())
+           or 'None Yet'))
+    print('  Ring: ' + ', '.join(f'{name} {value}' for name, value in node_stats['ring'].items()))
+
+
+if __name__ == '__main__':
+    # One or More Node Ports, Readable Text or JSON For Scripts
+    argument_parser = argparse.ArgumentParser(prog='python chord_stats.py')
+    argument_parser.add_argument('node_ports', metavar='PORT', type=int, nargs='+')
+    argument_parser.add_argument('--json', action='store_true', help='One JSON Object Per Node, One Per Line')
+    stats_arguments = argument_parser.parse_args()
+
+    for node_port in stats_arguments.node_ports:
+        node_stats = node_send_network_message(('Stats', (0, -1)), node_port)
+        if node_stats is None:
+            print(f'Node {node_port}: No Reply')
+        elif stats_arguments.json:
+            print(json.dumps(node_stats))
+        else:
+            stats_print(node_stats)
@@ -0,0 +1,208 @@
+"""
+@author Edwin Kaburu
+@date 11/19/2022
+@see "Seattle University, CPSC 5520, Fall 2022" - Distributed Systems
+@file chord_store.py
+Lab4 Chord
+"""
+
+import os
+import mmap
+import struct
+from chord_identifier import Identifier
+from chord_codec import node_encode_body, node_decode_body
+
+# Record On Disk: 20-Byte Key, Value Length, Then Encoded Value
+RECORD_HEADER = struct.Struct('!20sI')
+# Value Length of A Deleted Key's Record, Header Only
+TOMBSTONE_LENGTH = 0xFFFFFFFF
+# Index File: Data Bytes Covered, Then One (Key, Record Offset) Entry Per Live Record
+INDEX_HEADER = struct.Struct('!Q')
+INDEX_ENTRY = struct.Struct('!20sQ')
+# Compact Once Superseded Bytes Pass This, And Outweigh Live Bytes
+STORE_COMPACT_MIN_BYTES = 1 << 20
+# Seconds Between Index Checkpoints and Compaction Checks On A Node
+STORE_MAINTENANCE_INTERVAL = 30.0
+
+
+class DiskStore:
+    # Append-Only Data File, Read Through mmap, With Key -> Offset Index Held In Memory.
+    # Same get / update / in Calls As The dict Backend, Plus delete For Batches of Keys
+
+    def __init__(self, data_path):
+        self.data_path = data_path
+        self.index_path = data_path + '.idx'
+        # Key (Integer) -> Offset of Its Latest Record
+        self.record_offsets = dict()
+        # Bytes Taken By Records A Later Write Replaced
+        self.garbage_bytes = 0
+        # Data Bytes The Index File On Disk Accounts For
+        self.checkpoint_size = 0
+        self.data_map = None
+        self.data_file = open(data_path, 'ab+')
+        self.data_size = self.data_file.seek(0, os.SEEK_END)
+        self.store_load_index()
+
+    def store_load_index(self):
+        # Fast Reopen: Load Saved Index, Then Replay Only Records Appended After It
+        replay_from = 0
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'rb') as index_file:
+                index_data = index_file.read()
+            if len(index_data) >= INDEX_HEADER.size:
+                (covered_size,) = INDEX_HEADER.unpack_from(index_data, 0)
+                if covered_size <= self.data_size:
+                    for key_bytes, record_offset in INDEX_ENTRY.iter_unpack(index_data[INDEX_HEADER.size:]):
+                        self.record_offsets[int.from_bytes(key_bytes, 'big')] = record_offset
+                    replay_from = self.checkpoint_size = covered_size
+        self.store_map()
+        self.store_replay(replay_from)
+
+    def store_replay(self, record_offset):
+        # Rebuild Index Entries From Records Starting At record_offset
+        while record_offset + RECORD_HEADER.size <= self.data_size:
+            key_bytes, value_length = RECORD_HEADER.unpack_from(self.data_map, record_offset)
+            if value_length == TOMBSTONE_LENGTH:
+                # Key Deleted, Earlier Records For It Are Garbage
+                self.store_forget_record(int.from_bytes(key_bytes, 'big'))
+                record_offset += RECORD_HEADER.size
+                continue
+            record_end = record_offset + RECORD_HEADER.size + value_length
+            if record_end > self.data_size:
+                break
+            self.store_index_record(int.from_bytes(key_bytes, 'big'), record_offset)
+            record_offset = record_end
+        if record_offset != self.data_size:
+            # Torn Final Write From A Crash, Drop It
+            self.data_map.close()
+            self.data_map = None
+            self.data_file.truncate(record_offset)
+            self.data_size = record_offset
+            self.store_map()
+
+    def store_map(self):
+        # Map The Whole Data File Read-Only, Empty Files Cannot Be Mapped
+        if self.data_map is not None:
+            self.data_map.close()
+        self.data_map = mmap.mmap(self.data_file.fileno(), 0, access=mmap.ACCESS_READ) if self.data_size else None
+
+    def store_index_record(self, key, record_offset):
+        previous_offset = self.record_offsets.get(key)
+        if previous_offset is not None:
+            # Superseded Record Stays On Disk Until Compaction
+            (_, value_length) = RECORD_HEADER.unpack_from(self.data_map, previous_offset)
+            self.garbage_bytes += RECORD_HEADER.size + value_length
+        self.record_offsets[key] = record_offset
+
+    def store_forget_record(self, key):
+        previous_offset = self.record_offsets.pop(key, None)
+        if previous_offset is not None:
+            (_, value_length) = RECORD_HEADER.unpack_from(self.data_map, previous_offset)
+            self.garbage_bytes += RECORD_HEADER.size + value_length
+        # The Tombstone Itself Goes Away With Compaction Too
+        self.garbage_bytes += RECORD_HEADER.size
+
+    def update(self, records):
+        # Append Every Record, One Write and One Remap Per Batch
+        pending_offsets = []
+        write_buffer = bytearray()
+        for key, value in records.items():
+            encoded = node_encode_body(value)
+            pending_offsets.append((Identifier(key), self.data_size + len(write_buffer)))
+            write_buffer += RECORD_HEADER.pack(Identifier(key).to_bytes(20, 'big'), len(encoded))
+            write_buffer += encoded
+        if not write_buffer:
+            return
+        self.data_file.write(write_buffer)
+        self.data_file.flush()
+        self.data_size += len(write_buffer)
+        self.store_map()
+        for key, record_offset in pending_offsets:
+            self.store_index_record(key, record_offset)
+
+    def delete(self, keys):
+        # Append A Tombstone Per Stored Key, So Replay After Reopen Does Not Bring Them Back
+        deleted_keys = [Identifier(key) for key in keys if key in self.record_offsets]
+        if not deleted_keys:
+            return
+        self.data_file.write(b''.join(RECORD_HEADER.pack(key.to_bytes(20, 'big'), TOMBSTONE_LENGTH)
+                                      for key in deleted_keys))
+        self.data_file.flush()
+        self.data_size += RECORD_HEADER.size * len(deleted_keys)
+        self.store_map()
+        for key in deleted_keys:
+            self.store_forget_record(key)
+
+    def get(self, key, default=None):
+        # O(1): Index Lookup, Then Decode Straight From The Mapping
+        record_offset = self.record_offsets.get(key)
+        if record_offset is None:
+            return default
+        (_, value_length) = RECORD_HEADER.unpack_from(self.data_map, record_offset)
+        value_start = record_offset + RECORD_HEADER.size
+        return node_decode_body(self.data_map[value_start:value_start + value_length])
+
+    def __contains__(self, key):
+        return key in self.record_offsets
+
+    def __len__(self):
+        return len(self.record_offsets)
+
+    def __iter__(self):
+        # Keys As Identifiers, Like The dict Backend Holds Them
+        return (Identifier(key) for key in self.record_offsets)
+
+    def items(self):
+        for key in self.record_offsets:
+            yield Identifier(key), self.get(key)
+
+    def checkpoint(self):
+        # Save Index, So Reopen Skips Replaying Everything Before This Point
+        if self.checkpoint_size == self.data_size:
+            return
+        index_buffer = bytearray(INDEX_HEADER.pack(self.data_size))
+        for key, record_offset in self.record_offsets.items():
+            index_buffer += INDEX_ENTRY.pack(key.to_bytes(20, 'big'), record_offset)
+        with open(self.index_path + '.tmp', 'wb') as index_file:
+            index_file.write(index_buffer)
+        os.replace(self.index_path + '.tmp', self.index_path)
+        self.checkpoint_size = self.data_size
+
+    def compact(self, force=False):
+        # Rewrite Only Latest Records, Once Superseded Bytes Dominate
+        if not force and (self.garbage_bytes < STORE_COMPACT_MIN_BYTES or
+                          self.garbage_bytes * 2 < self.data_size):
+            return False
+        compact_offsets = dict()
+        compact_path = self.data_path + '.compact'
+        with open(compact_path, 'wb') as compact_file:
+            for key, record_offset in self.record_offsets.items():
+                (_, value_length) = RECORD_HEADER.unpack_from(self.data_map, record_offset)
+                compact_offsets[key] = compact_file.tell()
+                compact_file.write(self.data_map[record_offset:record_offset + RECORD_HEADER.size + value_length])
+            compact_file.flush()
+            os.fsync(compact_file.fileno())
+        # Old Index Goes First: Its Offsets Are Meaningless In The New File, and A Crash Before The Checkpoint
+        # Below Must Leave A Full Replay Rather Than A Stale Index Reading Mid-Record
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+        # Swap Files, Then Point The Index At The New Offsets
+        if self.data_map is not None:
+            self.data_map.close()
+            self.data_map = None
+        self.data_file.close()
+        os.replace(compact_path, self.data_path)
+        self.data_file = open(self.data_path, 'ab+')
+        self.data_size = self.data_file.seek(0, os.SEEK_END)
+        self.record_offsets = compact_offsets
+        self.garbage_bytes = 0
+        self.checkpoint_size = 0
+        self.store_map()
+        self.checkpoint()
+        return True
+
+    def close(self):
+        self.checkpoint()
+        if self.data_map is not None:
+            self.data_map.close()
+        self.data_file.close()
@@ -0,0 +1,41 @@
+"""
+@author Edwin Kaburu
+@date 11/19/2022
+@see "Seattle University, CPSC 5520, Fall 2022" - Distributed Systems
+@file test_chord_store.py
+Lab4 Chord
+"""
+
+import os
+import pytest
+from chord_identifier import Identifier
+from chord_store import DiskStore
+
+
+def test_compact_crash_before_checkpoint(tmp_path):
+    data_path = str(tmp_path / 'records.dat')
+    disk_store = DiskStore(data_path)
+    record_keys = [Identifier.from_key(f'key{index}') for index in range(50)]
+    # Index Saved While The File Was Small, So It Still Fits Inside The Compacted File
+    disk_store.update({key: [['x' * 200, str(key)]] for key in record_keys[:5]})
+    disk_store.checkpoint()
+    # Every Key Written Twice, So Compaction Shrinks The File and Moves Every Record
+    for round_index in range(2):
+        disk_store.update({key: [[f'value{round_index}', str(key)]] for key in record_keys})
+
+    # Crash After The Compacted File Is Swapped In, Before Its Index Is Written
+    def crash_checkpoint():
+        raise OSError('Simulated Crash')
+    disk_store.checkpoint = crash_checkpoint
+    with pytest.raises(OSError):
+        disk_store.compact(force=True)
+    compacted_size = os.path.getsize(data_path)
+    disk_store.data_map.close()
+    disk_store.data_file.close()
+
+    reopened_store = DiskStore(data_path)
+    assert len(reopened_store) == len(record_keys)
+    for key in record_keys:
+        assert reopened_store.get(key) == [['value1', str(key)]]
+    assert os.path.getsize(data_path) == compacted_size
+    reopened_store.close()